@@ -22,28 +22,30 @@ def to_ufo_paths(self, ufo_glyph, layer):
     pen = ufo_glyph.getPointPen()
 
     for path in layer.paths:
+        # Read from the columns the nodes are stored in, without making
+        # GSNode objects, except for the few nodes that have user data.
+        packed = path._nodes
+        for index in sorted(packed.userData):
+            self.to_ufo_node_user_data(ufo_glyph, path.nodes[index])
         # the list is changed below, otherwise you can't draw more than once
         # per session.
-        nodes = list(path.nodes)
-        for node in nodes:
-            self.to_ufo_node_user_data(ufo_glyph, node)
+        nodes = packed.items()
 
         pen.beginPath()
         if not nodes:
             pen.endPath()
             continue
         if not path.closed:
-            node = nodes.pop(0)
-            assert node.type == "line", "Open path starts with off-curve points"
-            pen.addPoint(tuple(node.position), segmentType="move")
+            position, node_type, _ = nodes.pop(0)
+            assert node_type == "line", "Open path starts with off-curve points"
+            pen.addPoint(position, segmentType="move")
         else:
             # In Glyphs.app, the starting node of a closed contour is always
             # stored at the end of the nodes list.
             nodes.insert(0, nodes.pop())
-        for node in nodes:
-            node_type = _to_ufo_node_type(node.type)
+        for position, node_type, smooth in nodes:
             pen.addPoint(
-                tuple(node.position), segmentType=node_type, smooth=node.smooth
+                position, segmentType=_to_ufo_node_type(node_type), smooth=smooth
             )
         pen.endPath()
 
@@ -0,0 +1,184 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""On-disk cache of parsed fonts.
+
+Entries are pickled GSFont objects, stored in a directory under a name derived
+from the contents of the .glyphs source, the glyphsLib and Python versions, and
+the parser options. Each entry starts with a header and a checksum of the
+pickle, so that truncated or otherwise corrupt entries are detected and
+rebuilt. Entries made by other versions are never read, and are eventually
+evicted: when the cache grows past its maximum size, the least recently used
+entries are removed.
+
+The checksum only detects corruption, not tampering: unpickling an entry can
+run arbitrary code, so the cache directory must only be writable by users who
+are trusted to run code in the processes that read it.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+
+import glyphsLib
+from glyphsLib.parser import _gc_paused
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["FontCache"]
+
+DEFAULT_MAX_SIZE = 1 << 30
+
+_MAGIC = b"GLYPHSLIB-FONT-CACHE\n"
+_SUFFIX = ".glyphscache"
+_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=32)
+
+
+class FontCache:
+    """A directory of parsed fonts, bounded to `max_size` bytes.
+
+    The entries are unpickled, so `directory` must be trusted (see above).
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self.directory = os.fspath(directory)
+        self.max_size = max_size
+
+    def key(self, source, **options):
+        """Return the cache key of the font parsed from 'source' (a str,
+        or UTF-8 encoded bytes or memory map) with the given parser options.
+        """
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        digest = _digest(source)
+        context = (
+            glyphsLib.__version__,
+            sys.version_info[:2],
+            _PROTOCOL,
+            sorted(options.items()),
+        )
+        digest.update(repr(context).encode("utf-8"))
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def load(self, source, parse, **options):
+        """Return the font parsed from 'source' with the given parser options,
+        from the cache if possible. Otherwise call `parse()` to parse it, and
+        add the result to the cache.
+        """
+        key = self.key(source, **options)
+        font = self.get(key)
+        if font is None:
+            font = parse()
+            self.put(key, font)
+        return font
+
+    def get(self, key):
+        """Return the font cached under 'key', or None."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as fp:
+                data = fp.read()
+        except OSError:
+            return None
+        header = len(_MAGIC)
+        checksum = data[header : header + 32]
+        payload = memoryview(data)[header + 32 :]
+        try:
+            if data[:header] != _MAGIC or _digest(payload).digest() != checksum:
+                raise ValueError("bad header or checksum")
+            with _gc_paused():
+                font = pickle.loads(payload)
+            if not isinstance(font, glyphsLib.classes.GSFont):
+                raise ValueError("not a GSFont")
+        except Exception as e:
+            logger.warning("Ignoring corrupt font cache entry %s: %s", path, e)
+            self._remove(path)
+            return None
+        try:
+            # Mark as recently used, for eviction.
+            os.utime(path)
+        except OSError:
+            pass
+        return font
+
+    def put(self, key, font):
+        """Cache 'font' under 'key', then evict old entries if needed."""
+        with _gc_paused():
+            payload = pickle.dumps(font, _PROTOCOL)
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to a temporary file first, so that other processes never see
+        # a partly written entry.
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as fp:
+                fp.write(_MAGIC)
+                fp.write(_digest(payload).digest())
+                fp.write(payload)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            self._remove(tmp)
+            raise
+        self.evict()
+
+    def entries(self):
+        """Return the (mtime, size, path) of the entries, oldest first."""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in its
+        maximum size."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            # Already removed, or in use by another process on Windows.
+            pass
@@ -16,10 +16,17 @@
 
 
 import re
+import os
 import math
+import mmap
+import shutil
+import copy
+import datetime
+import functools
 import inspect
 import uuid
 import logging
+from array import array
 import glyphsLib
 from glyphsLib.types import (
     ValueType,
@@ -29,12 +36,13 @@ from glyphsLib.types import (
     parse_datetime,
     parse_color,
     floatToString,
+    floatsToStrings,
     readIntlist,
     UnicodesList,
     parse_float_or_int,
 )
-from glyphsLib.parser import Parser
-from glyphsLib.writer import Writer
+from glyphsLib.parser import Parser, map_file
+from glyphsLib.writer import Writer, content_hash, _content_digest
 from collections import OrderedDict
 from io import StringIO
 from glyphsLib.affine import Affine
@@ -302,25 +310,87 @@ Glyphs = GSApplication()
 
 
 class GSBase:
+    __slots__ = ()
     _classesForName = {}
     _defaultsForName = {}
     _wrapperKeysTranslate = {}
 
     def __init__(self):
-        for key in self._classesForName.keys():
-            if not hasattr(self, key):
-                klass = self._classesForName[key]
-                if inspect.isclass(klass) and issubclass(klass, GSBase):
-                    # FIXME: (jany) Why?
-                    # For GSLayer::backgroundImage, I was getting []
-                    # instead of None when no image
-                    value = []
-                elif key in self._defaultsForName:
-                    value = self._defaultsForName.get(key)
-                else:
-                    value = klass()
-                key = self._wrapperKeysTranslate.get(key, key)
-                setattr(self, key, value)
+        initialValues = type(self).__dict__.get("_initialValues")
+        if initialValues is None:
+            initialValues = type(self)._makeInitialValues()
+        values, factories, properties = initialValues
+        attributes = self.__dict__
+        if attributes:
+            for key, value in values.items():
+                attributes.setdefault(key, value)
+            for key, factory in factories:
+                if key not in attributes:
+                    attributes[key] = factory()
+        else:
+            attributes.update(values)
+            for key, factory in factories:
+                attributes[key] = factory()
+        for key, attribute, factory in properties:
+            if key is None or not hasattr(self, key):
+                setattr(self, attribute, factory())
+
+    @classmethod
+    def _makeInitialValues(cls):
+        """Work out once per class how `__init__` gives each key of
+        `_classesForName` its initial value.
+
+        A key is only given a value if the object has no attribute by that
+        name, which can only be told in advance if the class has none, or has
+        one that is not a property. The values go into the `__dict__` of the
+        object, unless the attribute they go to is a property or a proxy of
+        the class.
+
+        Returns the immutable values to put into the `__dict__`, by attribute,
+        (attribute, factory) pairs for the mutable ones, and (key, attribute,
+        factory) triples for the values to set as attributes, key being None
+        if they are always set.
+        """
+        values = {}
+        factories = []
+        properties = []
+        for key in cls._classesForName:
+            member = _classMember(cls, key)
+            if member is not _MISSING and not isinstance(member, property):
+                continue
+            attribute = cls._wrapperKeysTranslate.get(key, key)
+            value = cls._initialValue(key)
+            if type(value) in _IMMUTABLE_TYPES:
+                factory = _Constant(value)
+            elif key in cls._defaultsForName:
+                factory = _Constant(value, copy.deepcopy)
+            else:
+                factory = type(value)
+            if member is not _MISSING:
+                properties.append((key, attribute, factory))
+            elif _classMember(cls, attribute) is not _MISSING:
+                properties.append((None, attribute, factory))
+            elif type(value) in _IMMUTABLE_TYPES:
+                values[attribute] = value
+            else:
+                factories.append((attribute, factory))
+        initialValues = (values, tuple(factories), tuple(properties))
+        # In the class itself, not inherited by its subclasses.
+        cls._initialValues = initialValues
+        return initialValues
+
+    @classmethod
+    def _initialValue(cls, key):
+        """Return the value that a new object has for 'key'."""
+        klass = cls._classesForName[key]
+        if inspect.isclass(klass) and issubclass(klass, GSBase):
+            # FIXME: (jany) Why?
+            # For GSLayer::backgroundImage, I was getting []
+            # instead of None when no image
+            return []
+        elif key in cls._defaultsForName:
+            return cls._defaultsForName.get(key)
+        return klass()
 
     def __repr__(self):
         content = ""
@@ -357,6 +427,9 @@ class GSBase:
         key = self._wrapperKeysTranslate.get(key, key)
         setattr(self, key, value)
 
+    def _willChange(self):
+        """Called before the object is changed, see `_trackGlyph`."""
+
     def shouldWriteValueForKey(self, key):
         getKey = self._wrapperKeysTranslate.get(key, key)
         value = getattr(self, getKey)
@@ -373,7 +446,108 @@ class GSBase:
         return True
 
 
+_MISSING = object()
+
+
+def _classMember(cls, name):
+    """Return what `name` is on `cls` or one of its bases, without calling
+    descriptors, or _MISSING."""
+    for base in cls.__mro__:
+        if name in base.__dict__:
+            return base.__dict__[name]
+    return _MISSING
+
+
+class _Constant:
+    """Factory of the initial value of an attribute, which is either the value
+    itself or, if it is mutable, a copy of it."""
+
+    __slots__ = ("value", "copy")
+
+    def __init__(self, value, copy=None):
+        self.value = value
+        self.copy = copy
+
+    def __call__(self):
+        if self.copy is None:
+            return self.value
+        return self.copy(self.value)
+
+
+class _CompactBase(GSBase):
+    """Base of the classes that fonts have many objects of (nodes, anchors,
+    components, hints and guides), which store their attributes in
+    `__slots__` instead of a `__dict__`.
+
+    Attributes are only stored when they are set: until then, they have the
+    initial value `GSBase.__init__` would give them, or the one in
+    `_attributeDefaults`, which also has the defaults of private attributes.
+    A mutable default is copied and stored when first read, as it may then be
+    changed in place.
+    """
+
+    __slots__ = ()
+    _attributeDefaults = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        defaults = {"_parent": None}
+        for key in cls._classesForName:
+            attribute = cls._wrapperKeysTranslate.get(key, key)
+            defaults[attribute] = cls._initialValue(key)
+        defaults.update(cls.__dict__.get("_attributeDefaults", {}))
+        cls._attributeDefaults = defaults
+
+    def __init__(self):
+        pass
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set.
+        try:
+            value = self._attributeDefaults[name]
+        except KeyError:
+            raise AttributeError(
+                "{!r} object has no attribute {!r}".format(type(self).__name__, name)
+            )
+        if type(value) not in _IMMUTABLE_TYPES:
+            value = copy.deepcopy(value)
+            # Reading the default does not change the object.
+            object.__setattr__(self, name, value)
+        return value
+
+
+def _notifying(method):
+    """Wrap a method that changes what belongs to `self._owner` (a proxy,
+    or a value of a tracked object) to tell the owner first, see
+    `_trackGlyph`."""
+
+    @functools.wraps(method)
+    def notifying(self, *args, **kwargs):
+        self._owner._willChange()
+        return method(self, *args, **kwargs)
+
+    return notifying
+
+
+# The methods of proxies that change their owner.
+_PROXY_MUTATORS = (
+    "__setitem__",
+    "__delitem__",
+    "append",
+    "extend",
+    "insert",
+    "remove",
+    "setter",
+)
+
+
 class Proxy:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in _PROXY_MUTATORS:
+            if name in cls.__dict__:
+                setattr(cls, name, _notifying(cls.__dict__[name]))
+
     def __init__(self, owner):
         self._owner = owner
 
@@ -412,9 +586,10 @@ class Proxy:
     def __deepcopy__(self, memo):
         return [x.copy() for x in self.values()]
 
+    @_notifying
     def setter(self, values):
         method = self.setterMethod()
-        if type(values) == list:
+        if isinstance(values, list):
             method(values)
         elif (
             type(values) == tuple
@@ -428,6 +603,51 @@ class Proxy:
             raise TypeError
 
 
+class _CachedProxy:
+    """A property whose value is a proxy of the object, made when first
+    needed and kept in the `__dict__` of the object, instead of a new proxy
+    each time.
+
+    Objects with such properties leave the proxies out of their pickled and
+    copied state, see `_withoutProxies`.
+    """
+
+    def __init__(self, proxyClass, fset=None):
+        self.proxyClass = proxyClass
+        self.fset = fset
+
+    def __set_name__(self, owner, name):
+        self.key = "_%sProxy" % name
+        _PROXY_KEYS.add(self.key)
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.key]
+        except KeyError:
+            proxy = obj.__dict__[self.key] = self.proxyClass(obj)
+            return proxy
+
+    def __set__(self, obj, value):
+        if self.fset is not None:
+            self.fset(obj, value)
+        else:
+            self.__get__(obj).setter(value)
+
+
+# The keys of the proxies that _CachedProxy keeps in the objects
+_PROXY_KEYS = set()
+
+
+def _withoutProxies(state):
+    """Remove the proxies kept by _CachedProxy from the state of an object,
+    as they refer to the object itself."""
+    for key in _PROXY_KEYS.intersection(state):
+        del state[key]
+    return state
+
+
 class LayersIterator:
     def __init__(self, owner):
         self.curInd = 0
@@ -455,24 +675,7 @@ class LayersIterator:
     @property
     def orderedLayers(self):
         if not self._orderedLayers:
-            glyphLayerIds = [
-                l.associatedMasterId
-                for l in self._owner._layers.values()
-                if l.associatedMasterId == l.layerId
-            ]
-            masterIds = [m.id for m in self._owner.parent.masters]
-            intersectedLayerIds = set(glyphLayerIds) & set(masterIds)
-            orderedLayers = [
-                self._owner._layers[m.id]
-                for m in self._owner.parent.masters
-                if m.id in intersectedLayerIds
-            ]
-            orderedLayers += [
-                self._owner._layers[l.layerId]
-                for l in self._owner._layers.values()
-                if l.layerId not in intersectedLayerIds
-            ]
-            self._orderedLayers = orderedLayers
+            self._orderedLayers = self._owner._orderedLayers()
         return self._orderedLayers
 
 
@@ -494,9 +697,7 @@ class FontFontMasterProxy(Proxy):
             return self.values()[Key]
         elif isString(Key):
             # UUIDs are case-sensitive in Glyphs.app.
-            for master in self.values():
-                if master.id == Key:
-                    return master
+            return self._owner.masterForId(Key)
         else:
             raise KeyError
 
@@ -515,6 +716,7 @@ class FontFontMasterProxy(Proxy):
             self._owner._masters[Index] = FontMaster
         else:
             raise KeyError
+        self._owner._masterIndex = None
 
     def __delitem__(self, Key):
         if type(Key) is int:
@@ -535,6 +737,7 @@ class FontFontMasterProxy(Proxy):
         if not FontMaster.id or self[FontMaster.id]:
             FontMaster.id = str(uuid.uuid4()).upper()
         self._owner._masters.append(FontMaster)
+        self._owner._masterIndex = None
 
         # Cycle through all glyphs and append layer
         for glyph in self._owner.glyphs:
@@ -555,10 +758,12 @@ class FontFontMasterProxy(Proxy):
                     glyph.layers.remove(layer)
 
         self._owner._masters.remove(FontMaster)
+        self._owner._masterIndex = None
 
     def insert(self, Index, FontMaster):
         FontMaster.font = self._owner
         self._owner._masters.insert(Index, FontMaster)
+        self._owner._masterIndex = None
 
     def extend(self, FontMasters):
         for FontMaster in FontMasters:
@@ -568,6 +773,7 @@ class FontFontMasterProxy(Proxy):
         if isinstance(values, Proxy):
             values = list(values)
         self._owner._masters = values
+        self._owner._masterIndex = None
         for m in self._owner._masters:
             m.font = self._owner
 
@@ -598,6 +804,7 @@ class FontGlyphsProxy(Proxy):
         if type(key) is int:
             self._owner._setupGlyph(glyph)
             self._owner._glyphs[key] = glyph
+            self._owner._glyphIndex = None
         else:
             raise KeyError  # TODO: add other access methods
 
@@ -611,6 +818,7 @@ class FontGlyphsProxy(Proxy):
             self._owner._glyphs.remove(glyph)
         else:
             raise KeyError
+        self._owner._glyphIndex = None
 
     def __contains__(self, item):
         if isString(item):
@@ -618,22 +826,17 @@ class FontGlyphsProxy(Proxy):
         return item in self._owner._glyphs
 
     def _get_glyph_by_string(self, key):
-        # FIXME: (jany) looks inefficient
         if isinstance(key, str):
+            names, unicodes = self._owner._glyphIndex or self._owner._indexGlyphs()
             # by glyph name
-            for glyph in self._owner._glyphs:
-                if glyph.name == key:
-                    return glyph
+            glyph = names.get(key)
+            if glyph is not None:
+                return glyph
             # by string representation as u'ä'
             if len(key) == 1:
-                for glyph in self._owner._glyphs:
-                    if glyph.unicode == "%04X" % (ord(key)):
-                        return glyph
+                return unicodes.get("%04X" % (ord(key)))
             # by unicode
-            else:
-                for glyph in self._owner._glyphs:
-                    if glyph.unicode == key.upper():
-                        return glyph
+            return unicodes.get(key.upper())
         return None
 
     def values(self):
@@ -649,11 +852,15 @@ class FontGlyphsProxy(Proxy):
     def append(self, glyph):
         self._owner._setupGlyph(glyph)
         self._owner._glyphs.append(glyph)
+        self._owner._glyphAdded(glyph)
 
     def extend(self, objects):
+        objects = list(objects)
         for glyph in objects:
             self._owner._setupGlyph(glyph)
-        self._owner._glyphs.extend(list(objects))
+        self._owner._glyphs.extend(objects)
+        for glyph in objects:
+            self._owner._glyphAdded(glyph)
 
     def __len__(self):
         return len(self._owner._glyphs)
@@ -662,15 +869,9 @@ class FontGlyphsProxy(Proxy):
         if isinstance(values, Proxy):
             values = list(values)
         self._owner._glyphs = values
+        self._owner._glyphIndex = None
         for g in self._owner._glyphs:
-            g.parent = self._owner
-            for layer in g.layers.values():
-                if (
-                    not hasattr(layer, "associatedMasterId")
-                    or layer.associatedMasterId is None
-                    or len(layer.associatedMasterId) == 0
-                ):
-                    g._setupLayer(layer, layer.layerId)
+            self._owner._setupGlyph(g)
 
 
 class FontClassesProxy(Proxy):
@@ -760,6 +961,7 @@ class GlyphLayerProxy(Proxy):
             self._owner._layers[key] = layer
         else:
             raise KeyError
+        self._owner._layersChanged()
 
     def __delitem__(self, key):
         if isinstance(key, int) and self._owner.parent:
@@ -768,6 +970,7 @@ class GlyphLayerProxy(Proxy):
             Layer = self.__getitem__(key)
             key = Layer.layerId
         del self._owner._layers[key]
+        self._owner._layersChanged()
 
     def __iter__(self):
         return LayersIterator(self._owner)
@@ -793,6 +996,7 @@ class GlyphLayerProxy(Proxy):
             layer.layerId = str(uuid.uuid4()).upper()
         self._owner._setupLayer(layer, layer.layerId)
         self._owner._layers[layer.layerId] = layer
+        self._owner._layersChanged()
 
     def extend(self, layers):
         for layer in layers:
@@ -807,7 +1011,7 @@ class GlyphLayerProxy(Proxy):
 
     def setter(self, values):
         newLayers = OrderedDict()
-        if type(values) == list or type(values) == tuple or type(values) == type(self):
+        if isinstance(values, (list, tuple)) or type(values) == type(self):
             for layer in values:
                 newLayers[layer.layerId] = layer
         elif type(values) == dict:  # or isinstance(values, NSDictionary)
@@ -818,21 +1022,30 @@ class GlyphLayerProxy(Proxy):
         for (key, layer) in newLayers.items():
             self._owner._setupLayer(layer, key)
         self._owner._layers = newLayers
+        self._owner._layersChanged()
 
     def _ensureMasterLayers(self):
         # Ensure existence of master-linked layers (even for iteration, len() etc.)
         # if accidentally deleted
-        if not self._owner.parent:
+        font = self._owner.parent
+        if not font:
+            return
+        # Only checked again once the masters or the layers have changed
+        masterIndex = font._masterIndex
+        if masterIndex is None:
+            masterIndex = font._indexMasters()
+        if self._owner._verifiedMasters is masterIndex:
             return
-        for master in self._owner.parent.masters:
+        for master in font._masters:
             # if (master.id not in self._owner._layers or
             #         self._owner._layers[master.id] is None):
-            if self._owner.parent.masters[master.id] is None:
+            if font.masters[master.id] is None:
                 newLayer = GSLayer()
                 newLayer.associatedMasterId = master.id
                 newLayer.layerId = master.id
                 self._owner._setupLayer(newLayer, master.id)
                 self.__setitem__(master.id, newLayer)
+        self._owner._verifiedMasters = masterIndex
 
     def plistArray(self):
         return list(self._owner._layers.values())
@@ -994,11 +1207,84 @@ class LayerGuideLinesProxy(IndexedObjectsProxy):
 
 
 class PathNodesProxy(IndexedObjectsProxy):
+    """The nodes of a path, as GSNode objects made when first needed, see
+    _PackedNodes."""
+
     _objects_name = "_nodes"
 
     def __init__(self, owner):
         super().__init__(owner)
 
+    def _checkIndex(self, index):
+        count = len(self._owner._nodes)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("node index out of range")
+        return index
+
+    def __getitem__(self, key):
+        nodes = self._owner._nodes
+        if isinstance(key, slice):
+            return [nodes.view(i, self._owner) for i in range(*key.indices(len(nodes)))]
+        if isinstance(key, int):
+            return nodes.view(self._checkIndex(key), self._owner)
+        raise KeyError
+
+    def __setitem__(self, key, value):
+        if isinstance(key, int):
+            self._owner._nodes.replace(self._checkIndex(key), value, self._owner)
+        else:
+            raise KeyError
+
+    def __delitem__(self, key):
+        if isinstance(key, int):
+            self._owner._nodes.delete(self._checkIndex(key))
+        else:
+            raise KeyError
+
+    def __iter__(self):
+        nodes = self._owner._nodes
+        for index in range(len(nodes)):
+            yield nodes.view(index, self._owner)
+
+    def __contains__(self, value):
+        return isinstance(value, GSNode) and value._parent is self._owner
+
+    def __len__(self):
+        return len(self._owner._nodes)
+
+    def values(self):
+        return list(self)
+
+    def append(self, value):
+        nodes = self._owner._nodes
+        nodes.insert(len(nodes), value, self._owner)
+
+    def extend(self, values):
+        for value in list(values):
+            self.append(value)
+
+    def insert(self, index, value):
+        # Like list.insert
+        count = len(self._owner._nodes)
+        if index < 0:
+            index = max(index + count, 0)
+        self._owner._nodes.insert(min(index, count), value, self._owner)
+
+    def index(self, value):
+        if value in self:
+            return value._index
+        raise ValueError("%r is not a node of the path" % (value,))
+
+    def remove(self, value):
+        del self[self.index(value)]
+
+    def setter(self, values):
+        values = list(values)
+        self._owner._nodes.clear()
+        self.extend(values)
+
 
 class CustomParametersProxy(Proxy):
     def __getitem__(self, key):
@@ -1291,7 +1577,17 @@ class GSAlignmentZone(GSBase):
         )
 
 
-class GSGuideLine(GSBase):
+class GSGuideLine(_CompactBase):
+    __slots__ = (
+        "alignment",
+        "angle",
+        "locked",
+        "position",
+        "showMeasurement",
+        "filter",
+        "name",
+        "_parent",
+    )
     _classesForName = {
         "alignment": str,
         "angle": parse_float_or_int,
@@ -1301,7 +1597,6 @@ class GSGuideLine(GSBase):
         "filter": str,
         "name": str,
     }
-    _parent = None
     _defaultsForName = {"position": Point(0, 0), "angle": 0}
 
     def __init__(self):
@@ -1415,6 +1710,9 @@ class GSFontMaster(GSBase):
             self.name, self.widthValue, self.weightValue
         )
 
+    def __getstate__(self):
+        return _withoutProxies(self.__dict__.copy())
+
     def shouldWriteValueForKey(self, key):
         if key in ("weight", "width"):
             return getattr(self, key) != "Regular"
@@ -1426,6 +1724,18 @@ class GSFontMaster(GSBase):
             return self._name != self.name
         return super().shouldWriteValueForKey(key)
 
+    @property
+    def id(self):
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        self._id = value
+        # The font indexes its masters by id.
+        font = self.__dict__.get("font")
+        if font is not None:
+            font._masterIndex = None
+
     @property
     def name(self):
         name = self.customParameters["Master Name"]
@@ -1502,18 +1812,28 @@ class GSFontMaster(GSBase):
         custom = " ".join(names).strip()
         return weight, width, custom
 
-    customParameters = property(
-        lambda self: CustomParametersProxy(self),
-        lambda self, value: CustomParametersProxy(self).setter(value),
-    )
+    customParameters = _CachedProxy(CustomParametersProxy)
+
+    userData = _CachedProxy(UserDataProxy)
 
-    userData = property(
-        lambda self: UserDataProxy(self),
-        lambda self, value: UserDataProxy(self).setter(value),
-    )
 
+class GSNode(_CompactBase):
+    """A node of a path.
+
+    The nodes of a path are stored in columns (see _PackedNodes), and the
+    GSNode objects of a path are views of them, made when first needed. A
+    node that is not in a path keeps its attributes itself.
+    """
 
-class GSNode(GSBase):
+    __slots__ = (
+        "_parent",
+        "_index",
+        # The attributes of a node that is not in a path.
+        "_ownPosition",
+        "_ownType",
+        "_ownSmooth",
+        "_ownUserData",
+    )
     _PLIST_VALUE_RE = re.compile(
         r'"([-.e\d]+) ([-.e\d]+) (LINE|CURVE|QCURVE|OFFCURVE|n/a)'
         r'(?: (SMOOTH))?(?: ({.*}))?"',
@@ -1524,15 +1844,15 @@ class GSNode(GSBase):
     CURVE = "curve"
     OFFCURVE = "offcurve"
     QCURVE = "qcurve"
-    _parent = None
 
     def __init__(self, position=(0, 0), nodetype=LINE, smooth=False, name=None):
         super().__init__()
-        self.position = Point(position[0], position[1])
-        self.type = nodetype
-        self.smooth = smooth
         self._parent = None
-        self._userData = None
+        self._index = None
+        self._ownPosition = Point(position[0], position[1])
+        self._ownType = nodetype
+        self._ownSmooth = smooth
+        self._ownUserData = None
         self.name = name
 
     def __repr__(self):
@@ -1543,25 +1863,94 @@ class GSNode(GSBase):
             self.__class__.__name__, self.position.x, self.position.y, content
         )
 
+    # Nodes have no __dict__ to keep a proxy in, see _CompactBase.
     userData = property(
         lambda self: UserDataProxy(self),
         lambda self, value: UserDataProxy(self).setter(value),
     )
 
+    def __copy__(self):
+        # A copy of a node of a path is not in the path.
+        node = GSNode.__new__(GSNode)
+        node._parent = None
+        node._index = None
+        node._ownPosition = Point(self.position[0], self.position[1])
+        node._ownType = self.type
+        node._ownSmooth = self.smooth
+        node._ownUserData = self._userData
+        return node
+
     @property
     def parent(self):
         return self._parent
 
+    def _willChange(self):
+        # The node is part of its path.
+        if self._parent is not None:
+            self._parent._willChange()
+
+    @property
+    def position(self):
+        if self._parent is None:
+            return self._ownPosition
+        return self._parent._nodes.position(self._index, self)
+
+    @position.setter
+    def position(self, value):
+        if self._parent is None:
+            self._ownPosition = value
+        else:
+            self._parent._willChange()
+            self._parent._nodes.setPosition(self._index, value)
+
+    @property
+    def type(self):
+        if self._parent is None:
+            return self._ownType
+        return self._parent._nodes.type(self._index)
+
+    @type.setter
+    def type(self, value):
+        if self._parent is None:
+            self._ownType = value
+        else:
+            self._parent._willChange()
+            self._parent._nodes.setType(self._index, value)
+
+    @property
+    def smooth(self):
+        if self._parent is None:
+            return self._ownSmooth
+        return bool(self._parent._nodes.smooth[self._index])
+
+    @smooth.setter
+    def smooth(self, value):
+        if self._parent is None:
+            self._ownSmooth = value
+        else:
+            self._parent._willChange()
+            self._parent._nodes.smooth[self._index] = bool(value)
+
+    @property
+    def _userData(self):
+        if self._parent is None:
+            return self._ownUserData
+        return self._parent._nodes.userData.get(self._index)
+
+    @_userData.setter
+    def _userData(self, value):
+        if self._parent is None:
+            self._ownUserData = value
+        else:
+            self._parent._willChange()
+            self._parent._nodes.setUserData(self._index, value)
+
     def plistValue(self):
         content = self.type.upper()
         if self.smooth:
             content += " SMOOTH"
         if self._userData is not None and len(self._userData) > 0:
-            string = StringIO()
-            writer = Writer(string)
-            writer.writeDict(self._userData)
-            content += " "
-            content += self._encode_dict_as_string(string.getvalue())
+            content += " " + self._userDataString(self._userData)
         return '"{} {} {}"'.format(
             floatToString(self.position[0]), floatToString(self.position[1]), content
         )
@@ -1573,57 +1962,65 @@ class GSNode(GSBase):
         self.smooth = bool(m[3])
 
         if m[4] is not None and len(m[4]) > 0:
-            value = self._decode_dict_as_string(m[4])
-            parser = Parser()
-            self._userData = parser.parse(value)
+            self._userData = self._readUserData(m[4])
 
         return self
 
+    @classmethod
+    def _userDataString(cls, userData):
+        """Return the user data of a node as written in its string."""
+        string = StringIO()
+        writer = Writer(string)
+        writer.writeDict(userData)
+        return cls._encode_dict_as_string(string.getvalue())
+
+    @classmethod
+    def _readUserData(cls, string):
+        """Reverse function of _userDataString"""
+        return Parser().parse(cls._decode_dict_as_string(string))
+
     @property
     def name(self):
-        if "name" in self.userData:
-            return self.userData["name"]
+        userData = self._userData
+        if userData:
+            return userData.get("name")
         return None
 
     @name.setter
     def name(self, value):
+        self._willChange()
+        userData = self._userData
         if value is None:
-            if "name" in self.userData:
-                del self.userData["name"]
+            if userData and "name" in userData:
+                del userData["name"]
+        elif userData is None:
+            self._userData = {"name": value}
         else:
-            self.userData["name"] = value
+            userData["name"] = value
 
     @property
     def index(self):
         assert self.parent
-        return self.parent.nodes.index(self)
+        return self._index
 
     @property
     def nextNode(self):
         assert self.parent
-        index = self.index
-        if index == (len(self.parent.nodes) - 1):
-            return self.parent.nodes[0]
-        elif index < len(self.parent.nodes):
-            return self.parent.nodes[index + 1]
+        nodes = self._parent._nodes
+        return nodes.view((self._index + 1) % len(nodes), self._parent)
 
     @property
     def prevNode(self):
         assert self.parent
-        index = self.index
-        if index == 0:
-            return self.parent.nodes[-1]
-        elif index < len(self.parent.nodes):
-            return self.parent.nodes[index - 1]
+        nodes = self._parent._nodes
+        return nodes.view((self._index - 1) % len(nodes), self._parent)
 
     def makeNodeFirst(self):
         assert self.parent
         if self.type == "offcurve":
             raise ValueError("Off-curve points cannot become start points.")
-        nodes = self.parent.nodes
-        index = self.index
-        newNodes = nodes[index : len(nodes)] + nodes[0:index]
-        self.parent.nodes = newNodes
+        self._parent._willChange()
+        self._parent._nodes.rotate(self._index)
 
     def toggleConnection(self):
         self.smooth = not self.smooth
@@ -1670,13 +2067,339 @@ class GSNode(GSBase):
     def _indices(self):
         """Find the path_index and node_index that identify the given node."""
         path = self.parent
-        layer = path.parent
-        for path_index in range(len(layer.paths)):
-            if path == layer.paths[path_index]:
-                for node_index in range(len(path.nodes)):
-                    if self == path.nodes[node_index]:
-                        return Point(path_index, node_index)
-        return None
+        path_index = path.parent._pathIndex(path)
+        if path_index is None:
+            return None
+        return Point(path_index, self._index)
+
+
+# The node types, by code in the columns of _PackedNodes. Other types are
+# stored by index, with the _OTHER_NODE_TYPE code.
+_NODE_TYPE_NAMES = (
+    GSNode.LINE,
+    GSNode.CURVE,
+    GSNode.QCURVE,
+    GSNode.OFFCURVE,
+    GSNode.MOVE,
+    "n/a",
+)
+_NODE_TYPE_CODES = {name: code for code, name in enumerate(_NODE_TYPE_NAMES)}
+_NODE_TYPE_CONTENTS = tuple(name.upper() for name in _NODE_TYPE_NAMES)
+_OTHER_NODE_TYPE = 255
+
+
+class _NodePosition(Point):
+    """The position of a node in a path, which moves the node when changed."""
+
+    __slots__ = ("node",)
+
+    def __init__(self, x, y, node):
+        super().__init__(x, y)
+        self.node = node
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.node.position = self.value
+
+    @Point.x.setter
+    def x(self, value):
+        self[0] = value
+
+    @Point.y.setter
+    def y(self, value):
+        self[1] = value
+
+
+class _PackedNodes:
+    """The nodes of a path, stored in columns.
+
+    Positions are stored as pairs of doubles, types and smoothness as bytes.
+    User data, and types other than the usual ones, are kept by index for the
+    few nodes that have them.
+
+    The GSNode objects of the nodes are views, made when first needed and
+    kept in `views`, so that a node is always the same object. Their indices
+    are updated when nodes are inserted or removed, and a node removed from
+    the path keeps its attributes.
+    """
+
+    __slots__ = (
+        "positions",
+        "types",
+        "smooth",
+        "userData",
+        "otherTypes",
+        "views",
+        "cachedBounds",
+    )
+
+    def __init__(
+        self, positions=None, types=None, smooth=None, userData=None, otherTypes=None
+    ):
+        self.positions = array("d") if positions is None else positions
+        self.types = bytearray() if types is None else types
+        self.smooth = bytearray() if smooth is None else smooth
+        self.userData = {} if userData is None else userData
+        self.otherTypes = {} if otherTypes is None else otherTypes
+        self.views = None
+        # The (left, bottom, right, top) box of the nodes, () if there are
+        # none, or None until computed.
+        self.cachedBounds = None
+
+    def __len__(self):
+        return len(self.types)
+
+    def coordinates(self, index):
+        positions = self.positions
+        x = positions[2 * index]
+        y = positions[2 * index + 1]
+        # Like parse_float_or_int
+        if x.is_integer():
+            x = int(x)
+        if y.is_integer():
+            y = int(y)
+        return x, y
+
+    def position(self, index, node):
+        x, y = self.coordinates(index)
+        return _NodePosition(x, y, node)
+
+    def setPosition(self, index, value):
+        self.positions[2 * index] = value[0]
+        self.positions[2 * index + 1] = value[1]
+        self.cachedBounds = None
+
+    def type(self, index):
+        code = self.types[index]
+        if code == _OTHER_NODE_TYPE:
+            return self.otherTypes[index]
+        return _NODE_TYPE_NAMES[code]
+
+    def setType(self, index, value):
+        self.cachedBounds = None
+        code = _NODE_TYPE_CODES.get(value)
+        if code is None:
+            self.types[index] = _OTHER_NODE_TYPE
+            self.otherTypes[index] = value
+        else:
+            self.types[index] = code
+            self.otherTypes.pop(index, None)
+
+    def setUserData(self, index, value):
+        if value is None:
+            self.userData.pop(index, None)
+        else:
+            self.userData[index] = value
+
+    def items(self):
+        """Return the ``((x, y), type, smooth)`` tuples of the nodes, without
+        making GSNode objects."""
+        coordinates = self.coordinates
+        types = self.types
+        smooth = self.smooth
+        names = _NODE_TYPE_NAMES
+        items = []
+        for index in range(len(types)):
+            code = types[index]
+            nodetype = self.type(index) if code == _OTHER_NODE_TYPE else names[code]
+            items.append((coordinates(index), nodetype, bool(smooth[index])))
+        return items
+
+    def view(self, index, path):
+        """Return the GSNode object of the node at (non-negative) index."""
+        views = self.views
+        if views is None:
+            views = self.views = [None] * len(self.types)
+        node = views[index]
+        if node is None:
+            node = views[index] = GSNode.__new__(GSNode)
+            node._parent = path
+            node._index = index
+        return node
+
+    def detach(self, node):
+        """Make a GSNode object of this path keep the attributes of its node
+        itself, and no longer be a view of it."""
+        index = node._index
+        node._ownPosition = Point(*self.coordinates(index))
+        node._ownType = self.type(index)
+        node._ownSmooth = bool(self.smooth[index])
+        node._ownUserData = self.userData.get(index)
+        node._parent = None
+        node._index = None
+        if self.views is not None and self.views[index] is node:
+            self.views[index] = None
+
+    def _store(self, index, node, path):
+        """Store the attributes of a GSNode object at index, and make it the
+        view of that node."""
+        if node._parent is not None:
+            # Moved from another path, which keeps the node
+            node._parent._nodes.detach(node)
+            node._ownUserData = copy.copy(node._ownUserData)
+        position = node._ownPosition
+        self.positions[2 * index] = position[0]
+        self.positions[2 * index + 1] = position[1]
+        self.cachedBounds = None
+        self.setType(index, node._ownType)
+        self.smooth[index] = bool(node._ownSmooth)
+        self.setUserData(index, node._ownUserData)
+        node._ownPosition = node._ownType = node._ownSmooth = None
+        node._ownUserData = None
+        node._parent = path
+        node._index = index
+        if self.views is None:
+            self.views = [None] * len(self.types)
+        self.views[index] = node
+
+    def insert(self, index, node, path):
+        self.cachedBounds = None
+        count = len(self.types)
+        self.positions[2 * index : 2 * index] = array("d", (0, 0))
+        self.types.insert(index, 0)
+        self.smooth.insert(index, 0)
+        if index < count:
+            self.userData = _shifted(self.userData, index, 1)
+            self.otherTypes = _shifted(self.otherTypes, index, 1)
+        views = self.views
+        if views is not None:
+            views.insert(index, None)
+            _renumber(views, index + 1)
+        self._store(index, node, path)
+
+    def replace(self, index, node, path):
+        views = self.views
+        if views is not None and views[index] is node:
+            return
+        if views is not None and views[index] is not None:
+            self.detach(views[index])
+        self._store(index, node, path)
+
+    def delete(self, index):
+        self.cachedBounds = None
+        views = self.views
+        if views is not None:
+            if views[index] is not None:
+                self.detach(views[index])
+            del views[index]
+            _renumber(views, index)
+        del self.positions[2 * index : 2 * index + 2]
+        del self.types[index]
+        del self.smooth[index]
+        self.userData = _shifted(self.userData, index, -1)
+        self.otherTypes = _shifted(self.otherTypes, index, -1)
+
+    def bounds(self):
+        """Return the (left, bottom, right, top) box of the nodes, or None if
+        there are none."""
+        bounds = self.cachedBounds
+        if bounds is None:
+            bounds = self.cachedBounds = (
+                _outlineBounds(self.positions, self.types) or ()
+            )
+        return bounds or None
+
+    def rotate(self, index):
+        """Make the node at index the first one, keeping the order of the
+        others."""
+        count = len(self.types)
+        if index == 0:
+            return
+        self.positions = self.positions[2 * index :] + self.positions[: 2 * index]
+        self.types = self.types[index:] + self.types[:index]
+        self.smooth = self.smooth[index:] + self.smooth[:index]
+        self.userData = {(i - index) % count: v for i, v in self.userData.items()}
+        self.otherTypes = {(i - index) % count: v for i, v in self.otherTypes.items()}
+        if self.views is not None:
+            self.views = self.views[index:] + self.views[:index]
+            _renumber(self.views, 0)
+
+    def clear(self):
+        if self.views is not None:
+            for node in self.views:
+                if node is not None:
+                    self.detach(node)
+        self.__init__()
+
+    def copy(self):
+        """Return a copy of the columns, without the views."""
+        nodes = _PackedNodes(
+            array("d", self.positions),
+            bytearray(self.types),
+            bytearray(self.smooth),
+            dict(self.userData),
+            dict(self.otherTypes),
+        )
+        nodes.cachedBounds = self.cachedBounds
+        return nodes
+
+    def plistValues(self):
+        """Return what GSNode.plistValue would for each node."""
+        values = []
+        coordinates = floatsToStrings(self.positions)
+        if "-0" in coordinates:
+            # GSNode positions are read as integers, so -0 is 0.
+            coordinates = ["0" if c == "-0" else c for c in coordinates]
+        userData = self.userData
+        contents = _NODE_TYPE_CONTENTS
+        for index, (code, smooth) in enumerate(zip(self.types, self.smooth)):
+            if code == _OTHER_NODE_TYPE:
+                content = self.otherTypes[index].upper()
+            else:
+                content = contents[code]
+            if smooth:
+                content += " SMOOTH"
+            if userData:
+                data = userData.get(index)
+                if data:
+                    content += " " + GSNode._userDataString(data)
+            values.append(
+                '"%s %s %s"'
+                % (coordinates[2 * index], coordinates[2 * index + 1], content)
+            )
+        return values
+
+
+def _sameBoundsKey(key, other):
+    """Whether two keys of GSLayer._boundsEntry are the same: the nodes, boxes
+    and entries they hold must be the same objects."""
+    paths, components = key
+    otherPaths, otherComponents = other
+    return (
+        len(paths) == len(otherPaths)
+        and len(components) == len(otherComponents)
+        and all(
+            nodes is otherNodes and box is otherBox
+            for (nodes, box), (otherNodes, otherBox) in zip(paths, otherPaths)
+        )
+        and all(
+            name == otherName and transform == otherTransform and entry is otherEntry
+            for (name, transform, entry), (
+                otherName,
+                otherTransform,
+                otherEntry,
+            ) in zip(components, otherComponents)
+        )
+    )
+
+
+def _shifted(table, index, delta):
+    """Return a table of values by node index, after a node was inserted at
+    index (delta = 1) or removed from it (delta = -1)."""
+    if not table:
+        return table
+    return {
+        (i + delta if i >= index else i): value
+        for i, value in table.items()
+        if delta > 0 or i != index
+    }
+
+
+def _renumber(views, start):
+    for index in range(start, len(views)):
+        node = views[index]
+        if node is not None:
+            node._index = index
 
 
 class GSPath(GSBase):
@@ -1686,21 +2409,39 @@ class GSPath(GSBase):
 
     def __init__(self):
         super().__init__()
-        self.nodes = []
+        self._nodes = _PackedNodes()
 
     @property
     def parent(self):
         return self._parent
 
+    def _setNodes(self, value):
+        if isinstance(value, _PackedNodes):
+            # As decoded by the parser
+            self._nodes.clear()
+            self._nodes = value
+        else:
+            PathNodesProxy(self).setter(value)
+
     def shouldWriteValueForKey(self, key):
         if key == "closed":
             return True
+        if key == "nodes":
+            return len(self._nodes) > 0
         return super().shouldWriteValueForKey(key)
 
-    nodes = property(
-        lambda self: PathNodesProxy(self),
-        lambda self, value: PathNodesProxy(self).setter(value),
-    )
+    nodes = _CachedProxy(PathNodesProxy, _setNodes)
+
+    def __getstate__(self):
+        return _withoutProxies(self.__dict__.copy())
+
+    def __copy__(self):
+        # The copy has nodes of its own, which the path changes in place.
+        cls = getattr(self, "_untrackedClass", type(self))
+        path = cls.__new__(cls)
+        path.__dict__.update(self.__getstate__())
+        path._nodes = self._nodes.copy()
+        return path
 
     @property
     def segments(self):
@@ -1751,36 +2492,19 @@ class GSPath(GSBase):
 
     @property
     def bounds(self):
-        left, bottom, right, top = None, None, None, None
-        for segment in self.segments:
-            newLeft, newBottom, newRight, newTop = segment.bbox()
-            if left is None:
-                left = newLeft
-            else:
-                left = min(left, newLeft)
-            if bottom is None:
-                bottom = newBottom
-            else:
-                bottom = min(bottom, newBottom)
-            if right is None:
-                right = newRight
-            else:
-                right = max(right, newRight)
-            if top is None:
-                top = newTop
-            else:
-                top = max(top, newTop)
-        return Rect(Point(left, bottom), Point(right - left, top - bottom))
+        # Kept with the nodes until they change
+        return _boxToRect(self._nodes.bounds())
 
     @property
     def direction(self):
-        direction = 0
-        for i in range(len(self.nodes)):
-            thisNode = self.nodes[i]
-            nextNode = thisNode.nextNode
-            direction += (nextNode.position.x - thisNode.position.x) * (
-                nextNode.position.y + thisNode.position.y
-            )
+        positions = self._nodes.positions
+        xs = positions[0::2]
+        ys = positions[1::2]
+        # Each node and the next one, the last one being followed by the first
+        direction = sum(
+            (x2 - x1) * (y2 + y1)
+            for x1, y1, x2, y2 in zip(xs, ys, xs[1:] + xs[:1], ys[1:] + ys[:1])
+        )
         if direction < 0:
             return -1
         else:
@@ -1885,72 +2609,194 @@ class segment(list):
             raise ValueError
 
     def bezierMinMax(self, x0, y0, x1, y1, x2, y2, x3, y3):
-        tvalues = []
-        xvalues = []
-        yvalues = []
-
-        for i in range(2):
-            if i == 0:
-                b = 6 * x0 - 12 * x1 + 6 * x2
-                a = -3 * x0 + 9 * x1 - 9 * x2 + 3 * x3
-                c = 3 * x1 - 3 * x0
-            else:
-                b = 6 * y0 - 12 * y1 + 6 * y2
-                a = -3 * y0 + 9 * y1 - 9 * y2 + 3 * y3
-                c = 3 * y1 - 3 * y0
-
-            if abs(a) < 1e-12:
-                if abs(b) < 1e-12:
-                    continue
-                t = -c / b
-                if 0 < t < 1:
-                    tvalues.append(t)
-                continue
+        return _bezierMinMax(x0, y0, x1, y1, x2, y2, x3, y3)
+
 
-            b2ac = b * b - 4 * c * a
-            if b2ac < 0:
+def _bezierMinMax(x0, y0, x1, y1, x2, y2, x3, y3):
+    """Return the (left, bottom, right, top) box of a cubic Bézier curve."""
+    tvalues = []
+    xvalues = []
+    yvalues = []
+
+    for i in range(2):
+        if i == 0:
+            b = 6 * x0 - 12 * x1 + 6 * x2
+            a = -3 * x0 + 9 * x1 - 9 * x2 + 3 * x3
+            c = 3 * x1 - 3 * x0
+        else:
+            b = 6 * y0 - 12 * y1 + 6 * y2
+            a = -3 * y0 + 9 * y1 - 9 * y2 + 3 * y3
+            c = 3 * y1 - 3 * y0
+
+        if abs(a) < 1e-12:
+            if abs(b) < 1e-12:
                 continue
-            sqrtb2ac = math.sqrt(b2ac)
-            t1 = (-b + sqrtb2ac) / (2 * a)
-            if 0 < t1 < 1:
-                tvalues.append(t1)
-            t2 = (-b - sqrtb2ac) / (2 * a)
-            if 0 < t2 < 1:
-                tvalues.append(t2)
-
-        for j in range(len(tvalues) - 1, -1, -1):
-            t = tvalues[j]
-            mt = 1 - t
-            newxValue = (
-                (mt * mt * mt * x0)
-                + (3 * mt * mt * t * x1)
-                + (3 * mt * t * t * x2)
-                + (t * t * t * x3)
-            )
-            if len(xvalues) > 0:
-                xvalues[j] = newxValue
-            else:
-                xvalues.append(newxValue)
-            newyValue = (
-                (mt * mt * mt * y0)
-                + (3 * mt * mt * t * y1)
-                + (3 * mt * t * t * y2)
-                + (t * t * t * y3)
+            t = -c / b
+            if 0 < t < 1:
+                tvalues.append(t)
+            continue
+
+        b2ac = b * b - 4 * c * a
+        if b2ac < 0:
+            continue
+        sqrtb2ac = math.sqrt(b2ac)
+        t1 = (-b + sqrtb2ac) / (2 * a)
+        if 0 < t1 < 1:
+            tvalues.append(t1)
+        t2 = (-b - sqrtb2ac) / (2 * a)
+        if 0 < t2 < 1:
+            tvalues.append(t2)
+
+    for j in range(len(tvalues) - 1, -1, -1):
+        t = tvalues[j]
+        mt = 1 - t
+        newxValue = (
+            (mt * mt * mt * x0)
+            + (3 * mt * mt * t * x1)
+            + (3 * mt * t * t * x2)
+            + (t * t * t * x3)
+        )
+        if len(xvalues) > 0:
+            xvalues[j] = newxValue
+        else:
+            xvalues.append(newxValue)
+        newyValue = (
+            (mt * mt * mt * y0)
+            + (3 * mt * mt * t * y1)
+            + (3 * mt * t * t * y2)
+            + (t * t * t * y3)
+        )
+        if len(yvalues) > 0:
+            yvalues[j] = newyValue
+        else:
+            yvalues.append(newyValue)
+
+    xvalues.append(x0)
+    xvalues.append(x3)
+    yvalues.append(y0)
+    yvalues.append(y3)
+
+    return min(xvalues), min(yvalues), max(xvalues), max(yvalues)
+
+
+def _outlineBounds(positions, types):
+    """Return the (left, bottom, right, top) box of the nodes of a path, given
+    as the columns of _PackedNodes, or None if there are none.
+
+    Cubic curves are measured at their extremes. Other off-curve points, as in
+    quadratic curves, are included as they are, which may make the box larger
+    than the outline.
+    """
+    count = len(types)
+    if not count:
+        return None
+    xs = positions[0::2]
+    ys = positions[1::2]
+    offcurve = _NODE_TYPE_CODES[GSNode.OFFCURVE]
+    curve = _NODE_TYPE_CODES[GSNode.CURVE]
+    points = [i for i in range(count) if types[i] != offcurve]
+    if len(points) == count:
+        return min(xs), min(ys), max(xs), max(ys)
+    lefts = [xs[i] for i in points]
+    bottoms = [ys[i] for i in points]
+    rights = lefts[:]
+    tops = bottoms[:]
+    measured = set()
+    for i in points:
+        # The off-curve points before a node are at the end of the path for
+        # the first node.
+        if (
+            types[i] == curve
+            and count >= 4
+            and types[i - 1] == offcurve
+            and types[i - 2] == offcurve
+            and types[i - 3] != offcurve
+        ):
+            left, bottom, right, top = _bezierMinMax(
+                xs[i - 3],
+                ys[i - 3],
+                xs[i - 2],
+                ys[i - 2],
+                xs[i - 1],
+                ys[i - 1],
+                xs[i],
+                ys[i],
             )
-            if len(yvalues) > 0:
-                yvalues[j] = newyValue
-            else:
-                yvalues.append(newyValue)
+            lefts.append(left)
+            bottoms.append(bottom)
+            rights.append(right)
+            tops.append(top)
+            measured.add((i - 1) % count)
+            measured.add((i - 2) % count)
+    for i in range(count):
+        if types[i] == offcurve and i not in measured:
+            lefts.append(xs[i])
+            bottoms.append(ys[i])
+            rights.append(xs[i])
+            tops.append(ys[i])
+    return min(lefts), min(bottoms), max(rights), max(tops)
+
+
+def _transformPositions(positions, transform):
+    """Return the (x, y) positions of nodes, as stored in _PackedNodes, moved
+    by an affine transform (see GSComponent.transform)."""
+    a, b, c, d, e, f = transform
+    xs = positions[0::2]
+    ys = positions[1::2]
+    moved = array("d", bytes(8 * len(positions)))
+    moved[0::2] = array("d", [a * x + c * y + e for x, y in zip(xs, ys)])
+    moved[1::2] = array("d", [b * x + d * y + f for x, y in zip(xs, ys)])
+    return moved
+
+
+def _composeTransforms(outer, inner):
+    """Return the transform that applies 'inner', then 'outer'."""
+    A, B, C, D, E, F = outer
+    a, b, c, d, e, f = inner
+    return (
+        A * a + C * b,
+        B * a + D * b,
+        A * c + C * d,
+        B * c + D * d,
+        A * e + C * f + E,
+        B * e + D * f + F,
+    )
 
-        xvalues.append(x0)
-        xvalues.append(x3)
-        yvalues.append(y0)
-        yvalues.append(y3)
 
-        return min(xvalues), min(yvalues), max(xvalues), max(yvalues)
+def _unionBoxes(boxes):
+    boxes = [box for box in boxes if box is not None]
+    if not boxes:
+        return None
+    return (
+        min(box[0] for box in boxes),
+        min(box[1] for box in boxes),
+        max(box[2] for box in boxes),
+        max(box[3] for box in boxes),
+    )
+
+
+def _boxToRect(box):
+    if box is None:
+        return None
+    left, bottom, right, top = (int(v) if float(v).is_integer() else v for v in box)
+    return Rect(Point(left, bottom), Point(right - left, top - bottom))
 
 
-class GSComponent(GSBase):
+class GSComponent(_CompactBase):
+    __slots__ = (
+        "alignment",
+        "anchor",
+        "locked",
+        "name",
+        "smartComponentValues",
+        "transform",
+        "automaticAlignment",
+        "_parent",
+        # Set by the scale and rotation properties.
+        "_sX",
+        "_sY",
+        "_R",
+    )
     _classesForName = {
         "alignment": int,
         "anchor": str,
@@ -1961,7 +2807,6 @@ class GSComponent(GSBase):
     }
     _wrapperKeysTranslate = {"piece": "smartComponentValues"}
     _defaultsForName = {"transform": Transform(1, 0, 0, 1, 0, 0)}
-    _parent = None
 
     # TODO: glyph arg is required
     def __init__(self, glyph="", offset=(0, 0), scale=(1, 1), transform=None):
@@ -2070,32 +2915,44 @@ class GSComponent(GSBase):
         return self.parent.parent.parent.glyphs[self.name].layers[self.parent.layerId]
 
     def applyTransformation(self, x, y):
-        x *= self.scale[0]
-        y *= self.scale[1]
-        x += self.position.x
-        y += self.position.y
-        # TODO:
-        # Integrate rotation
-        return x, y
+        a, b, c, d, e, f = self.transform.value
+        return a * x + c * y + e, b * x + d * y + f
 
     @property
     def bounds(self):
-        bounds = self.layer.bounds
-        if bounds is not None:
-            left, bottom, width, height = self.layer.bounds
-            right = left + width
-            top = bottom + height
-
-            left, bottom = self.applyTransformation(left, bottom)
-            right, top = self.applyTransformation(right, top)
-
-            if (
-                left is not None
-                and bottom is not None
-                and right is not None
-                and top is not None
-            ):
-                return Rect(Point(left, bottom), Point(right - left, top - bottom))
+        return _boxToRect(self._box())
+
+    def _baseLayer(self):
+        """Return the layer of the component glyph that this component shows,
+        or None."""
+        layer = self.parent
+        glyph = layer.parent.parent.glyphs[self.name]
+        if glyph is None:
+            return None
+        return glyph.layers[layer.layerId]
+
+    def _box(self, baseEntry=None):
+        """Return the (left, bottom, right, top) box of the component, or
+        None. 'baseEntry' is the GSLayer._boundsEntry of the base layer, if
+        already known."""
+        if baseEntry is None:
+            layer = self._baseLayer()
+            if layer is None:
+                return None
+            baseEntry = layer._boundsEntry()
+        box = baseEntry[1]
+        if box is None:
+            return None
+        transform = tuple(self.transform.value)
+        a, b, c, d, e, f = transform
+        if b == 0 and c == 0:
+            # Only scaled and moved: the box of the base layer, moved
+            left, bottom, right, top = box
+            xs = (a * left + e, a * right + e)
+            ys = (d * bottom + f, d * top + f)
+            return min(xs), min(ys), max(xs), max(ys)
+        # Rotated or skewed: the outline itself, moved
+        return self._baseLayer()._transformedBox(transform)
 
     # smartComponentValues = property(
     #     lambda self: self.piece,
@@ -2119,9 +2976,9 @@ class GSSmartComponentAxis(GSBase):
         return super().shouldWriteValueForKey(key)
 
 
-class GSAnchor(GSBase):
+class GSAnchor(_CompactBase):
+    __slots__ = ("name", "position", "_parent")
     _classesForName = {"name": str, "position": Point}
-    _parent = None
     _defaultsForName = {"position": Point(0, 0)}
 
     def __init__(self, name=None, position=None):
@@ -2146,7 +3003,26 @@ class GSAnchor(GSBase):
         return self._parent
 
 
-class GSHint(GSBase):
+class GSHint(_CompactBase):
+    __slots__ = (
+        "horizontal",
+        "options",
+        "_origin",
+        "_originNode",
+        "_other1",
+        "_otherNode1",
+        "_other2",
+        "_otherNode2",
+        "place",
+        "scale",
+        "stem",
+        "_target",
+        "_targetNode",
+        "type",
+        "name",
+        "settings",
+        "_parent",
+    )
     _classesForName = {
         "horizontal": bool,
         "options": int,  # bitfield
@@ -2170,6 +3046,16 @@ class GSHint(GSBase):
         "scale": None,
         "stem": -2,
     }
+    _attributeDefaults = {
+        "_origin": None,
+        "_originNode": None,
+        "_other1": None,
+        "_otherNode1": None,
+        "_other2": None,
+        "_otherNode2": None,
+        "_target": None,
+        "_targetNode": None,
+    }
     _keyOrder = (
         "horizontal",
         "origin",
@@ -2473,10 +3359,10 @@ class GSInstance(GSBase):
         self.isItalic = False
         self._customParameters = []
 
-    customParameters = property(
-        lambda self: CustomParametersProxy(self),
-        lambda self, value: CustomParametersProxy(self).setter(value),
-    )
+    def __getstate__(self):
+        return _withoutProxies(self.__dict__.copy())
+
+    customParameters = _CachedProxy(CustomParametersProxy)
 
     @property
     def exports(self):
@@ -2725,6 +3611,10 @@ class GSLayer(GSBase):
         "vertWidth",
         "width",
     )
+    # {id(path): index} of the paths, see _pathIndex
+    _pathIndices = None
+    # (key, box) of the bounds, see _boundsEntry
+    _boundsCache = None
 
     def __init__(self):
         super().__init__()
@@ -2740,6 +3630,20 @@ class GSLayer(GSBase):
         self._background = None
         self.backgroundImage = None
 
+    def content_hash(self):
+        """Return a digest of the layer as written in a .glyphs file (see
+        `glyphsLib.writer.content_hash`).
+
+        Like that of glyphs, it is memoized while the glyph of the layer is
+        tracked for changes (see `GSGlyph.content_hash`).
+        """
+        digest = self.__dict__.get("_contentHash")
+        if digest is None:
+            digest = content_hash(self)
+            if isinstance(self, _Tracked):
+                self.__dict__["_contentHash"] = digest
+        return digest
+
     def __repr__(self):
         name = self.name
         try:
@@ -2761,6 +3665,18 @@ class GSLayer(GSBase):
                 or self.master.widthValue < other.master.widthValue
             )
 
+    @property
+    def associatedMasterId(self):
+        return self._associatedMasterId
+
+    @associatedMasterId.setter
+    def associatedMasterId(self, value):
+        self._associatedMasterId = value
+        # The order of the layers of the glyph depends on it.
+        glyph = self.__dict__.get("parent")
+        if glyph is not None and isinstance(glyph, GSGlyph):
+            glyph._layerOrder = None
+
     @property
     def layerId(self):
         return self._layerId
@@ -2819,40 +3735,19 @@ class GSLayer(GSBase):
     def name(self, value):
         self._name = value
 
-    anchors = property(
-        lambda self: LayerAnchorsProxy(self),
-        lambda self, value: LayerAnchorsProxy(self).setter(value),
-    )
+    anchors = _CachedProxy(LayerAnchorsProxy)
 
-    hints = property(
-        lambda self: LayerHintsProxy(self),
-        lambda self, value: LayerHintsProxy(self).setter(value),
-    )
+    hints = _CachedProxy(LayerHintsProxy)
 
-    paths = property(
-        lambda self: LayerPathsProxy(self),
-        lambda self, value: LayerPathsProxy(self).setter(value),
-    )
+    paths = _CachedProxy(LayerPathsProxy)
 
-    components = property(
-        lambda self: LayerComponentsProxy(self),
-        lambda self, value: LayerComponentsProxy(self).setter(value),
-    )
+    components = _CachedProxy(LayerComponentsProxy)
 
-    guides = property(
-        lambda self: LayerGuideLinesProxy(self),
-        lambda self, value: LayerGuideLinesProxy(self).setter(value),
-    )
+    guides = _CachedProxy(LayerGuideLinesProxy)
 
-    annotations = property(
-        lambda self: LayerAnnotationProxy(self),
-        lambda self, value: LayerAnnotationProxy(self).setter(value),
-    )
+    annotations = _CachedProxy(LayerAnnotationProxy)
 
-    userData = property(
-        lambda self: UserDataProxy(self),
-        lambda self, value: UserDataProxy(self).setter(value),
-    )
+    userData = _CachedProxy(UserDataProxy)
 
     @property
     def smartComponentPoleMapping(self):
@@ -2866,38 +3761,83 @@ class GSLayer(GSBase):
 
     @property
     def bounds(self):
-        left, bottom, right, top = None, None, None, None
-
-        for item in self.paths.values() + self.components.values():
+        return _boxToRect(self._boundsEntry()[1])
 
-            newLeft, newBottom, newWidth, newHeight = item.bounds
-            newRight = newLeft + newWidth
-            newTop = newBottom + newHeight
+    def _boundsEntry(self):
+        """Return the (key, box) entry of the bounds of the layer, where box
+        is (left, bottom, right, top) or None.
 
-            if left is None:
-                left = newLeft
-            else:
-                left = min(left, newLeft)
-            if bottom is None:
-                bottom = newBottom
-            else:
-                bottom = min(bottom, newBottom)
-            if right is None:
-                right = newRight
-            else:
-                right = max(right, newRight)
-            if top is None:
-                top = newTop
-            else:
-                top = max(top, newTop)
-
-        if (
-            left is not None
-            and bottom is not None
-            and right is not None
-            and top is not None
-        ):
-            return Rect(Point(left, bottom), Point(right - left, top - bottom))
+        The entry is kept until the layer changes: the key holds the nodes of
+        the paths with their boxes, which they keep until they change, and
+        the name, transform and entry of the base layer of each component.
+        A new entry is made when any of them differs, so that the entries of
+        the layers that use this one through components are renewed too.
+        """
+        paths = tuple((path._nodes, path._nodes.bounds()) for path in self._paths)
+        components = []
+        for component in self._components:
+            layer = component._baseLayer()
+            components.append(
+                (
+                    component.name,
+                    tuple(component.transform.value),
+                    None if layer is None else layer._boundsEntry(),
+                )
+            )
+        key = (paths, components)
+        entry = self._boundsCache
+        if entry is not None and _sameBoundsKey(entry[0], key):
+            return entry
+        boxes = [box for _, box in paths]
+        for component, (_, _, baseEntry) in zip(self._components, components):
+            if baseEntry is not None:
+                boxes.append(component._box(baseEntry))
+        entry = self._boundsCache = (key, _unionBoxes(boxes))
+        return entry
+
+    def _transformedBox(self, transform):
+        """Return the box of the outline of the layer moved by 'transform',
+        including the outlines of its components."""
+        boxes = [
+            _outlineBounds(
+                _transformPositions(path._nodes.positions, transform), path._nodes.types
+            )
+            for path in self._paths
+        ]
+        for component in self._components:
+            layer = component._baseLayer()
+            if layer is not None:
+                boxes.append(
+                    layer._transformedBox(
+                        _composeTransforms(transform, component.transform.value)
+                    )
+                )
+        return _unionBoxes(boxes)
+
+    def __getstate__(self):
+        # The indices and bounds are found again when needed, and the bounds
+        # refer to other layers.
+        state = _withoutProxies(self.__dict__.copy())
+        state.pop("_pathIndices", None)
+        state.pop("_boundsCache", None)
+        state.pop("_contentHash", None)
+        return state
+
+    def _pathIndex(self, path):
+        """Return the index of a path in the layer, or None.
+
+        The indices of the paths are kept until the paths change, so that
+        the nodes that hints refer to are found without looking through all
+        the paths of the layer each time.
+        """
+        paths = self._paths
+        indices = self._pathIndices
+        if indices is not None:
+            index = indices.get(id(path))
+            if index is not None and index < len(paths) and paths[index] is path:
+                return index
+        self._pathIndices = indices = {id(p): i for i, p in enumerate(paths)}
+        return indices.get(id(path))
 
     def _find_node_by_indices(self, point):
         """"Find the GSNode that is refered to by the given indices.
@@ -3034,11 +3974,21 @@ class GSGlyph(GSBase):
         "partsSettings",
     )
 
+    # Where the glyph is in the source text of its font, as long as it has
+    # not been changed since it was parsed from it, see _keepSource.
+    _sourceRange = None
+    _name = None
+    # The GSFont._masterIndex that the layers were last checked against, see
+    # GlyphLayerProxy._ensureMasterLayers.
+    _verifiedMasters = None
+    # (master index, layers, ordered layers), see _orderedLayers
+    _layerOrder = None
+
     def __init__(self, name=None):
         super().__init__()
         self._layers = OrderedDict()
-        self.name = name
         self.parent = None
+        self.name = name
         self.export = True
         self.selected = False
         self.smartComponentAxes = []
@@ -3047,15 +3997,82 @@ class GSGlyph(GSBase):
     def __repr__(self):
         return '<GSGlyph "{}" with {} layers>'.format(self.name, len(self.layers))
 
+    def __getstate__(self):
+        state = _withoutProxies(self.__dict__.copy())
+        state.pop("_verifiedMasters", None)
+        state.pop("_layerOrder", None)
+        # Copies are not tracked for changes.
+        state.pop("_sourceRange", None)
+        state.pop("_contentHash", None)
+        return state
+
+    def _layersChanged(self):
+        self._willChange()
+        self._verifiedMasters = None
+        self._layerOrder = None
+
+    def _orderedLayers(self):
+        """Return the layers in the order of LayersIterator: the layers of the
+        masters in the order of the masters, then the other layers.
+
+        The order is kept until the masters or the layers change.
+        """
+        font = self.parent
+        masterIndex = font._masterIndex
+        if masterIndex is None:
+            masterIndex = font._indexMasters()
+        layers = self._layers
+        order = self._layerOrder
+        if order is not None and order[0] is masterIndex and order[1] is layers:
+            return order[2]
+        masterLayerIds = {
+            l.associatedMasterId
+            for l in layers.values()
+            if l.associatedMasterId == l.layerId
+        }
+        masterLayerIds.intersection_update(masterIndex)
+        orderedLayers = [layers[m.id] for m in font._masters if m.id in masterLayerIds]
+        orderedLayers += [
+            layers[l.layerId]
+            for l in layers.values()
+            if l.layerId not in masterLayerIds
+        ]
+        self._layerOrder = (masterIndex, layers, orderedLayers)
+        return orderedLayers
+
+    def content_hash(self, master_id=None):
+        """Return a digest of the glyph as written in a .glyphs file (see
+        `glyphsLib.writer.content_hash`), or with a `master_id`, of its layer
+        for that master (None if it has none).
+
+        In fonts loaded with ``keep_source=True``, whose glyphs are tracked
+        for changes (see `_trackGlyph`), the hashes of glyphs and of their
+        layers are memoized until the glyph changes.
+        """
+        if master_id is not None:
+            layer = self._layers.get(master_id)
+            return None if layer is None else layer.content_hash()
+        digest = self.__dict__.get("_contentHash")
+        if digest is not None:
+            return digest
+        source = _unchangedSource(self)
+        if source is None:
+            digest = content_hash(self)
+        else:
+            # Written the same way, see _keepSource
+            if isinstance(source, str):
+                source = source.encode("utf-8")
+            digest = _content_digest(source)
+        if isinstance(self, _Tracked):
+            self.__dict__["_contentHash"] = digest
+        return digest
+
     def shouldWriteValueForKey(self, key):
         if key in ("script", "category", "subCategory"):
             return getattr(self, key) is not None
         return super().shouldWriteValueForKey(key)
 
-    layers = property(
-        lambda self: GlyphLayerProxy(self),
-        lambda self, value: GlyphLayerProxy(self).setter(value),
-    )
+    layers = _CachedProxy(GlyphLayerProxy)
 
     def _setupLayer(self, layer, key):
         assert isinstance(key, str)
@@ -3065,6 +4082,15 @@ class GSGlyph(GSBase):
         if self.parent and self.parent.masterForId(key):
             layer.associatedMasterId = key
 
+    def _setupLayers(self):
+        for layer in self.layers.values():
+            if (
+                not hasattr(layer, "associatedMasterId")
+                or layer.associatedMasterId is None
+                or len(layer.associatedMasterId) == 0
+            ):
+                self._setupLayer(layer, layer.layerId)
+
     # def setLayerForKey(self, layer, key):
     #     if Layer and Key:
     #         Layer.parent = self
@@ -3077,16 +4103,14 @@ class GSGlyph(GSBase):
         for layer in list(self._layers):
             if layer == key:
                 del self._layers[key]
+        self._layersChanged()
 
     @property
     def string(self):
         if self.unicode:
             return chr(int(self.unicode, 16))
 
-    userData = property(
-        lambda self: UserDataProxy(self),
-        lambda self, value: UserDataProxy(self).setter(value),
-    )
+    userData = _CachedProxy(UserDataProxy)
 
     @property
     def glyphname(self):
@@ -3109,6 +4133,21 @@ class GSGlyph(GSBase):
         """An unique identifier for each glyph"""
         return self.name
 
+    # The name and unicodes are properties, to keep the indexes of the font
+    # up to date, see GSFont._indexGlyphs. The parent is read from __dict__,
+    # as it is not set yet while the glyph is being set up.
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        font = self.__dict__.get("parent")
+        if font is not None:
+            font._glyphIndex = None
+
     @property
     def unicode(self):
         if self._unicodes:
@@ -3117,15 +4156,549 @@ class GSGlyph(GSBase):
 
     @unicode.setter
     def unicode(self, unicode):
-        self._unicodes = UnicodesList(unicode)
+        self.unicodes = unicode
 
     @property
     def unicodes(self):
-        return self._unicodes
+        unicodes = self._unicodes
+        # Copied glyphs may share the list, it belongs to the last one read.
+        unicodes._owner = self
+        return unicodes
 
     @unicodes.setter
     def unicodes(self, unicodes):
-        self._unicodes = UnicodesList(unicodes)
+        font = self.__dict__.get("parent")
+        old = None if font is None else self.unicode
+        unicodes = self._unicodes = UnicodesList(unicodes)
+        unicodes._owner = self
+        if font is not None:
+            font._glyphUnicodeChanged(self, old)
+
+    def _unicodesChanged(self, unicodes, old):
+        """Called when `unicodes` was changed in place, with the unicode it
+        started with before."""
+        font = self.__dict__.get("parent")
+        if unicodes is self.__dict__.get("_unicodes"):
+            self._willChange()
+            if font is not None:
+                font._glyphUnicodeChanged(self, old)
+
+
+_IMMUTABLE_TYPES = frozenset(
+    (type(None), str, int, float, bool, tuple, datetime.datetime)
+)
+
+
+# Attributes that objects set to keep what they found when read, which are
+# not written: setting them does not change the object.
+_UNTRACKED_ATTRIBUTES = frozenset(
+    (
+        "_boundsCache",
+        "_layerOrder",
+        "_pathIndices",
+        "_segmentLength",
+        "_segments",
+        "_verifiedMasters",
+        "_R",
+        "_sX",
+        "_sY",
+    )
+)
+
+# Attributes that link an object to the one it is part of, see _glyphOf.
+_PARENT_ATTRIBUTES = frozenset(("parent", "_parent", "_foreground"))
+
+
+class _Tracked:
+    """Base of the classes that the objects of a tracked glyph are turned
+    into, see `_trackGlyph`.
+
+    Setting or deleting an attribute tells the object that it changes,
+    except for the attributes that only keep what was read, and setting the
+    same parent again. Copies and pickles are regular objects.
+
+    The class of an object can only be changed to one with the same layout,
+    so the subclasses come after the class they track in the bases, and
+    their methods are copied from this one (see `_trackedClass`).
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        # Taken first, the object is turned back into a regular one when it
+        # changes.
+        cls = self._untrackedClass
+        if name not in _UNTRACKED_ATTRIBUTES and (
+            name not in _PARENT_ATTRIBUTES or value is not getattr(self, name, None)
+        ):
+            self._willChange()
+        cls.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        cls = self._untrackedClass
+        self._willChange()
+        cls.__delattr__(self, name)
+
+    def __reduce_ex__(self, protocol):
+        cls = self._untrackedClass
+        _, arguments, *rest = cls.__reduce_ex__(self, protocol)
+        return (_newUntracked, (cls,) + arguments[1:], *rest)
+
+    def _willChange(self):
+        glyph = _glyphOf(self)
+        if isinstance(glyph, _Tracked):
+            _untrackGlyph(glyph)
+        if isinstance(self, _Tracked):
+            # No longer part of a tracked glyph
+            object.__setattr__(self, "__class__", self._untrackedClass)
+
+
+def _newUntracked(cls, *args):
+    # Pickles of tracked objects create regular ones, see _Tracked.
+    return cls.__new__(cls, *args)
+
+
+def _trackedDefault(self, name):
+    # Only called for the attributes of compact objects that are not set,
+    # whose mutable defaults are tracked like their other values.
+    value = self._untrackedClass.__getattr__(self, name)
+    if type(value) not in _IMMUTABLE_TYPES:
+        value = _trackedValue(value, self)
+        object.__setattr__(self, name, value)
+    return value
+
+
+# The _Tracked subclasses of classes, see _trackedClass.
+_trackedClasses = {}
+
+
+def _trackedClass(cls):
+    """Return the subclass of 'cls' that its objects are turned into while
+    they are tracked, which has the same name, so that they are written the
+    same way."""
+    try:
+        return _trackedClasses[cls]
+    except KeyError:
+        pass
+    namespace = {
+        "__slots__": (),
+        "__module__": cls.__module__,
+        "__qualname__": cls.__qualname__,
+        "_untrackedClass": cls,
+    }
+    for name in ("__setattr__", "__delattr__", "__reduce_ex__", "_willChange"):
+        namespace[name] = _Tracked.__dict__[name]
+    if issubclass(cls, _CompactBase):
+        namespace["_attributeDefaults"] = cls._attributeDefaults
+        namespace["__getattr__"] = _trackedDefault
+    tracked = _trackedClasses[cls] = type(cls.__name__, (cls, _Tracked), namespace)
+    return tracked
+
+
+class _TrackedContainer:
+    """Base of the lists and dictionaries of tracked objects, which tell the
+    object that owns them before they change, see `_trackGlyph`.
+
+    The `mutators` of a subclass are the methods that change it. The items
+    of a container are tracked too. Copies and pickles are regular lists and
+    dictionaries.
+    """
+
+    __slots__ = ()
+
+    def __init_subclass__(cls, mutators=(), **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in mutators:
+            method = getattr(cls, name, None)
+            if method is not None:
+                setattr(cls, name, _notifying(method))
+
+
+_LIST_MUTATORS = (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+    "sort",
+)
+
+_DICT_MUTATORS = (
+    "__setitem__",
+    "__delitem__",
+    "__ior__",
+    "clear",
+    "pop",
+    "popitem",
+    "setdefault",
+    "update",
+)
+
+
+class _TrackedList(_TrackedContainer, list, mutators=_LIST_MUTATORS):
+    __slots__ = ("_owner",)
+
+    def __init__(self, values, owner):
+        list.__init__(self, [_trackedValue(value, owner) for value in values])
+        self._owner = owner
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+class _TrackedDict(_TrackedContainer, dict, mutators=_DICT_MUTATORS):
+    __slots__ = ("_owner",)
+
+    def __init__(self, items, owner):
+        dict.__init__(
+            self, [(key, _trackedValue(value, owner)) for key, value in items.items()]
+        )
+        self._owner = owner
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class _TrackedOrderedDict(
+    _TrackedContainer, OrderedDict, mutators=_DICT_MUTATORS + ("move_to_end",)
+):
+    __slots__ = ("_owner",)
+
+    def __init__(self, items, owner):
+        OrderedDict.__init__(self)
+        for key, value in items.items():
+            OrderedDict.__setitem__(self, key, _trackedValue(value, owner))
+        self._owner = owner
+
+    def __reduce__(self):
+        return OrderedDict, (list(self.items()),)
+
+
+class _SourceKerning(_TrackedOrderedDict):
+    """The kerning of a font loaded with keep_source, as long as it is
+    written in the source text the way Writer writes it and has not been
+    changed since, see `_keepSource`."""
+
+    __slots__ = ("_source", "_sourceRange")
+
+    def __init__(self, kerning, source, sourceRange):
+        super().__init__(kerning, self)
+        self._source = source
+        self._sourceRange = sourceRange
+
+    def _willChange(self):
+        self._sourceRange = None
+
+
+def _trackedValue(value, owner):
+    """Return the value of an attribute of a tracked object 'owner', made to
+    tell it before it changes if it is a list or a dictionary. The
+    coordinates of points, rects and transforms are made so in place."""
+    cls = type(value)
+    if cls is list:
+        return _TrackedList(value, owner)
+    if cls is dict:
+        return _TrackedDict(value, owner)
+    if cls is OrderedDict:
+        return _TrackedOrderedDict(value, owner)
+    if isinstance(value, ValueType) and type(value.value) is list:
+        value.value = _TrackedList(value.value, owner)
+    return value
+
+
+# The names of the slots of compact classes, see _trackValues.
+_slotNames = {}
+
+
+def _trackValues(obj):
+    """Replace the values of the attributes of an object by tracked ones, see
+    `_trackedValue`."""
+    if not isinstance(obj, _CompactBase):
+        attributes = obj.__dict__
+        for name, value in list(attributes.items()):
+            attributes[name] = _trackedValue(value, obj)
+        return
+    cls = type(obj)
+    names = _slotNames.get(cls)
+    if names is None:
+        names = _slotNames[cls] = [
+            name
+            for klass in cls.__mro__
+            for name in klass.__dict__.get("__slots__", ())
+        ]
+    for name in names:
+        try:
+            value = object.__getattribute__(obj, name)
+        except AttributeError:
+            # Not set, see _trackedDefault
+            continue
+        tracked = _trackedValue(value, obj)
+        if tracked is not value:
+            object.__setattr__(obj, name, tracked)
+
+
+def _glyphParts(glyph):
+    """Yield the objects that a glyph is made of, each with the one it is part
+    of: its smart component axes, its layers and their backgrounds, and what
+    they have (but nodes, which are views of their path)."""
+    for axis in glyph.__dict__.get("partsSettings") or ():
+        yield axis, glyph
+    for layer in glyph._layers.values():
+        yield layer, glyph
+        yield from _layerParts(layer)
+
+
+def _layerParts(layer):
+    attributes = layer.__dict__
+    for name in ("_anchors", "_annotations", "_components", "_guides", "_hints"):
+        for part in attributes.get(name) or ():
+            yield part, layer
+    for path in attributes.get("_paths") or ():
+        yield path, layer
+    image = attributes.get("backgroundImage")
+    if isinstance(image, GSBackgroundImage):
+        yield image, layer
+    background = attributes.get("_background")
+    if isinstance(background, GSLayer):
+        yield background, layer
+        yield from _layerParts(background)
+
+
+def _glyphOf(obj):
+    """Return the glyph that an object is part of, or None."""
+    while obj is not None and not isinstance(obj, GSGlyph):
+        if isinstance(obj, GSBackgroundLayer):
+            obj = obj.__dict__.get("_foreground")
+        elif isinstance(obj, GSLayer):
+            obj = obj.__dict__.get("parent")
+        else:
+            obj = getattr(obj, "_parent", None)
+    return obj
+
+
+def _trackGlyph(glyph, sourceRange=None):
+    """Track the changes to a glyph of a font loaded with keep_source, see
+    `_keepSource`. 'sourceRange' is where the glyph is in the source text of
+    the font, if it is written there the way Writer writes it.
+
+    The glyph and the objects it is made of are turned into subclasses of
+    their classes that tell them before their attributes change (see
+    `_Tracked`), and their lists and dictionaries are replaced by ones that
+    tell them before they change (see `_TrackedContainer`). Their setters
+    and proxies, and those of their nodes, tell them too (see
+    `GSBase._willChange`). The first change stops tracking the glyph, and
+    turns these objects back into regular ones, so that changed glyphs do
+    not pay for it.
+    """
+    _trackValues(glyph)
+    object.__setattr__(glyph, "__class__", _trackedClass(type(glyph)))
+    if sourceRange is not None:
+        glyph.__dict__["_sourceRange"] = sourceRange
+    for obj, owner in _glyphParts(glyph):
+        if isinstance(obj, GSBackgroundLayer):
+            obj.__dict__["_foreground"] = owner
+        elif not isinstance(obj, GSLayer):
+            object.__setattr__(obj, "_parent", owner)
+        _trackValues(obj)
+        if isinstance(obj, GSPath):
+            nodes = obj._nodes
+            nodes.userData = {
+                index: _trackedValue(userData, obj)
+                for index, userData in nodes.userData.items()
+            }
+        object.__setattr__(obj, "__class__", _trackedClass(type(obj)))
+
+
+def _untrackGlyph(glyph):
+    """Stop tracking the changes to a glyph, see `_trackGlyph`."""
+    glyph.__dict__.pop("_sourceRange", None)
+    glyph.__dict__.pop("_contentHash", None)
+    object.__setattr__(glyph, "__class__", glyph._untrackedClass)
+    for obj, _ in _glyphParts(glyph):
+        if isinstance(obj, GSLayer):
+            obj.__dict__.pop("_contentHash", None)
+        if isinstance(obj, _Tracked):
+            object.__setattr__(obj, "__class__", obj._untrackedClass)
+
+
+def _writesAs(obj, data):
+    """Whether Writer writes a glyph, or the kerning of a font, as 'data' (a
+    str, or UTF-8 encoded bytes)."""
+    fp = StringIO()
+    if isinstance(obj, GSGlyph):
+        Writer(fp).writeDict(obj)
+    else:
+        Writer(fp).writeKerning(obj)
+    if isinstance(data, str):
+        return fp.getvalue() == data
+    return fp.getvalue().encode("utf-8") == data
+
+
+def _keepSource(font, text, glyphSources, kerningRange):
+    """Give a font loaded with keep_source its source text, and track the
+    changes to its glyphs and kerning, so that those that were not changed
+    are copied from it by incremental writes (see `Writer`).
+
+    'glyphSources' are ``(glyph, start, end, canonical)`` tuples for the
+    glyphs parsed from the text, where canonical tells whether the source of
+    the glyph is written the way Writer writes it, or is None if not known
+    yet. This is checked once here, by writing each glyph, so that only the
+    glyphs that are can be copied. 'kerningRange' is where the kerning is in
+    the text, if any.
+    """
+    font._source = text
+    masterIndex = font._masterIndex
+    if masterIndex is None:
+        masterIndex = font._indexMasters()
+    font._sourceMasterIndex = masterIndex
+    rewritten = 0
+    for glyph, start, end, canonical in glyphSources:
+        if canonical is None:
+            canonical = _writesAs(glyph, text[start:end])
+        if canonical:
+            _trackGlyph(glyph, (start, end))
+        else:
+            _trackGlyph(glyph)
+            rewritten += 1
+    if rewritten:
+        logger.info(
+            "%d of %d glyphs are not written the way glyphsLib writes them, "
+            "incremental writes write them again",
+            rewritten,
+            len(glyphSources),
+        )
+    kerning = font.__dict__.get("_kerning")
+    if kerningRange is not None and type(kerning) is OrderedDict:
+        start, end = kerningRange
+        start = end - len(text[start:end].lstrip())
+        if _writesAs(kerning, text[start:end]):
+            font._kerning = _SourceKerning(kerning, text, (start, end))
+
+
+def _unchangedSource(obj):
+    """Return the source text of a glyph, or of the kerning of a font, that
+    is written there the way Writer writes it and was not changed since the
+    font was loaded (see `_keepSource`), or None."""
+    if isinstance(obj, _SourceKerning):
+        source = obj._source
+        sourceRange = obj._sourceRange
+    else:
+        sourceRange = obj.__dict__.get("_sourceRange")
+        font = obj.__dict__.get("parent")
+        # The layers of glyphs are written in the order of the masters.
+        if font is None or font._masterIndex is not font._sourceMasterIndex:
+            return None
+        source = font._source
+    if sourceRange is None or source is None:
+        return None
+    return source[sourceRange[0] : sourceRange[1]]
+
+
+class GSLazyGlyph(GSGlyph):
+    """A glyph that is only parsed from its source text when first needed.
+
+    Lazily loaded fonts (see `GSFont(path, lazy=True)` and
+    `glyphsLib.load(fp, lazy=True)`) contain these instead of GSGlyph objects.
+    The name and unicodes are read when loading, so looking glyphs up by name
+    or by unicode does not parse them; accessing any other attribute parses
+    the glyph and turns the object into a regular GSGlyph in place.
+
+    Glyphs that are never parsed are written back exactly as they were read,
+    unless the font was loaded with only some of its masters. Setting any
+    attribute other than the parent, even the name, parses the glyph first,
+    so that the change is written.
+    """
+
+    def __init__(self, source, start, end, name=None, unicodes=None, master_ids=None):
+        # GSGlyph.__init__ is deliberately not called, see _materialize
+        self.__dict__.update(
+            _source=source,
+            _start=start,
+            _end=end,
+            _master_ids=master_ids,
+            parent=None,
+            _name=name,
+            _unicodes=UnicodesList(unicodes),
+        )
+
+    def __getattr__(self, name):
+        # Only called for attributes that are not set yet.
+        if name.startswith("__"):
+            raise AttributeError(name)
+        self._materialize()
+        return getattr(self, name)
+
+    def __setattr__(self, name, value):
+        # Adding the glyph to a font leaves it unparsed.
+        if name != "parent":
+            self._materialize()
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        self._materialize()
+        object.__delattr__(self, name)
+
+    def _unicodesChanged(self, unicodes, old):
+        # Parse the glyph, keeping the changed list of unicodes.
+        self._materialize()
+        self.__dict__["_unicodes"] = unicodes
+        unicodes._owner = self
+        GSGlyph._unicodesChanged(self, unicodes, old)
+
+    def _materialize(self):
+        source = self._sourceText()
+        parent = self.parent
+        master_ids = self._master_ids
+        object.__setattr__(self, "__class__", GSGlyph)
+        self.__dict__.clear()
+        GSGlyph.__init__(self)
+        parser = Parser(current_type=GSGlyph, master_ids=master_ids)
+        parser.parse_into_object(self, source)
+        if parent is not None:
+            self.parent = parent
+            self._setupLayers()
+
+    def _setupLayers(self):
+        # Done by _materialize once the layers exist.
+        pass
+
+    def _sourceText(self):
+        source = self._source[self._start : self._end]
+        if not isinstance(source, str):
+            source = source.decode("utf-8")
+        return source
+
+    def plistValue(self):
+        if self._master_ids is not None:
+            # The source has the layers of all masters, write the parsed glyph
+            # instead.
+            self._materialize()
+            string = StringIO()
+            Writer(string).writeDict(self)
+            return string.getvalue()
+        return self._sourceText()
+
+
+def _copyOwner(src, dst):
+    """Give file 'dst' the owner and group of file 'src', where allowed."""
+    chown = getattr(os, "chown", None)
+    if chown is None:
+        return
+    stat = os.stat(src)
+    try:
+        chown(dst, stat.st_uid, stat.st_gid)
+    except OSError:
+        # Only the superuser can give files away, the group may still do.
+        try:
+            chown(dst, -1, stat.st_gid)
+        except OSError:
+            pass
 
 
 class GSFont(GSBase):
@@ -3177,7 +4750,16 @@ class GSFont(GSBase):
         "keyboardIncrement": 1,
     }
 
-    def __init__(self, path=None):
+    # The source text the font was parsed from, if kept, and the index of
+    # the masters at the time, see _keepSource.
+    _source = None
+    _sourceMasterIndex = None
+    # The glyphs by name and by unicode, see _indexGlyphs.
+    _glyphIndex = None
+    # The masters by id, see _indexMasters.
+    _masterIndex = None
+
+    def __init__(self, path=None, lazy=False, workers=None, keep_source=False):
         super().__init__()
 
         self.familyName = "Unnamed font"
@@ -3202,10 +4784,18 @@ class GSFont(GSBase):
             assert path.endswith(
                 ".glyphs"
             ), "Please supply a file path to a .glyphs file"
-            with open(path, "r", encoding="utf-8") as fp:
-                p = Parser()
-                logger.info('Parsing "%s" file into <GSFont>' % path)
-                p.parse_into_object(self, fp.read())
+            with open(path, "rb") as fp:
+                # Keep a copy, not a map, of a file that may be overwritten.
+                source = None if keep_source or lazy else map_file(fp)
+                if source is None:
+                    source = fp.read()
+            p = Parser(lazy=lazy, workers=workers, keep_source=keep_source)
+            logger.info('Parsing "%s" file into <GSFont>' % path)
+            try:
+                p.parse_into_object(self, source)
+            finally:
+                if isinstance(source, mmap.mmap):
+                    source.close()
             self.filepath = path
             for master in self.masters:
                 master.font = self
@@ -3213,21 +4803,102 @@ class GSFont(GSBase):
     def __repr__(self):
         return f'<{self.__class__.__name__} "{self.familyName}">'
 
+    def content_hashes(self, master_id=None):
+        """Return the `GSGlyph.content_hash` of each glyph, or of its layer
+        for `master_id`, by glyph name.
+
+        The same digests can be computed from a source text without loading
+        the whole font, see `glyphsLib.parser.content_hashes`.
+        """
+        return OrderedDict(
+            (glyph.name, glyph.content_hash(master_id)) for glyph in self._glyphs
+        )
+
+    def compute_bounds(self, master_id):
+        """Return the bounds of the layer of each glyph for `master_id`, by
+        glyph name, as `GSLayer.bounds` would.
+
+        The glyphs are measured after the glyphs that their components show,
+        so that each layer is measured once, and without recursion.
+        """
+        layers = OrderedDict()
+        for glyph in self._glyphs:
+            layer = glyph.layers[master_id]
+            if layer is not None:
+                layers[glyph.name] = layer
+
+        def components(name):
+            return iter([c.name for c in layers[name]._components if c.name in layers])
+
+        boxes = {}
+        seen = set()
+        for root in layers:
+            if root in seen:
+                continue
+            seen.add(root)
+            stack = [(root, components(root))]
+            while stack:
+                name, names = stack[-1]
+                for component in names:
+                    if component not in seen:
+                        seen.add(component)
+                        stack.append((component, components(component)))
+                        break
+                else:
+                    stack.pop()
+                    boxes[name] = layers[name]._boundsEntry()[1]
+        return OrderedDict((name, _boxToRect(boxes[name])) for name in layers)
+
     def shouldWriteValueForKey(self, key):
         if key in ("unitsPerEm", "versionMajor", "versionMinor"):
             return True
         return super().shouldWriteValueForKey(key)
 
-    def save(self, path=None):
+    def save(self, path=None, incremental=False, workers=None):
+        """Write the font to 'path', by default the file it was loaded from.
+
+        The font is written to a temporary file next to 'path' first, which
+        then replaces it, so that 'path' is never left partly written. If
+        'path' is a symbolic link, the file it points to is replaced, with
+        its permissions and, where allowed, its owner.
+
+        With `incremental`, glyphs that were not changed since the font was
+        loaded with ``keep_source=True`` are copied from its source. With a
+        number of `workers`, glyphs are written in that many processes. See
+        `Writer`.
+        """
         if path is None:
             if self.filepath:
                 path = self.filepath
             else:
                 raise ValueError("No path provided and GSFont has no filepath")
-        with open(path, "w", encoding="utf-8") as fp:
-            w = Writer(fp)
-            logger.info("Writing %r to .glyphs file", self)
-            w.write(self)
+        # Replacing a link would turn it into a file.
+        path = os.path.realpath(os.fspath(path))
+        tmp = "{}.{}.tmp".format(path, uuid.uuid4().hex[:8])
+        try:
+            with open(tmp, "xb") as fp:
+                w = Writer(fp, incremental=incremental, workers=workers)
+                logger.info("Writing %r to .glyphs file", self)
+                w.write(self)
+            if os.path.exists(path):
+                shutil.copymode(path, tmp)
+                _copyOwner(path, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def __getstate__(self):
+        # The source can be large, and needed again only by an incremental
+        # save, so it is not pickled. The index of the glyphs is rebuilt when
+        # needed.
+        state = _withoutProxies(self.__dict__.copy())
+        state.pop("_source", None)
+        state.pop("_glyphIndex", None)
+        state.pop("_masterIndex", None)
+        state.pop("_sourceMasterIndex", None)
+        return state
 
     def getVersionMinor(self):
         return self._versionMinor
@@ -3239,20 +4910,58 @@ class GSFont(GSBase):
 
     versionMinor = property(getVersionMinor, setVersionMinor)
 
-    glyphs = property(
-        lambda self: FontGlyphsProxy(self),
-        lambda self, value: FontGlyphsProxy(self).setter(value),
-    )
+    glyphs = _CachedProxy(FontGlyphsProxy)
 
     def _setupGlyph(self, glyph):
         glyph.parent = self
-        for layer in glyph.layers:
-            if (
-                not hasattr(layer, "associatedMasterId")
-                or layer.associatedMasterId is None
-                or len(layer.associatedMasterId) == 0
-            ):
-                glyph._setupLayer(layer, layer.layerId)
+        glyph._setupLayers()
+
+    def _indexGlyphs(self):
+        """Build and return the (name -> glyph, unicode -> glyph) indexes
+        used to look glyphs up in `glyphs`.
+
+        Like the lookups by name and unicode always did, they map to the
+        first glyph with that name, or with that (first) unicode. They are
+        kept up to date when glyphs are added, and dropped to be built again
+        when glyphs are removed or replaced, or when a glyph is renamed or
+        gets other unicodes in a way that cannot be applied to them directly.
+        Changing `_glyphs` in place is not tracked.
+        """
+        names = {}
+        unicodes = {}
+        for glyph in self._glyphs:
+            names.setdefault(glyph.name, glyph)
+            unicode = glyph.unicode
+            if unicode is not None:
+                unicodes.setdefault(unicode, glyph)
+        self._glyphIndex = names, unicodes
+        return self._glyphIndex
+
+    def _glyphAdded(self, glyph):
+        """Add a glyph appended to `_glyphs` to the indexes."""
+        if self._glyphIndex is not None:
+            names, unicodes = self._glyphIndex
+            names.setdefault(glyph.name, glyph)
+            unicode = glyph.unicode
+            if unicode is not None:
+                unicodes.setdefault(unicode, glyph)
+
+    def _glyphUnicodeChanged(self, glyph, old):
+        """Update the indexes after the first unicode of a glyph changed from
+        `old`, typically after adding a new glyph before setting its
+        unicodes."""
+        if self._glyphIndex is None:
+            return
+        names, unicodes = self._glyphIndex
+        new = glyph.unicode
+        if new == old:
+            return
+        if old is None and new not in unicodes and names.get(glyph.name) is glyph:
+            unicodes[new] = glyph
+        else:
+            # Another glyph may have the old unicode too, or come before this
+            # one with the new unicode.
+            self._glyphIndex = None
 
     @property
     def features(self):
@@ -3266,16 +4975,25 @@ class GSFont(GSBase):
         for g in self._features:
             g._parent = self
 
-    masters = property(
-        lambda self: FontFontMasterProxy(self),
-        lambda self, value: FontFontMasterProxy(self).setter(value),
-    )
+    masters = _CachedProxy(FontFontMasterProxy)
 
     def masterForId(self, key):
+        masterIndex = self._masterIndex
+        if masterIndex is None:
+            masterIndex = self._indexMasters()
+        return masterIndex.get(key)
+
+    def _indexMasters(self):
+        """Index the masters by id, the first one of each id winning as in a
+        linear search.
+
+        The index is dropped when the masters, or their ids, change.
+        """
+        masterIndex = {}
         for master in self._masters:
-            if master.id == key:
-                return master
-        return None
+            masterIndex.setdefault(master.id, master)
+        self._masterIndex = masterIndex
+        return masterIndex
 
     # FIXME: (jany) Why is this not a FontInstanceProxy?
     @property
@@ -3288,20 +5006,11 @@ class GSFont(GSBase):
         for i in self._instances:
             i.parent = self
 
-    classes = property(
-        lambda self: FontClassesProxy(self),
-        lambda self, value: FontClassesProxy(self).setter(value),
-    )
+    classes = _CachedProxy(FontClassesProxy)
 
-    customParameters = property(
-        lambda self: CustomParametersProxy(self),
-        lambda self, value: CustomParametersProxy(self).setter(value),
-    )
+    customParameters = _CachedProxy(CustomParametersProxy)
 
-    userData = property(
-        lambda self: UserDataProxy(self),
-        lambda self, value: UserDataProxy(self).setter(value),
-    )
+    userData = _CachedProxy(UserDataProxy)
 
     @property
     def kerning(self):
@@ -13,11 +13,23 @@
 # limitations under the License.
 
 
-from collections import OrderedDict
+from array import array
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import argparse
+import codecs
+import functools
+import gc
 from io import open
+import json
+import mmap
+import os
+import pickle
 import re
 import logging
 import sys
+import time
 
 from glyphsLib.util import tostr
 import glyphsLib
@@ -25,8 +37,121 @@ import glyphsLib
 logger = logging.getLogger(__name__)
 
 
+# Building blocks for the "tokenizer" engine. Like `Parser.value_re_shared`,
+# a string ends at the first double quote that is not preceded by a backslash,
+# but the pattern is written so that it can never run past that quote, which
+# lets it be combined with the delimiters that follow it.
+_STRING = r'"[^"\\]*(?:\\+[^\\][^"\\]*)*"'
+_WORD = r"[-_./$A-Za-z0-9]+"
+_SCALAR = r"(?:%s|%s)" % (_STRING, _WORD)
+
+# A single token. Each kind of token has its own group, so that `lastindex`
+# tells them apart in the same way for str and bytes sources.
+_TOKEN = r"\s*(?:(%s)|<([A-Fa-f0-9]+)>|(\{)|(\()|(\))|(;)|(,)|(\})|(=))" % _SCALAR
+_SCALAR_TOKEN = 1
+_HEX_TOKEN = 2
+_DICT_START = 3
+_LIST_START = 4
+_LIST_END = 5
+_DICT_DELIM = 6
+_LIST_DELIM = 7
+_DICT_END = 8
+# Either the end of a dictionary (1), or a key (2) followed by "=" and, when
+# the value is a string or a bare word, the value itself (3) and its ";".
+_DICT_ENTRY = r"\s*(?:(\})|(%s)\s*=(?:\s*(%s)\s*;)?)" % (_SCALAR, _SCALAR)
+# A string or bare word list item (1) followed by "," (2) or ")" (3).
+_LIST_ITEM = r"\s*(%s)\s*(?:(,)|(\)))" % _SCALAR
+# Everything up to the next opening (1) or closing (2) bracket, skipping over
+# strings.
+_SKIP_TO_BRACKET = r'(?:[^"{}()]+|%s)*(?:([{(])|([})]))?' % _STRING
+
+# A list item that is a node (see `GSNode.read`): (1) the whole string, (2, 3)
+# the position, (4) the type, (5) "SMOOTH" and (6) user data, followed by
+# "," (7) or ")" (8).
+_NODE_ITEM = (
+    r'\s*("([-.e\d]+) ([-.e\d]+) (LINE|CURVE|QCURVE|OFFCURVE|n/a)(?: (SMOOTH))?'
+    r'(?: (\{[^"\\]*(?:\\+[^\\][^"\\]*)*\}))?")\s*(?:(,)|(\)))'
+)
+_NODE_ITEM_END = 8
+_NODE_TYPES = {
+    name: name.lower() for name in ("LINE", "CURVE", "QCURVE", "OFFCURVE", "n/a")
+}
+_NODE_TYPES.update({name.encode("ascii"): value for name, value in _NODE_TYPES.items()})
+
+_token_re = re.compile(_TOKEN)
+_dict_entry_re = re.compile(_DICT_ENTRY)
+_list_item_re = re.compile(_LIST_ITEM)
+_node_item_re = re.compile(_NODE_ITEM)
+_skip_to_bracket_re = re.compile(_SKIP_TO_BRACKET)
+
+# The same patterns, for parsing UTF-8 encoded sources without decoding them
+# first. Bytes outside of ASCII only ever appear inside strings.
+_token_bytes_re = re.compile(_TOKEN.encode("ascii"))
+_dict_entry_bytes_re = re.compile(_DICT_ENTRY.encode("ascii"))
+_list_item_bytes_re = re.compile(_LIST_ITEM.encode("ascii"))
+_node_item_bytes_re = re.compile(_NODE_ITEM.encode("ascii"))
+_skip_to_bracket_bytes_re = re.compile(_SKIP_TO_BRACKET.encode("ascii"))
+
+
+def _measured(method):
+    """Decorate the parsing entry points to account for the source text
+    and the time spent parsing it, when keeping statistics."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        if self.stats is None:
+            return method(self, *args)
+        self.stats.add_source(args[-1])
+        self.stats.start()
+        try:
+            result = method(self, *args)
+        finally:
+            # `parse` leaves the object it returns to `_parse_dict`
+            name = type(args[0]).__name__ if len(args) == 2 else None
+            self.stats.stop(name, top_level=True)
+        if self.stats.report_on_parse:
+            logger.info("Parser statistics: %s", json.dumps(self.stats.report()))
+        return result
+
+    return wrapper
+
+
 class Parser:
-    """Parses Python dictionaries from Glyphs source files."""
+    """Parses Python dictionaries from Glyphs source files.
+
+    Two engines are available:
+
+    * ``"tokenizer"`` (the default) scans the text once with a handful of
+      compound patterns, so that most dictionary entries and list items are
+      consumed with a single regular expression match. It also parses
+      UTF-8 encoded sources (bytes, or a memory-mapped file) directly,
+      decoding only the strings and bare words it reads.
+    * ``"regex"`` is the original implementation, which tries the patterns
+      for every kind of value in turn at each position.
+
+    The `lazy`, `workers`, `glyph_filter` and `master_ids` options need the
+    tokenizer.
+
+    With `lazy`, glyphs are only parsed when first accessed (see
+    `GSLazyGlyph`). With a number of `workers`, the glyphs are split into
+    chunks that are parsed in that many processes.
+
+    With a `glyph_filter` (a function called with each glyph name, or a
+    collection of glyph names) and/or a list of `master_ids`, the glyphs and
+    masters that are not selected, and the layers of the glyphs that belong
+    to other masters, are skipped without being parsed. The names of the
+    skipped glyphs are kept in `dropped_glyphs`.
+
+    With `keep_source`, a GSFont remembers its source text, and the tokenizer
+    records where each glyph is in it, so that unchanged glyphs can be copied
+    from it when writing the font (see `Writer`'s `incremental` option).
+
+    With `stats` (by default, if the ``GLYPHSLIB_PARSER_STATS`` environment
+    variable is set to anything but "0"), the parser keeps statistics about
+    what it parses in `stats`, a `ParserStats` object.
+    """
+
+    ENGINES = ("tokenizer", "regex")
 
     # FIXME: Why was value_re overwritten? Renamed first one to value_re_shared.
     value_re_shared = r'(".*?(?<!\\)"|[-_./$A-Za-z0-9]+)'
@@ -41,33 +166,208 @@ class Parser:
     hex_re = re.compile(r"\s*<([A-Fa-f0-9]+)>", re.DOTALL)
     bytes_re = re.compile(r"\s*<([A-Za-z0-9+/=]+)>", re.DOTALL)
 
-    def __init__(self, current_type=OrderedDict):
+    def __init__(
+        self,
+        current_type=OrderedDict,
+        engine="tokenizer",
+        lazy=False,
+        workers=None,
+        glyph_filter=None,
+        master_ids=None,
+        keep_source=False,
+        stats=None,
+    ):
         self.current_type = current_type
+        if engine not in self.ENGINES:
+            raise ValueError(
+                "Unknown parser engine {!r}, expected one of {}".format(
+                    engine, ", ".join(self.ENGINES)
+                )
+            )
+        if lazy and engine != "tokenizer":
+            raise ValueError("Lazy parsing requires the tokenizer engine")
+        if workers is not None:
+            if engine != "tokenizer":
+                raise ValueError("Parallel parsing requires the tokenizer engine")
+            if lazy:
+                raise ValueError("Lazy parsing can't be done in parallel")
+            if workers < 1:
+                raise ValueError("The number of workers must be at least 1")
+        if (glyph_filter is not None or master_ids is not None) and (
+            engine != "tokenizer"
+        ):
+            raise ValueError("Filtering requires the tokenizer engine")
+        if glyph_filter is not None and not callable(glyph_filter):
+            if isinstance(glyph_filter, str):
+                glyph_filter = [glyph_filter]
+            glyph_filter = frozenset(glyph_filter).__contains__
+        if master_ids is not None:
+            if isinstance(master_ids, str):
+                master_ids = [master_ids]
+            master_ids = frozenset(master_ids)
+        self.engine = engine
+        self.lazy = lazy
+        self.workers = workers
+        self.glyph_filter = glyph_filter
+        self.master_ids = master_ids
+        self.keep_source = keep_source
+        # (glyph, start, end, canonical) of the glyphs parsed from a list of
+        # glyphs, and (start, end) of the kerning, see _keep_source
+        self._glyph_sources = []
+        self._kerning_source = None
+        # The font whose fields are scanned, see _scan_glyphs_in_parallel
+        self._font = None
+        self._names = {}
+        self.dropped_glyphs = []
+        if engine == "tokenizer":
+            self._parse = self._scan
+            self._parse_dict_into_object = self._scan_dict_into_object
+            self._parse_list = self._scan_list
+        if stats is None:
+            stats = _stats_from_environment()
+        self.stats = None
+        self._scalar_decoder = _scalar_decoder
+        self._field_decoders = _field_decoders
+        self._add_field_decoder = _add_field_decoder
+        if stats:
+            self._collect_stats()
+
+    def _collect_stats(self):
+        """Replace the patterns, decoders and dictionary parsing method with
+        versions that count or time what they do."""
+        stats = self.stats = ParserStats()
+        for name in (
+            "start_dict_re",
+            "end_dict_re",
+            "dict_delim_re",
+            "start_list_re",
+            "end_list_re",
+            "list_delim_re",
+            "attr_re",
+            "value_re",
+            "hex_re",
+        ):
+            match = stats.count_matches(name[:-3], getattr(self, name).match)
+            setattr(self, name, _CountedPattern(match))
+        self._scalar_decoder = stats.scalar_decoder
+        self._field_decoders = stats.field_decoders
+        self._add_field_decoder = stats.add_field_decoder
 
+        parse_scalar = self._parse_scalar
+
+        def _parse_scalar(raw):
+            stats.decoders[_decoder_name(self.current_type)] += 1
+            return parse_scalar(raw)
+
+        self._parse_scalar = _parse_scalar
+
+        parse_dict = self._parse_dict
+
+        def _parse_dict(text, i):
+            stats.start()
+            res, i = parse_dict(text, i)
+            stats.stop(type(res).__name__)
+            return res, i
+
+        self._parse_dict = _parse_dict
+
+    @_measured
     def parse(self, text):
         """Do the parsing."""
 
-        text = tostr(text, encoding="utf-8")
+        text = self._prepare(text)
         result, i = self._parse(text, 0)
         if text[i:].strip():
             self._fail("Unexpected trailing content", text, i)
+        self._keep_source(result, text)
         return result
 
+    @_measured
     def parse_into_object(self, res, text):
         """Parse data into an existing GSFont instance."""
 
-        text = tostr(text, encoding="utf-8")
+        text = self._prepare(text)
 
-        m = self.start_dict_re.match(text, 0)
-        if m:
-            i = self._parse_dict_into_object(res, text, 1)
+        if self.engine == "tokenizer":
+            m = self._token_match(text, 0)
+            if not m or m.lastindex != _DICT_START:
+                self._fail("not correct file format", text, 0)
+            i = self._parse_dict_into_object(res, text, m.end())
         else:
-            self._fail("not correct file format", text, 0)
+            m = self.start_dict_re.match(text, 0)
+            if m:
+                i = self._parse_dict_into_object(res, text, 1)
+            else:
+                self._fail("not correct file format", text, 0)
         if text[i:].strip():
             self._fail("Unexpected trailing content", text, i)
+        self._keep_source(res, text)
         return i
 
-    def _guess_current_type(self, parsed, value):
+    def _keep_source(self, res, text):
+        """With `keep_source`, give a font its source text, and track the
+        changes to its glyphs and kerning (see
+        `glyphsLib.classes._keepSource`).
+
+        This is done once the font is complete, so that the glyphs can be
+        compared with their source.
+        """
+        glyph_sources = self._glyph_sources
+        kerning_source = self._kerning_source
+        self._glyph_sources = []
+        self._kerning_source = None
+        self._font = None
+        if not self.keep_source or not isinstance(res, glyphsLib.classes.GSFont):
+            return
+        if self.master_ids is not None:
+            # The glyphs and the kerning miss what belongs to other masters.
+            glyph_sources, kerning_source = [], None
+        glyphsLib.classes._keepSource(res, text, glyph_sources, kerning_source)
+
+    def _prepare(self, text):
+        """Return the source to parse, choosing the patterns to use for it."""
+        if self.engine != "tokenizer" or isinstance(text, str):
+            text = tostr(text, encoding="utf-8")
+            self._token_match = _token_re.match
+            self._dict_entry_match = _dict_entry_re.match
+            self._list_item_match = _list_item_re.match
+            self._node_item_match = _node_item_re.match
+            self._skip_match = _skip_to_bracket_re.match
+            self._count_matches()
+            return text
+        if not isinstance(text, (bytes, mmap.mmap)):
+            # e.g. bytearray or memoryview, whose slices are not hashable
+            text = bytes(text)
+        self._token_match = _token_bytes_re.match
+        self._dict_entry_match = _dict_entry_bytes_re.match
+        self._list_item_match = _list_item_bytes_re.match
+        self._node_item_match = _node_item_bytes_re.match
+        self._skip_match = _skip_to_bracket_bytes_re.match
+        self._count_matches()
+        return text
+
+    def _count_matches(self):
+        if self.stats is None:
+            return
+        for name in ("token", "dict_entry", "list_item", "node_item", "skip"):
+            attribute = "_%s_match" % name
+            match = getattr(self, attribute)
+            setattr(self, attribute, self.stats.count_matches(name, match))
+
+    def _name(self, raw):
+        """Return the dictionary key for a string or bare word, as found in
+        the source text, sharing the strings of repeated keys."""
+        name = self._names.get(raw)
+        if name is None:
+            if not isinstance(raw, str):
+                name = str(raw, "utf-8")
+            else:
+                name = raw
+            name = self._names[raw] = self._trim_value(name)
+        return name
+
+    @staticmethod
+    def _guess_current_type(parsed, value):
         if value.lower() in ("infinity", "inf", "nan"):
             # Those values would be accepted by `float()`
             # But `infinity` is a glyph name
@@ -87,6 +387,28 @@ class Parser:
             current_type = str
         return current_type
 
+    def _parse_scalar(self, raw):
+        """Convert a string or bare word, as found in the source text, to a
+        value of the current type.
+        """
+        if not isinstance(raw, str):
+            raw = str(raw, "utf-8")
+        if hasattr(self.current_type, "read"):
+            reader = self.current_type()
+            # Give the escaped value to `read` to be symetrical with
+            # `plistValue` which handles the escaping itself.
+            return reader.read(raw)
+
+        value = self._trim_value(raw)
+
+        if self.current_type in (None, dict, OrderedDict):
+            self.current_type = self._guess_current_type(raw, value)
+
+        if self.current_type == bool:
+            return bool(int(value))  # bool(u'0') returns True
+
+        return self.current_type(value)
+
     def _parse(self, text, i):
         """Recursive function to parse a single dictionary, list, or value."""
 
@@ -106,25 +428,7 @@ class Parser:
         if m:
             parsed = m.group(0)
             i += len(parsed)
-            if hasattr(self.current_type, "read"):
-                reader = self.current_type()
-                # Give the escaped value to `read` to be symetrical with
-                # `plistValue` which handles the escaping itself.
-                value = reader.read(m.group(1))
-                return value, i
-
-            value = self._trim_value(m.group(1))
-
-            if self.current_type in (None, dict, OrderedDict):
-                self.current_type = self._guess_current_type(parsed, value)
-
-            if self.current_type == bool:
-                value = bool(int(value))  # bool(u'0') returns True
-                return value, i
-
-            value = self.current_type(value)
-
-            return value, i
+            return self._parse_scalar(m.group(1)), i
 
         m = self.hex_re.match(text, i)
         if m:
@@ -207,6 +511,498 @@ class Parser:
         i += len(parsed)
         return res, i
 
+    def _scan(self, text, i):
+        """Parse a single dictionary, list, or value with the tokenizer."""
+
+        m = self._token_match(text, i)
+        if m:
+            kind = m.lastindex
+            if kind == _SCALAR_TOKEN:
+                raw = m.group(1)
+                if not isinstance(raw, str):
+                    raw = str(raw, "utf-8")
+                return self._scalar_decoder(self.current_type)(raw), m.end()
+            if kind == _DICT_START:
+                return self._parse_dict(text, m.end())
+            if kind == _LIST_START:
+                return self._scan_list(text, m.end())
+            if kind == _HEX_TOKEN:
+                from glyphsLib.types import BinaryData
+
+                return BinaryData.fromHex(m.group(2)), m.end()
+        self._fail("Unexpected content", text, i)
+
+    def _scan_dict_into_object(self, res, text, i):
+        if isinstance(res, glyphsLib.classes.GSBase):
+            return self._scan_fields_into_object(res, text, i)
+        entry_match = self._dict_entry_match
+        has_classes = hasattr(res, "classForName")
+        while True:
+            m = entry_match(text, i)
+            if not m:
+                self._fail("Unexpected dictionary content", text, i)
+            if m.group(1):
+                return m.end()
+            old_current_type = self.current_type
+            name = self._name(m.group(2))
+            if has_classes:
+                self.current_type = res.classForName(name)
+
+            raw = m.group(3)
+            if raw is not None:
+                value = self._parse_scalar(raw)
+                i = m.end()
+            else:
+                value, i = self._scan(text, m.end())
+                m = self._token_match(text, i)
+                if not m or m.lastindex != _DICT_DELIM:
+                    self._fail(
+                        "Missing delimiter in dictionary before content", text, i
+                    )
+                i = m.end()
+
+            try:
+                res[name] = value
+            except (TypeError, KeyError):  # hmmm...
+                res = {}  # ugly, this fixes nested dicts in customparameters
+                res[name] = value
+                has_classes = False
+            self.current_type = old_current_type
+
+    def _scan_fields_into_object(self, res, text, i):
+        """Like `_scan_dict_into_object`, for GSBase objects, whose keys are
+        looked up in the decoder table of their class."""
+        entry_match = self._dict_entry_match
+        decoders = self._field_decoders(type(res))
+        old_current_type = self.current_type
+        while True:
+            m = entry_match(text, i)
+            if not m:
+                self._fail("Unexpected dictionary content", text, i)
+            if m.group(1):
+                self.current_type = old_current_type
+                return m.end()
+            name = self._name(m.group(2))
+            try:
+                attribute, klass, decode = decoders[name]
+            except KeyError:
+                attribute, klass, decode = self._add_field_decoder(decoders, res, name)
+
+            raw = m.group(3)
+            if raw is not None:
+                if not isinstance(raw, str):
+                    raw = str(raw, "utf-8")
+                setattr(res, attribute, decode(raw))
+                i = m.end()
+                continue
+
+            if klass is _Kerning:
+                start = m.end()
+                value, i = self._scan_kerning(text, start)
+                self._kerning_source = (start, i)
+            else:
+                if klass is glyphsLib.classes.GSGlyph:
+                    self._font = res
+                self.current_type = klass
+                value, i = self._scan(text, m.end())
+            m = self._token_match(text, i)
+            if not m or m.lastindex != _DICT_DELIM:
+                self._fail("Missing delimiter in dictionary before content", text, i)
+            i = m.end()
+            if isinstance(value, bytes):
+                # GSBase.__setitem__ knows how to convert binary data
+                res[name] = value
+            else:
+                setattr(res, attribute, value)
+
+    def _scan_kerning(self, text, i):
+        """Parse the kerning of a font (master id -> left key -> right key ->
+        value) starting at i, into nested OrderedDicts, with the values
+        already converted like the `GSFont.kerning` setter does.
+        """
+        token_match = self._token_match
+        entry_match = self._dict_entry_match
+        name = self._name
+        decode = _kerning_value
+        kerning = OrderedDict()
+        i = self._expect_dict_start(text, i)
+        while True:
+            m = entry_match(text, i)
+            if not m or m.group(3) is not None:
+                self._fail("Unexpected kerning content", text, i)
+            if m.group(1):
+                return kerning, m.end()
+            master_map = kerning[name(m.group(2))] = OrderedDict()
+            i = self._expect_dict_start(text, m.end())
+            while True:
+                m = entry_match(text, i)
+                if not m or m.group(3) is not None:
+                    self._fail("Unexpected kerning content", text, i)
+                if m.group(1):
+                    i = m.end()
+                    break
+                pairs = master_map[name(m.group(2))] = OrderedDict()
+                i = self._expect_dict_start(text, m.end())
+                while True:
+                    m = entry_match(text, i)
+                    if not m:
+                        self._fail("Unexpected kerning content", text, i)
+                    raw = m.group(3)
+                    if raw is None:
+                        if not m.group(1):
+                            self._fail("Unexpected kerning content", text, i)
+                        i = m.end()
+                        break
+                    pairs[name(m.group(2))] = decode(raw)
+                    i = m.end()
+                m = token_match(text, i)
+                if not m or m.lastindex != _DICT_DELIM:
+                    self._fail("Missing delimiter in dictionary", text, i)
+                i = m.end()
+            m = token_match(text, i)
+            if not m or m.lastindex != _DICT_DELIM:
+                self._fail("Missing delimiter in dictionary", text, i)
+            i = m.end()
+
+    def _scan_font_sources(self, text):
+        """Find the glyphs and the kerning in the source text of a font,
+        without parsing them.
+
+        Return the ``(start, end, fields)`` entries of the glyphs (see
+        `_scan_entries`), and the (start, end) of the other values by key.
+        """
+        entries = []
+        ranges = {}
+        m = self._token_match(text, 0)
+        if not m or m.lastindex != _DICT_START:
+            self._fail("Unexpected content", text, 0)
+        i = m.end()
+        while True:
+            m = self._dict_entry_match(text, i)
+            if not m:
+                self._fail("Unexpected dictionary content", text, i)
+            if m.group(1):
+                return entries, ranges
+            if m.group(3) is not None:
+                i = m.end()
+                continue
+            name = self._name(m.group(2))
+            if name == "glyphs":
+                m = self._token_match(text, m.end())
+                if not m or m.lastindex != _LIST_START:
+                    self._fail("Expected a list of glyphs", text, i)
+                entries, i = self._scan_entries(text, m.end())
+            else:
+                start = m.end()
+                i = self._skip(text, start)
+                ranges[name] = (start, i)
+            m = self._token_match(text, i)
+            if not m or m.lastindex != _DICT_DELIM:
+                self._fail("Missing delimiter in dictionary before content", text, i)
+            i = m.end()
+
+    def _scan_content_hashes(self, text, master_id):
+        """Return the content hashes of the glyphs of the font in the source
+        text, see `content_hashes`.
+
+        Only the masters and the glyphs (or only their layers for master_id)
+        are parsed, into a font that hashes them as if it was loaded.
+        """
+        entries, ranges = self._scan_font_sources(text)
+        font = glyphsLib.classes.GSFont()
+        if "fontMaster" in ranges:
+            start, end = ranges["fontMaster"]
+            parser = Parser(current_type=glyphsLib.classes.GSFontMaster)
+            font.masters = parser.parse(text[start:end])
+        master_ids = None if master_id is None else [master_id]
+        parser = Parser(current_type=glyphsLib.classes.GSGlyph, master_ids=master_ids)
+        sources = [text[start:end] for start, end, _ in entries]
+        with _gc_paused():
+            for glyph in parser.parse(_list_source(sources)):
+                font.glyphs.append(glyph)
+            return font.content_hashes(master_id)
+
+    def _expect_dict_start(self, text, i):
+        m = self._token_match(text, i)
+        if not m or m.lastindex != _DICT_START:
+            self._fail("Expected a dictionary of kerning", text, i)
+        return m.end()
+
+    def _scan_list(self, text, i):
+        current_type = self.current_type
+        if current_type is glyphsLib.classes.GSGlyph:
+            if self.lazy:
+                return self._scan_lazy_glyphs(text, i)
+            if self.workers is not None and self.workers > 1:
+                return self._scan_glyphs_in_parallel(text, i)
+            if self.glyph_filter is not None:
+                return self._scan_selected(text, i, self._is_selected_glyph)
+            return self._scan_glyphs(text, i)
+        elif self.master_ids is not None and current_type in (
+            glyphsLib.classes.GSLayer,
+            glyphsLib.classes.GSFontMaster,
+        ):
+            return self._scan_selected(text, i, self._is_selected_master)
+        elif current_type is glyphsLib.classes.GSNode:
+            packed = self._scan_packed_nodes(text, i)
+            if packed is not None:
+                return packed
+        res = []
+        m = self._token_match(text, i)
+        if m and m.lastindex == _LIST_END:
+            return res, m.end()
+        item_match = self._list_item_match
+        old_current_type = self.current_type
+        decode = self._scalar_decoder(old_current_type)
+        while True:
+            m = item_match(text, i)
+            if m:
+                raw = m.group(1)
+                if not isinstance(raw, str):
+                    raw = str(raw, "utf-8")
+                res.append(decode(raw))
+                i = m.end()
+                if m.lastindex == 3:
+                    return res, i
+                continue
+
+            list_item, i = self._scan(text, i)
+            res.append(list_item)
+            self.current_type = old_current_type
+            m = self._token_match(text, i)
+            if not m or m.lastindex not in (_LIST_DELIM, _LIST_END):
+                self._fail("Missing delimiter in list before content", text, i)
+            i = m.end()
+            if m.lastindex == _LIST_END:
+                return res, i
+
+    def _scan_packed_nodes(self, text, i):
+        """Decode the list of nodes starting at i in one pass, into the
+        `_PackedNodes` columns that GSPath stores its nodes in.
+
+        Return None if the list is empty or has anything but node strings in
+        the usual format, which is then parsed item by item.
+        """
+        positions = array("d")
+        types = bytearray()
+        smooth = bytearray()
+        user_data_by_index = {}
+        node_match = self._node_item_match
+        node_types = _NODE_TYPES
+        codes = glyphsLib.classes._NODE_TYPE_CODES
+        while True:
+            m = node_match(text, i)
+            if not m:
+                return None
+            x, y, nodetype, is_smooth, user_data = m.group(2, 3, 4, 5, 6)
+            if user_data is not None:
+                if not isinstance(user_data, str):
+                    user_data = str(user_data, "utf-8")
+                if len(user_data) > 2:
+                    user_data_by_index[
+                        len(types)
+                    ] = glyphsLib.classes.GSNode._readUserData(user_data)
+            positions.append(float(x))
+            positions.append(float(y))
+            types.append(codes[node_types[nodetype]])
+            smooth.append(is_smooth is not None)
+            i = m.end()
+            if m.lastindex == _NODE_ITEM_END:
+                packed = glyphsLib.classes._PackedNodes(
+                    positions, types, smooth, user_data_by_index
+                )
+                return packed, i
+
+    def _scan_entries(self, text, i):
+        """Find the dictionaries in the list of dictionaries (e.g. glyphs)
+        starting at i, without parsing them.
+
+        Return a list of ``(start, end, fields)`` tuples, where fields are the
+        raw strings and bare words found at the top level of each dictionary,
+        and the position after the list.
+        """
+        entries = []
+        m = self._token_match(text, i)
+        if m and m.lastindex == _LIST_END:
+            return entries, m.end()
+        while True:
+            m = self._token_match(text, i)
+            if not m or m.lastindex != _DICT_START:
+                self._fail("Unexpected content", text, i)
+            start = m.start(_DICT_START)
+            i = m.end()
+            fields = {}
+            while True:
+                m = self._dict_entry_match(text, i)
+                if not m:
+                    self._fail("Unexpected dictionary content", text, i)
+                if m.group(1):
+                    i = m.end()
+                    break
+                if m.group(3) is not None:
+                    fields[self._name(m.group(2))] = m.group(3)
+                    i = m.end()
+                    continue
+                i = self._skip(text, m.end())
+                m = self._token_match(text, i)
+                if not m or m.lastindex != _DICT_DELIM:
+                    self._fail(
+                        "Missing delimiter in dictionary before content", text, i
+                    )
+                i = m.end()
+            entries.append((start, i, fields))
+
+            m = self._token_match(text, i)
+            if not m or m.lastindex not in (_LIST_DELIM, _LIST_END):
+                self._fail("Missing delimiter in list before content", text, i)
+            i = m.end()
+            if m.lastindex == _LIST_END:
+                return entries, i
+
+    def _scan_selected(self, text, i, is_selected):
+        """Parse the dictionaries in the list starting at i for which
+        `is_selected(fields)` is true, skipping the others (see
+        `_scan_entries`)."""
+        entries, i = self._scan_entries(text, i)
+        res = []
+        is_glyph = self.current_type is glyphsLib.classes.GSGlyph
+        for start, end, fields in entries:
+            if is_selected(fields):
+                value, _ = self._scan(text, start)
+                res.append(value)
+                if is_glyph:
+                    self._glyph_sources.append((value, start, end, None))
+        return res, i
+
+    def _scan_glyphs(self, text, i):
+        """Parse the list of glyphs starting at i, recording where each one
+        is in the source text."""
+        res = []
+        m = self._token_match(text, i)
+        if m and m.lastindex == _LIST_END:
+            return res, m.end()
+        glyph_sources = self._glyph_sources
+        while True:
+            m = self._token_match(text, i)
+            if not m or m.lastindex != _DICT_START:
+                self._fail("Unexpected content", text, i)
+            start = m.start(_DICT_START)
+            glyph, i = self._parse_dict(text, m.end())
+            res.append(glyph)
+            glyph_sources.append((glyph, start, i, None))
+            m = self._token_match(text, i)
+            if not m or m.lastindex not in (_LIST_DELIM, _LIST_END):
+                self._fail("Missing delimiter in list before content", text, i)
+            i = m.end()
+            if m.lastindex == _LIST_END:
+                return res, i
+
+    def _is_selected_glyph(self, fields):
+        name = fields.get("glyphname")
+        if name is not None:
+            name = self._name(name)
+        if self.glyph_filter is None or self.glyph_filter(name):
+            return True
+        self.dropped_glyphs.append(name)
+        return False
+
+    def _is_selected_master(self, fields):
+        """Whether a master, or a layer, belongs to the selected masters."""
+        master_id = (
+            fields.get("associatedMasterId")
+            or fields.get("layerId")
+            or fields.get("id")
+        )
+        return master_id is None or self._name(master_id) in self.master_ids
+
+    def _scan_lazy_glyphs(self, text, i):
+        """Build a list of GSGlyph objects that only remember where their
+        source text is, from the list of glyphs starting at i.
+
+        Only the glyph name and unicodes are read; the rest of each glyph is
+        skipped by counting brackets and parsed when first needed.
+        """
+        entries, i = self._scan_entries(text, i)
+        res = []
+        for start, end, fields in entries:
+            if not self._is_selected_glyph(fields):
+                continue
+            name = fields.get("glyphname")
+            unicodes = fields.get("unicode")
+            res.append(
+                glyphsLib.classes.GSLazyGlyph(
+                    text,
+                    start,
+                    end,
+                    name if name is None else self._name(name),
+                    unicodes if unicodes is None else self._name(unicodes),
+                    self.master_ids,
+                )
+            )
+        return res, i
+
+    def _scan_glyphs_in_parallel(self, text, i):
+        """Parse the list of glyphs starting at i in `workers` processes.
+
+        The glyphs are split into a few chunks per process, to even out the
+        differences in the size of glyphs.
+        """
+        entries, i = self._scan_entries(text, i)
+        if self.glyph_filter is not None:
+            entries = [entry for entry in entries if self._is_selected_glyph(entry[2])]
+        chunk_count = min(len(entries), self.workers * 4)
+        if chunk_count == 0:
+            return [], i
+        bounds = [len(entries) * k // chunk_count for k in range(chunk_count + 1)]
+        sources = [
+            [text[start:end] for start, end, _ in entries[first:last]]
+            for first, last in zip(bounds, bounds[1:])
+        ]
+        res = []
+        canonical = []
+        # With keep_source, the workers check whether the glyphs are written
+        # the way Writer writes them, which depends on the masters of the font,
+        # read before its glyphs in the files that Glyphs writes.
+        font_master_ids = None
+        if self.keep_source and self.master_ids is None and self._font is not None:
+            font_master_ids = [master.id for master in self._font.masters] or None
+        with ProcessPoolExecutor(self.workers) as executor, _gc_paused():
+            for data in executor.map(
+                _parse_glyphs,
+                sources,
+                [self.master_ids] * len(sources),
+                [font_master_ids] * len(sources),
+            ):
+                glyphs, written = pickle.loads(data)
+                res.extend(glyphs)
+                canonical.extend(written)
+        for glyph, (start, end, _), written in zip(res, entries, canonical):
+            self._glyph_sources.append((glyph, start, end, written))
+        return res, i
+
+    def _skip(self, text, i):
+        """Return the end of the value starting at i, without parsing it."""
+        m = self._token_match(text, i)
+        if not m:
+            self._fail("Unexpected content", text, i)
+        i = m.end()
+        if m.lastindex not in (_DICT_START, _LIST_START):
+            return i
+        depth = 1
+        skip_match = self._skip_match
+        while depth:
+            m = skip_match(text, i)
+            if m.lastindex == 1:
+                depth += 1
+            elif m.lastindex == 2:
+                depth -= 1
+            elif m.end() >= len(text):
+                self._fail("Unexpected end of file", text, m.end())
+            else:
+                self._fail("Unexpected content", text, m.end())
+            i = m.end()
+        return i
+
     # glyphs only supports octal escapes between \000 and \077 and hexadecimal
     # escapes between \U0000 and \UFFFF
     _unescape_re = re.compile(r"\\(?:(0[0-7]{2})|(?:U([0-9a-fA-F]{4})))")
@@ -217,7 +1013,8 @@ class Parser:
             return chr(int(m.group(1), 8))
         return chr(int(m.group(2), 16))
 
-    def _trim_value(self, value):
+    @staticmethod
+    def _trim_value(value):
         """Trim double quotes off the ends of a value, un-escaping inner
         double quotes and literal backslashes. Also convert escapes to unicode.
         If the string is not quoted, return it unmodified.
@@ -229,34 +1026,703 @@ class Parser:
             return Parser._unescape_re.sub(Parser._unescape_fn, value)
         return value
 
-    def _fail(self, message, text, i):
+    @staticmethod
+    def _fail(message, text, i):
         """Raise an exception with given message and text at i."""
 
-        raise ValueError("{}:\n{}".format(message, text[i : i + 79]))
+        context = text[i : i + 79]
+        if not isinstance(context, str):
+            context = str(context, "utf-8", "replace")
+        raise ValueError("{}:\n{}".format(message, context))
+
+
+def _compile_scalar_decoder(klass):
+    trim = Parser._trim_value
+    if hasattr(klass, "read"):
+
+        def decode(raw):
+            # Give the escaped value to `read` to be symetrical with
+            # `plistValue` which handles the escaping itself.
+            return klass().read(raw)
+
+    elif klass in (None, dict, OrderedDict):
+
+        def decode(raw):
+            value = trim(raw)
+            return Parser._guess_current_type(raw, value)(value)
+
+    elif klass is bool:
+
+        def decode(raw):
+            return bool(int(trim(raw)))  # bool(u'0') returns True
+
+    elif klass is str:
+        decode = trim
+    else:
+
+        def decode(raw):
+            return klass(trim(raw))
+
+    return decode
+
+
+_scalar_decoders = {}
+
+
+def _scalar_decoder(klass):
+    """Return a function converting a string or bare word, as found in the
+    source text, to a value of type `klass`, like `Parser._parse_scalar`.
+    """
+    try:
+        return _scalar_decoders[klass]
+    except KeyError:
+        decoder = _scalar_decoders[klass] = _compile_scalar_decoder(klass)
+        return decoder
+
+
+class _Kerning:
+    """Stands for the class of the kerning of a font in decoder tables, which
+    is parsed by `Parser._scan_kerning`."""
+
+
+def _kerning_value(raw):
+    """Convert a kerning value, as found in the source text, like
+    `parse_float_or_int`."""
+    try:
+        value = float(raw)
+    except ValueError:
+        # e.g. quoted
+        value = float(Parser._trim_value(tostr(raw, encoding="utf-8")))
+    if value.is_integer():
+        return int(value)
+    return value
+
+
+_field_decoder_tables = {}
+
+
+def _field_decoders(cls):
+    """Return the decoder table of a GSBase subclass.
+
+    It maps the keys found in the source text to ``(attribute, klass,
+    decode)`` tuples: the attribute to set on the object (see
+    `_wrapperKeysTranslate`), the class of the value (see `_classesForName`),
+    to parse compound values with, and the decoder of scalar values.
+    """
+    try:
+        return _field_decoder_tables[cls]
+    except KeyError:
+        table = _field_decoder_tables[cls] = {}
+        for name, klass in cls._classesForName.items():
+            attribute = cls._wrapperKeysTranslate.get(name, name)
+            table[name] = (attribute, klass, _scalar_decoder(klass))
+        if issubclass(cls, glyphsLib.classes.GSFont):
+            # Already converted, see `Parser._scan_kerning`.
+            table["kerning"] = ("_kerning", _Kerning, _scalar_decoder(OrderedDict))
+        return table
+
+
+def _add_field_decoder(table, obj, name):
+    """Add the decoder of a key missing from the decoder table of `obj`."""
+    klass = obj.classForName(name)
+    attribute = obj._wrapperKeysTranslate.get(name, name)
+    decoder = table[name] = (attribute, klass, _scalar_decoder(klass))
+    return decoder
+
+
+def _stats_from_environment():
+    return os.environ.get("GLYPHSLIB_PARSER_STATS", "0") != "0"
+
+
+def _decoder_name(klass):
+    if klass in (None, dict, OrderedDict):
+        return "guessed"
+    return getattr(klass, "__name__", repr(klass))
+
+
+class _CountedPattern:
+    """Stands for a compiled pattern whose matches are counted."""
+
+    def __init__(self, match):
+        self.match = match
+
+
+class ParserStats:
+    """Statistics about what a `Parser` parsed, see `report`.
+
+    The time attributed to each class of object does not include the time
+    spent on the objects it contains. Glyphs parsed later, lazily, or in
+    other processes are not accounted for.
+    """
+
+    def __init__(self):
+        self.bytes = 0
+        self.time = 0.0
+        self.objects = Counter()
+        self.times = defaultdict(float)
+        self.matches = Counter()
+        self.decoders = Counter()
+        # Whether to log the report after each parse, as when enabled by the
+        # environment variable.
+        self.report_on_parse = _stats_from_environment()
+        self._timers = []
+        self._scalar_decoders = {}
+        self._field_decoder_tables = {}
+
+    def add_source(self, text):
+        if isinstance(text, str):
+            self.bytes += len(text.encode("utf-8"))
+        else:
+            self.bytes += len(text)
+        del self._timers[:]
+
+    def start(self):
+        """Start timing the parsing of an object."""
+        # The start time, and the time spent on the objects it contains.
+        self._timers.append([time.perf_counter(), 0.0])
+
+    def stop(self, name, top_level=False):
+        """Stop timing the parsing of an object of class 'name' (or of the
+        whole source, if None)."""
+        start, children = self._timers.pop()
+        elapsed = time.perf_counter() - start
+        if name is not None:
+            self.objects[name] += 1
+            self.times[name] += elapsed - children
+        if self._timers:
+            self._timers[-1][1] += elapsed
+        if top_level:
+            self.time += elapsed
+
+    def count_matches(self, name, match):
+        matches = self.matches
+
+        def counted_match(text, i):
+            matches[name] += 1
+            return match(text, i)
+
+        return counted_match
+
+    def scalar_decoder(self, klass):
+        try:
+            return self._scalar_decoders[klass]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable
+            return _scalar_decoder(klass)
+        decode = _scalar_decoder(klass)
+        decoders = self.decoders
+        name = _decoder_name(klass)
+
+        def counted_decode(raw):
+            decoders[name] += 1
+            return decode(raw)
+
+        self._scalar_decoders[klass] = counted_decode
+        return counted_decode
 
+    def field_decoders(self, cls):
+        table = self._field_decoder_tables.get(cls)
+        if table is None:
+            table = self._field_decoder_tables[cls] = {
+                name: (attribute, klass, self.scalar_decoder(klass))
+                for name, (attribute, klass, _) in _field_decoders(cls).items()
+            }
+        return table
 
-def load(fp):
+    def add_field_decoder(self, table, obj, name):
+        attribute, klass, _ = _add_field_decoder({}, obj, name)
+        decoder = table[name] = (attribute, klass, self.scalar_decoder(klass))
+        return decoder
+
+    def report(self):
+        """Return the statistics as a dictionary of JSON-serializable values:
+
+        * ``bytes``, ``time`` and ``throughput``: the size of the source text
+          in bytes, the time spent parsing it in seconds, and their ratio;
+        * ``classes``: the number of ``objects`` of each class (by name) and
+          the ``time`` spent on them, slowest first;
+        * ``matches``: how many times each pattern was tried;
+        * ``decoders``: how many strings and bare words were decoded to each
+          class (or type), "guessed" when the type depends on the value.
+        """
+        return OrderedDict(
+            [
+                ("bytes", self.bytes),
+                ("time", self.time),
+                ("throughput", self.bytes / self.time if self.time else None),
+                (
+                    "classes",
+                    OrderedDict(
+                        (name, OrderedDict(objects=count, time=self.times[name]))
+                        for name, count in sorted(
+                            self.objects.items(), key=lambda item: -self.times[item[0]]
+                        )
+                    ),
+                ),
+                ("matches", OrderedDict(self.matches.most_common())),
+                ("decoders", OrderedDict(self.decoders.most_common())),
+            ]
+        )
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic garbage collector while creating many objects that
+    will live on, which would otherwise be traversed over and over again for
+    nothing to collect.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _list_source(sources):
+    """Return the source text of a list of the given source texts of values
+    (str, or UTF-8 encoded bytes)."""
+    if sources and not isinstance(sources[0], str):
+        return b"(" + b",".join(sources) + b")"
+    return "(%s)" % ",".join(sources)
+
+
+def _parse_glyphs(sources, master_ids=None, font_master_ids=None):
+    """Parse the source texts of some glyphs, in a worker process.
+
+    Return them, with whether each is written the way Writer writes it in a
+    font with masters of the ids `font_master_ids` if given (None otherwise,
+    see `glyphsLib.classes._keepSource`), pickled, so that they are unpickled
+    where `_gc_paused` applies, instead of in the executor's result thread.
+    """
+    with _gc_paused():
+        parser = Parser(current_type=glyphsLib.classes.GSGlyph, master_ids=master_ids)
+        glyphs = parser.parse(_list_source(sources))
+        canonical = [None] * len(glyphs)
+        if font_master_ids is not None:
+            font = glyphsLib.classes.GSFont()
+            for master_id in font_master_ids:
+                master = glyphsLib.classes.GSFontMaster()
+                master.id = master_id
+                font.masters.append(master)
+            for idx, (glyph, text) in enumerate(zip(glyphs, sources)):
+                font._setupGlyph(glyph)
+                canonical[idx] = glyphsLib.classes._writesAs(glyph, text)
+                glyph.parent = None
+        return pickle.dumps((glyphs, canonical), pickle.HIGHEST_PROTOCOL)
+
+
+class _TokenStream:
+    """Iterate over the tokens of a .glyphs file read incrementally from a
+    (readable) file object, using the patterns of the "tokenizer" engine.
+
+    Tokens are ``(kind, raw)`` pairs, where kind is "scalar" for strings and
+    bare words, "hex" for hex data, or the punctuation character itself.
+    """
+
+    def __init__(self, fp, chunk_size):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = None
+        self._text = ""
+        self._pos = 0
+        self._eof = False
+        self._mark = None
+        self._token_start = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            m = _token_re.match(self._text, self._pos)
+            # A token that reaches the end of the buffer may be cut short.
+            if m and (self._eof or m.end() < len(self._text)):
+                break
+            if self._eof:
+                if self._text[self._pos :].strip():
+                    self.fail("Unexpected content")
+                raise StopIteration
+            self._read_chunk()
+        self._pos = m.end()
+        self._token_start = m.start(m.lastindex)
+        kind = m.lastindex
+        if kind == _SCALAR_TOKEN:
+            return "scalar", m.group(1)
+        if kind == _HEX_TOKEN:
+            return "hex", m.group(2)
+        punctuation = m.group(kind)
+        return punctuation, punctuation
+
+    def _read_chunk(self):
+        data = self._fp.read(self._chunk_size)
+        self._eof = not data
+        if not isinstance(data, str):
+            if self._decoder is None:
+                self._decoder = codecs.getincrementaldecoder("utf-8")()
+            data = self._decoder.decode(data, final=self._eof)
+        # Drop the consumed text, except what has been marked for capture.
+        start = self._pos if self._mark is None else self._mark
+        self._text = self._text[start:] + data
+        self._pos -= start
+        self._token_start -= start
+        if self._mark is not None:
+            self._mark = 0
+
+    def expect(self):
+        """Return the next token, failing at the end of the input."""
+        for token in self:
+            return token
+        self.fail("Unexpected end of file")
+
+    def fail(self, message):
+        Parser._fail(message, self._text, self._pos)
+
+    def mark(self):
+        """Start capturing the source text at the last returned token."""
+        self._mark = self._token_start
+
+    def captured(self):
+        """Return the source text captured since `mark` and stop capturing."""
+        text = self._text[self._mark : self._pos]
+        self._mark = None
+        return text
+
+
+def _value_events(tokens, token, glyphs=False):
+    kind, raw = token
+    if kind == "scalar":
+        value = Parser._trim_value(raw)
+        yield "value", Parser._guess_current_type(raw, value)(value)
+    elif kind == "hex":
+        from glyphsLib.types import BinaryData
+
+        yield "value", BinaryData.fromHex(raw)
+    elif kind == "{":
+        yield "start_dict", None
+        while True:
+            kind, raw = tokens.expect()
+            if kind == "}":
+                break
+            if kind != "scalar" or tokens.expect()[0] != "=":
+                tokens.fail("Unexpected dictionary content")
+            key = Parser._trim_value(raw)
+            yield "key", key
+            token = tokens.expect()
+            if glyphs and key == "glyphs" and token[0] == "(":
+                yield from _glyph_events(tokens)
+            else:
+                yield from _value_events(tokens, token)
+            if tokens.expect()[0] != ";":
+                tokens.fail("Missing delimiter in dictionary before content")
+        yield "end_dict", None
+    elif kind == "(":
+        yield "start_list", None
+        token = tokens.expect()
+        while token[0] != ")":
+            yield from _value_events(tokens, token)
+            kind = tokens.expect()[0]
+            if kind == ")":
+                break
+            if kind != ",":
+                tokens.fail("Missing delimiter in list before content")
+            token = tokens.expect()
+        yield "end_list", None
+    else:
+        tokens.fail("Unexpected content")
+
+
+def _glyph_events(tokens):
+    yield "start_list", None
+    token = tokens.expect()
+    while token[0] != ")":
+        if token[0] != "{":
+            tokens.fail("Unexpected content")
+        tokens.mark()
+        depth = 1
+        while depth:
+            kind = tokens.expect()[0]
+            if kind in "{(":
+                depth += 1
+            elif kind in "})":
+                depth -= 1
+        parser = Parser(current_type=glyphsLib.classes.GSGlyph)
+        yield "glyph", parser.parse(tokens.captured())
+        kind = tokens.expect()[0]
+        if kind == ")":
+            break
+        if kind != ",":
+            tokens.fail("Missing delimiter in list before content")
+        token = tokens.expect()
+    yield "end_list", None
+
+
+def iterparse(fp, glyphs=False, chunk_size=1 << 16):
+    """Incrementally parse a .glyphs file. 'fp' should be a (readable) file
+    object, in text or in binary (UTF-8) mode.
+
+    Yield ``(event, value)`` pairs as the input is consumed. The events are
+    "start_dict", "end_dict", "start_list", "end_list" (with a value of None),
+    "key" (with the key as value) and "value" (with the string, number or
+    binary data as value).
+
+    If `glyphs` is true, each entry of the top-level "glyphs" list is parsed
+    into a GSGlyph object and reported as a single ("glyph", GSGlyph) event
+    instead of its structural events.
+    """
+    tokens = _TokenStream(fp, chunk_size)
+    yield from _value_events(tokens, tokens.expect(), glyphs)
+    for _ in tokens:
+        tokens.fail("Unexpected trailing content")
+
+
+def content_hashes(s, master_id=None):
+    """Return the content hashes of the glyphs of the font in 's' (a str, or
+    UTF-8 encoded bytes or memory map), or of their layers for `master_id`,
+    by glyph name, like `GSFont.content_hashes`.
+
+    Each glyph, or its layer, is parsed and hashed as it would be written,
+    so the hashes do not depend on how the source is written (e.g. by other
+    tools, with integers written as floats). Only the masters and the glyphs
+    are parsed, so this is cheaper than loading the font. Comparing the
+    hashes finds which glyphs differ between two versions of a file.
+    """
+    p = Parser(current_type=glyphsLib.classes.GSFont)
+    return p._scan_content_hashes(p._prepare(s), master_id)
+
+
+def map_file(fp):
+    """Return a read-only memory map of the contents of the (readable) file
+    object 'fp', to be parsed without reading it into memory first.
+
+    Return None if 'fp' is not a UTF-8 encoded file on disk, positioned at its
+    start, that can be mapped; the caller should then read it instead.
+    """
+    encoding = getattr(fp, "encoding", None)
+    if encoding is not None and codecs.lookup(encoding).name != "utf-8":
+        return None
+    try:
+        if fp.tell() != 0:
+            return None
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        # No file descriptor (io.UnsupportedOperation is an OSError), or an
+        # empty file, which can't be mapped.
+        return None
+
+
+def load(
+    fp,
+    lazy=False,
+    workers=None,
+    cache_dir=None,
+    cache_size=None,
+    glyph_filter=None,
+    master_ids=None,
+    keep_source=False,
+):
     """Read a .glyphs file. 'fp' should be (readable) file object.
     Return a GSFont object.
+
+    If 'fp' is a file on disk, it is memory-mapped and parsed in place (see
+    `map_file`), without holding a copy of its text in memory. Fonts that
+    keep their source text (lazily loaded ones, and those loaded with
+    `keep_source`) read the file instead, as it may be overwritten while they
+    still need it.
+
+    If `lazy` is true, glyphs are only parsed when first accessed, see
+    `GSLazyGlyph`. If `workers` is more than 1, the glyphs are parsed in that
+    many processes.
+
+    If `cache_dir` is given, parsed fonts are cached in that directory, which
+    holds at most `cache_size` bytes (see `glyphsLib.cache.FontCache`). The
+    cached fonts are unpickled, so only use a directory that untrusted users
+    cannot write to.
+
+    To load only some of the font, `glyph_filter` selects glyphs: it is
+    either a function called with each glyph name, returning whether to load
+    the glyph, or a collection of the names of the glyphs to load.
+    `master_ids` is a list of the ids of the masters to load. The other
+    glyphs and masters are skipped without being parsed, as are the layers
+    of the other masters, and their kerning is removed. A warning is logged
+    for each component that refers to a glyph that was not loaded (except in
+    lazily loaded glyphs).
+
+    If `keep_source` is true, the font keeps a copy of the text of the file,
+    from which the glyphs that were not changed are copied when the font is
+    written with ``incremental=True`` (see `glyphsLib.writer.Writer`).
     """
-    return loads(fp.read())
+    options = dict(
+        lazy=lazy,
+        workers=workers,
+        cache_dir=cache_dir,
+        cache_size=cache_size,
+        glyph_filter=glyph_filter,
+        master_ids=master_ids,
+        keep_source=keep_source,
+    )
+    # The font can't keep a map of a file that may be overwritten: writing
+    # to the mapped file, e.g. saving the font in place, truncates it first.
+    source = None if keep_source or lazy else map_file(fp)
+    if source is None:
+        return loads(fp.read(), **options)
+    try:
+        font = loads(source, **options)
+    finally:
+        source.close()
+    # Leave 'fp' where `fp.read()` would have.
+    fp.seek(0, os.SEEK_END)
+    return font
 
 
-def loads(s):
+def loads(
+    s,
+    lazy=False,
+    workers=None,
+    cache_dir=None,
+    cache_size=None,
+    glyph_filter=None,
+    master_ids=None,
+    keep_source=False,
+):
     """Read a .glyphs file from a (unicode) str object, or from
-    a UTF-8 encoded bytes object.
+    a UTF-8 encoded bytes object (or memory map).
     Return a GSFont object.
+
+    See `load` for the other arguments.
     """
-    p = Parser(current_type=glyphsLib.classes.GSFont)
+    p = Parser(
+        current_type=glyphsLib.classes.GSFont,
+        lazy=lazy,
+        workers=workers,
+        glyph_filter=glyph_filter,
+        master_ids=master_ids,
+        keep_source=keep_source,
+    )
+    if cache_dir is not None:
+        from glyphsLib.cache import DEFAULT_MAX_SIZE, FontCache
+
+        if lazy:
+            raise ValueError("Lazily loaded fonts can't be cached")
+        if callable(glyph_filter):
+            raise ValueError(
+                "Fonts loaded with a glyph filter function can't be cached"
+            )
+        if cache_size is None:
+            cache_size = DEFAULT_MAX_SIZE
+        options = {}
+        if glyph_filter is not None:
+            if isinstance(glyph_filter, str):
+                glyph_filter = [glyph_filter]
+            options["glyph_filter"] = sorted(set(glyph_filter))
+        if p.master_ids is not None:
+            options["master_ids"] = sorted(p.master_ids)
+        cache = FontCache(cache_dir, cache_size)
+        font = cache.load(
+            s,
+            lambda: loads(
+                s, workers=workers, glyph_filter=glyph_filter, master_ids=master_ids
+            ),
+            **options
+        )
+        if keep_source:
+            # The source is not cached, find the glyphs and the kerning in it.
+            text = p._prepare(s)
+            glyph_sources = []
+            kerning_source = None
+            if p.master_ids is None:
+                entries, ranges = p._scan_font_sources(text)
+                kerning_source = ranges.get("kerning")
+                if glyph_filter is not None:
+                    entries = [e for e in entries if p._is_selected_glyph(e[2])]
+                if len(entries) == len(font.glyphs):
+                    glyph_sources = [
+                        (glyph, start, end, None)
+                        for glyph, (start, end, _) in zip(font.glyphs, entries)
+                    ]
+            glyphsLib.classes._keepSource(font, text, glyph_sources, kerning_source)
+        return font
     logger.info("Parsing .glyphs file")
     data = p.parse(s)
+    if glyph_filter is not None or master_ids is not None:
+        _prune_font(data, p)
     return data
 
 
+def _prune_font(font, parser):
+    """Make a font loaded with some glyphs and masters filtered out
+    consistent: remove the kerning of the other masters and glyphs, and warn
+    about components of the other glyphs."""
+    master_ids = parser.master_ids
+    if master_ids is not None:
+        unknown = master_ids.difference(master.id for master in font.masters)
+        if unknown:
+            raise ValueError(
+                "Unknown master ids: {}".format(", ".join(sorted(unknown)))
+            )
+    dropped = set(parser.dropped_glyphs)
+    if not dropped and master_ids is None:
+        return
+    kerning = OrderedDict()
+    for master_id, master_map in font.kerning.items():
+        if master_ids is not None and master_id not in master_ids:
+            continue
+        pairs = OrderedDict()
+        for left, glyph_map in master_map.items():
+            if left in dropped:
+                continue
+            glyph_map = OrderedDict(
+                (right, value)
+                for right, value in glyph_map.items()
+                if right not in dropped
+            )
+            if glyph_map:
+                pairs[left] = glyph_map
+        kerning[master_id] = pairs
+    font._kerning = kerning
+    if not dropped:
+        return
+    for glyph in font.glyphs:
+        if isinstance(glyph, glyphsLib.classes.GSLazyGlyph):
+            continue
+        missing = []
+        for layer in glyph.layers:
+            for component in layer.components:
+                name = component.name
+                if name in dropped and name not in missing:
+                    missing.append(name)
+        for name in missing:
+            logger.warning(
+                "Glyph '%s' has a component of '%s', which was filtered out",
+                glyph.name,
+                name,
+            )
+
+
 def main(args=None):
-    """Roundtrip the .glyphs file given as an argument."""
-    for arg in args:
-        glyphsLib.dump(load(open(arg, "r", encoding="utf-8")), sys.stdout)
+    """Roundtrip the .glyphs files given as arguments, or print statistics
+    about parsing them as JSON."""
+    parser = argparse.ArgumentParser(prog="python -m glyphsLib.parser")
+    parser.add_argument("files", nargs="+", metavar="FILE.glyphs")
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print statistics about parsing each file (see ParserStats)",
+    )
+    options = parser.parse_args(args)
+    for path in options.files:
+        if not options.stats:
+            glyphsLib.dump(load(open(path, "r", encoding="utf-8")), sys.stdout)
+            continue
+        p = Parser(current_type=glyphsLib.classes.GSFont, stats=True)
+        with open(path, "rb") as fp:
+            p.parse(fp.read())
+        report = OrderedDict(file=path)
+        report.update(p.stats.report())
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
 
 
 if __name__ == "__main__":
@@ -30,6 +30,7 @@ __all__ = [
     "parse_datetime",
     "parse_color",
     "floatToString",
+    "floatsToStrings",
     "readIntlist",
     "UnicodesList",
     "BinaryData",
@@ -49,6 +50,7 @@ class ValueType:
     and readable/writable using the glyphsLib parser/writer.
     """
 
+    __slots__ = ("value",)
     default = None
 
     def __init__(self, value=None):
@@ -93,6 +95,7 @@ def Vector(dim):
     class Vector(ValueType):
         """Base type for number vectors (points, rects, transform matrices)."""
 
+        __slots__ = ()
         dimension = dim
         default = [0.0] * dimension
         regex = re.compile("{%s}" % ", ".join(["([-.e\\d]+)"] * dimension))
@@ -106,7 +109,7 @@ def Vector(dim):
 
         def plistValue(self):
             assert isinstance(self.value, list) and len(self.value) == self.dimension
-            return '"{%s}"' % (", ".join(floatToString(v, 3) for v in self.value))
+            return '"{%s}"' % ", ".join(floatsToStrings(self.value, 3))
 
         def __getitem__(self, key):
             assert isinstance(self.value, list) and len(self.value) == self.dimension
@@ -125,7 +128,7 @@ def Vector(dim):
 class Point(Vector(2)):
     """Read/write a vector in curly braces."""
 
-    __slots__ = ("value", "rect")
+    __slots__ = ("rect",)
 
     def __init__(self, value=None, value2=None, rect=None):
         self.rect = rect
@@ -173,6 +176,8 @@ class Point(Vector(2)):
 
 
 class Size(Point):
+    __slots__ = ()
+
     def __repr__(self):
         return "<size width={} height={}>".format(self.value[0], self.value[1])
 
@@ -202,6 +207,7 @@ class Size(Point):
 class Rect(Vector(4)):
     """Read/write a rect of two points in curly braces."""
 
+    __slots__ = ()
     regex = re.compile(r"{{([-.e\d]+), ([-.e\d]+)}, {([-.e\d]+), ([-.e\d]+)}}")
 
     def __init__(self, value=None, value2=None):
@@ -211,7 +217,7 @@ class Rect(Vector(4)):
 
     def plistValue(self):
         assert isinstance(self.value, list) and len(self.value) == self.dimension
-        return '"{{%s, %s}, {%s, %s}}"' % tuple(floatToString(v, 3) for v in self.value)
+        return '"{{%s, %s}, {%s, %s}}"' % tuple(floatsToStrings(self.value, 3))
 
     def __repr__(self):
         return "<rect origin={} size={}>".format(str(self.origin), str(self.size))
@@ -238,6 +244,8 @@ class Rect(Vector(4)):
 class Transform(Vector(6)):
     """Read/write a six-element vector."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         value=None,
@@ -256,7 +264,7 @@ class Transform(Vector(6)):
 
     def plistValue(self):
         assert isinstance(self.value, list) and len(self.value) == self.dimension
-        return '"{%s}"' % (", ".join(floatToString(v, 5) for v in self.value))
+        return '"{%s}"' % ", ".join(floatsToStrings(self.value, 5))
 
 
 UTC_OFFSET_RE = re.compile(r".* (?P<sign>[+-])(?P<hours>\d\d)(?P<minutes>\d\d)$")
@@ -375,6 +383,9 @@ def actualPrecition(Float):
 
 
 def floatToString(Float, precision=3):
+    if type(Float) is int or (type(Float) is float and Float.is_integer()):
+        # Integers have no fractional part, whatever the precision.
+        return "%.0f" % Float
     ActualPrecition = actualPrecition(Float)
     precision = min(precision, ActualPrecition)
     fractional = math.modf(math.fabs(Float))[0]
@@ -392,8 +403,48 @@ def floatToString(Float, precision=3):
         return "%.0f" % Float
 
 
+# The strings of recently formatted numbers, by precision, see
+# `floatsToStrings`. Cleared when they reach `_FLOAT_STRINGS_SIZE`.
+_float_strings = {}
+_FLOAT_STRINGS_SIZE = 1 << 16
+
+
+def floatsToStrings(values, precision=3):
+    """Return the list of `floatToString(value, precision)` for each of
+    'values' (e.g. the coordinates of many nodes, or kerning values).
+
+    Most values written to .glyphs files are integers, or were already
+    formatted recently, so their strings are taken from a cache.
+    """
+    try:
+        strings = _float_strings[precision]
+    except KeyError:
+        strings = _float_strings[precision] = {}
+    get = strings.get
+    result = []
+    append = result.append
+    for value in values:
+        string = get(value)
+        if string is None:
+            string = floatToString(value, precision)
+            # 0.0 and -0.0 are equal keys, but are written differently.
+            if value:
+                if len(strings) >= _FLOAT_STRINGS_SIZE:
+                    strings.clear()
+                strings[value] = string
+        append(string)
+    return result
+
+
 class UnicodesList(list):
-    """Represent a PLIST-able list of unicode codepoints as strings."""
+    """Represent a PLIST-able list of unicode codepoints as strings.
+
+    The glyph that has the list (its `_owner`, set by `GSGlyph.unicodes`) is
+    told when the list is changed in place, so that its font can look it up
+    by its new unicode.
+    """
+
+    __slots__ = ("_owner",)
 
     def __init__(self, value=None):
         if value is None:
@@ -403,6 +454,11 @@ class UnicodesList(list):
         else:
             unicodes = [str(v) for v in value]
         super().__init__(unicodes)
+        self._owner = None
+
+    def __reduce__(self):
+        # Copies don't belong to the glyph.
+        return UnicodesList, (list(self),)
 
     def plistValue(self):
         if not self:
@@ -412,6 +468,41 @@ class UnicodesList(list):
         return '"%s"' % ",".join(self)
 
 
+def _notifying_owner(name):
+    method = getattr(list, name)
+
+    def mutate(self, *args):
+        owner = self._owner
+        if owner is None:
+            return method(self, *args)
+        old = self[0] if self else None
+        result = method(self, *args)
+        owner._unicodesChanged(self, old)
+        return result
+
+    mutate.__name__ = name
+    mutate.__doc__ = method.__doc__
+    return mutate
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "clear",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "reverse",
+    "sort",
+):
+    setattr(UnicodesList, _name, _notifying_owner(_name))
+del _name
+
+
 class BinaryData(bytes):
     @classmethod
     def fromHex(cls, data):
@@ -17,10 +17,16 @@
 
 
 import glyphsLib.classes
-from glyphsLib.types import floatToString
+import glyphsLib.types
+from glyphsLib.types import floatsToStrings
 import logging
 import datetime
+import functools
+import hashlib
+import operator
+import re
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from io import StringIO
 
 """
@@ -36,7 +42,29 @@ logger = logging.getLogger(__name__)
 
 
 class Writer:
-    def __init__(self, fp):
+    """Writes GSFont and other objects in the .glyphs format.
+
+    With `incremental`, the glyphs and the kerning of a font loaded with
+    ``keep_source=True`` that were not changed since are copied from its
+    source text instead of being written again. The result is the same as
+    writing them: those whose source is not written the way glyphsLib writes
+    them (e.g. in files written by other tools) are written again, which is
+    checked once when loading the font.
+
+    While `write` runs, output to a binary file is buffered and encoded to
+    UTF-8 in large chunks. The other methods, when called directly, encode
+    what they write right away.
+
+    With a number of `workers`, the glyphs of a font are split into chunks
+    that are written in that many processes, then put back together in
+    order. The result is the same as writing them in this process.
+    """
+
+    def __init__(self, fp, incremental=False, workers=None):
+        if workers is not None and workers < 1:
+            raise ValueError("The number of workers must be at least 1")
+        self.incremental = incremental
+        self.workers = workers
         # figure out whether file object expects bytes or unicodes
         try:
             fp.write(b"")
@@ -44,17 +72,31 @@ class Writer:
             fp.write("")  # this better not fail...
             # file already accepts unicodes; use it directly
             self.file = fp
+            self._buffer = None
         else:
-            # file expects bytes; wrap it in a UTF-8 codecs.StreamWriter
-            import codecs
-
-            self.file = codecs.getwriter("utf-8")(fp)
+            # file expects bytes; encode what is written in chunks
+            self.file = self._buffer = _EncodingBuffer(fp)
 
     def write(self, rootObject):
-        self.writeDict(rootObject)
-        self.file.write("\n")
+        buffer = self._buffer
+        if buffer is not None:
+            buffer.start()
+        try:
+            self.writeDict(rootObject)
+            self.file.write("\n")
+        finally:
+            if buffer is not None:
+                buffer.stop()
+
+    def flush(self):
+        """Write out what is buffered for a binary file."""
+        if self._buffer is not None:
+            self._buffer.flush()
 
     def writeDict(self, dictValue):
+        if isinstance(dictValue, glyphsLib.classes.GSBase):
+            _serializer(type(dictValue))(self, dictValue)
+            return
         self.file.write("{\n")
         forType = None
         if hasattr(dictValue, "_keyOrder"):
@@ -89,20 +131,137 @@ class Writer:
             self.file.write(";\n")
         self.file.write("}")
 
+    def writeGlyph(self, glyph):
+        if self.incremental:
+            source = glyphsLib.classes._unchangedSource(glyph)
+            if source is not None:
+                self._writeSource(source)
+                return
+        self.writeDict(glyph)
+
+    def _writeSource(self, source):
+        """Copy source text (a str, or UTF-8 encoded bytes) to the file."""
+        buffer = self._buffer
+        if buffer is None:
+            if not isinstance(source, str):
+                source = source.decode("utf-8")
+            self.file.write(source)
+            return
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+        # Sources can be large, write them out without buffering them.
+        buffer.flush()
+        buffer.fp.write(source)
+
     def writeArray(self, arrayValue):
-        self.file.write("(\n")
-        idx = 0
+        write = self.file.write
+        write("(\n")
         length = len(arrayValue)
         if hasattr(arrayValue, "plistArray"):
             arrayValue = arrayValue.plistArray()
-        for value in arrayValue:
-            self.writeValue(value)
+        writeValue = self.writeValue
+        for idx, value in enumerate(arrayValue):
+            writeValue(value)
             if idx < length - 1:
-                self.file.write(",\n")
+                write(",\n")
             else:
-                self.file.write("\n")
-            idx += 1
-        self.file.write(")")
+                write("\n")
+        write(")")
+
+    def writeGlyphs(self, glyphs):
+        """Write the glyphs of a font, in `workers` processes if more than 1.
+
+        As when parsing, they are split into a few chunks per process, to even
+        out the differences in the size of glyphs.
+        """
+        workers = self.workers
+        count = len(glyphs)
+        if workers is None or workers < 2 or count < 2:
+            self.writeArray(glyphs)
+            return
+        font = glyphs._owner
+        chunk_count = min(count, workers * 4)
+        bounds = [count * k // chunk_count for k in range(chunk_count + 1)]
+        write = self.file.write
+        write("(\n")
+        with ProcessPoolExecutor(
+            workers,
+            initializer=_init_glyphs_writer,
+            initargs=(font,) + self._glyphSources(glyphs),
+        ) as executor:
+            chunks = executor.map(_write_glyphs, bounds[:-1], bounds[1:])
+            for idx, text in enumerate(chunks):
+                if idx:
+                    write(",\n")
+                write(text)
+                self.flush()
+        write("\n)")
+
+    def _glyphSources(self, glyphs):
+        """Return the source text of the font, and the (start, end) of the
+        glyphs to copy from it by index, for the workers of `writeGlyphs`."""
+        ranges = {}
+        if self.incremental:
+            for idx, glyph in enumerate(glyphs):
+                if glyphsLib.classes._unchangedSource(glyph) is not None:
+                    ranges[idx] = glyph._sourceRange
+        if not ranges:
+            return None, ranges
+        return glyphs._owner._source, ranges
+
+    def writePackedNodes(self, packedNodes):
+        """Write the nodes of a path from its columns, as GSNode.plistValue
+        would (see `glyphsLib.classes._PackedNodes`)."""
+        write = self.file.write
+        write("(\n")
+        write(",\n".join(packedNodes.plistValues()))
+        write("\n)")
+
+    def writeKerning(self, kerning):
+        """Write the kerning of a font (master id -> left key -> right key ->
+        value), as `writeDict` would."""
+        if self.incremental:
+            source = glyphsLib.classes._unchangedSource(kerning)
+            if source is not None:
+                self._writeSource(source)
+                return
+        write = self.file.write
+        writeValue = self.writeValue
+        key_prefix = _key_prefix
+        write("{\n")
+        for master_id, master_map in _sorted_items(kerning):
+            if not isinstance(master_map, dict) or master_id in _SPECIAL_KEYS:
+                write(key_prefix(master_id))
+                writeValue(master_map, master_id)
+                write(";\n")
+                continue
+            write(key_prefix(master_id))
+            write("{\n")
+            for left, pairs in _sorted_items(master_map):
+                if not isinstance(pairs, dict) or left in _SPECIAL_KEYS:
+                    write(key_prefix(left))
+                    writeValue(pairs, left)
+                    write(";\n")
+                    continue
+                write(key_prefix(left))
+                write("{\n")
+                for right, value in _sorted_items(pairs):
+                    cls = type(value)
+                    if cls is int:
+                        string = str(value)
+                    elif cls is float:
+                        string = floatsToStrings((value,), 5)[0]
+                    else:
+                        write(key_prefix(right))
+                        writeValue(value, right)
+                        write(";\n")
+                        continue
+                    write(key_prefix(right))
+                    write(string)
+                    write(";\n")
+                write("};\n")
+            write("};\n")
+        write("}")
 
     def writeUserData(self, userDataValue):
         self.file.write("{\n")
@@ -115,58 +274,338 @@ class Writer:
         self.file.write("}")
 
     def writeValue(self, value, forKey=None, forType=None):
+        if forKey == "color" or forKey == "unicode":
+            self._writeValueForKey(value, forKey)
+            return
+        try:
+            write = _value_writers[type(value)]
+        except KeyError:
+            write = _value_writer(type(value))
+        write(self, value)
+
+    def _writeValueForKey(self, value, forKey):
         if hasattr(value, "plistValue"):
-            value = value.plistValue()
-            if value is not None:
-                self.file.write(value)
+            self._writePlistValue(value)
         elif forKey == "color" and hasattr(value, "__iter__"):
             # We have to write color tuples on one line or Glyphs 2.4.x
             # misreads it.
             self.file.write(str(tuple(value)))
-        elif isinstance(value, (list, glyphsLib.classes.Proxy)):
-            if isinstance(value, glyphsLib.classes.UserDataProxy):
-                self.writeUserData(value)
-            else:
-                self.writeArray(value)
-        elif isinstance(value, (dict, OrderedDict, glyphsLib.classes.GSBase)):
-            self.writeDict(value)
-        elif type(value) == float:
-            self.file.write(floatToString(value, 5))
-        elif type(value) == int:
+        elif forKey == "unicode" and _value_writer(type(value)) is _writeString:
+            # Unicodes are not escaped
             self.file.write(str(value))
-        elif type(value) == bool:
-            if value:
-                self.file.write("1")
-            else:
-                self.file.write("0")
-        elif type(value) == datetime.datetime:
-            self.file.write('"%s +0000"' % str(value))
         else:
-            value = str(value)
-            if forKey != "unicode":
-                value = escape_string(value)
+            self.writeValue(value)
+
+    def _writePlistValue(self, value):
+        value = value.plistValue()
+        if value is not None:
             self.file.write(value)
 
+    def _writeFloat(self, value):
+        self.file.write(floatsToStrings((value,), 5)[0])
+
+    def _writeInt(self, value):
+        self.file.write(str(value))
+
+    def _writeBool(self, value):
+        if value:
+            self.file.write("1")
+        else:
+            self.file.write("0")
+
+    def _writeDatetime(self, value):
+        self.file.write('"%s +0000"' % str(value))
+
+    def _writeString(self, value):
+        self.file.write(escape_string(str(value)))
+
     def writeKey(self, key):
-        key = escape_string(key)
-        self.file.write("%s = " % key)
+        self.file.write(_key_prefix(key))
+
+
+_writeString = Writer._writeString
+
+# How many characters of what Writer writes to buffer before encoding them to
+# the file, bounding the memory used (a few MB at most) while keeping the
+# number of writes low.
+_BUFFER_SIZE = 1 << 20
+
+
+class _EncodingBuffer:
+    """Collects what Writer writes, for a file object that expects bytes.
+
+    Appending to a list is much cheaper than encoding each of the many small
+    strings (mostly keys, numbers and punctuation) on its own. Strings are
+    only collected between `start` and `stop`, so that nothing is left
+    unwritten when Writer methods are called directly; otherwise each is
+    encoded and written right away. They are written out once they add up to
+    `_BUFFER_SIZE` characters.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.pieces = []
+        self.size = 0
+        self.write = self._write
+
+    def _write(self, string):
+        self.fp.write(string.encode("utf-8"))
+
+    def _collect(self, string):
+        self.pieces.append(string)
+        self.size += len(string)
+        if self.size >= _BUFFER_SIZE:
+            self.flush()
+
+    def start(self):
+        self.write = self._collect
+
+    def stop(self):
+        self.flush()
+        self.write = self._write
+
+    def flush(self):
+        if self.pieces:
+            self.fp.write("".join(self.pieces).encode("utf-8"))
+            self.pieces.clear()
+        self.size = 0
+
+
+class _StringPieces:
+    """The file object of `dumps`, which collects the strings that Writer
+    writes and joins them once, instead of writing them to a StringIO."""
+
+    def __init__(self):
+        self.pieces = []
+
+    def write(self, string):
+        # Writer first writes bytes, to find whether the file expects them.
+        if not isinstance(string, str):
+            raise TypeError("write() argument must be str")
+        self.pieces.append(string)
+        # Then strings can be collected without checking them.
+        self.write = self.pieces.append
+
+    def getvalue(self):
+        return "".join(self.pieces)
+
+
+# Value writers by the exact type of the value, see `_value_writer`.
+_value_writers = {}
+
+
+def _value_writer(cls):
+    """Return the Writer method that writes values of class 'cls'."""
+    try:
+        return _value_writers[cls]
+    except KeyError:
+        pass
+    if hasattr(cls, "plistValue"):
+        method = Writer._writePlistValue
+    elif issubclass(cls, glyphsLib.classes.UserDataProxy):
+        method = Writer.writeUserData
+    elif issubclass(cls, glyphsLib.classes.FontGlyphsProxy):
+        method = Writer.writeGlyphs
+    elif issubclass(cls, (list, glyphsLib.classes.Proxy)):
+        method = Writer.writeArray
+    elif issubclass(cls, glyphsLib.classes.GSGlyph):
+        method = Writer.writeGlyph
+    elif issubclass(cls, (dict, OrderedDict, glyphsLib.classes.GSBase)):
+        method = Writer.writeDict
+    elif cls is glyphsLib.classes._PackedNodes:
+        method = Writer.writePackedNodes
+    elif cls is float:
+        method = Writer._writeFloat
+    elif cls is int:
+        method = Writer._writeInt
+    elif cls is bool:
+        method = Writer._writeBool
+    elif cls is datetime.datetime:
+        method = Writer._writeDatetime
+    else:
+        method = _writeString
+    _value_writers[cls] = method
+    return method
 
 
-def dump(obj, fp):
+# The font whose glyphs a worker process writes, its source text, and the
+# (start, end) of the glyphs to copy from it by index.
+_glyphs_writer_state = None
+
+
+def _init_glyphs_writer(font, source, ranges):
+    """Prepare a worker process to write glyphs of 'font', see
+    `Writer.writeGlyphs`."""
+    global _glyphs_writer_state
+    _glyphs_writer_state = (font, source, ranges)
+
+
+def _write_glyphs(first, last):
+    """Write the glyphs of the font from index 'first' to 'last', in a
+    worker process, and return them separated like in Writer.writeArray."""
+    font, source, ranges = _glyphs_writer_state
+    fp = StringIO()
+    writer = Writer(fp)
+    glyphs = font._glyphs
+    for idx in range(first, last):
+        if idx > first:
+            fp.write(",\n")
+        sourceRange = ranges.get(idx)
+        if sourceRange is None:
+            writer.writeValue(glyphs[idx])
+            continue
+        text = source[sourceRange[0] : sourceRange[1]]
+        if not isinstance(text, str):
+            text = text.decode("utf-8")
+        fp.write(text)
+    return fp.getvalue()
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _key_prefix(key):
+    return "%s = " % escape_string(key)
+
+
+def _path_nodes(path):
+    """Return the nodes of a path to write, without making GSNode objects."""
+    return path._nodes
+
+
+# Attributes whose value is not written as returned by `getattr`, by class
+# and key.
+_attribute_getters = {("GSPath", "nodes"): _path_nodes}
+
+# Attributes whose value is not written by `Writer.writeValue`, by class and
+# key.
+_attribute_writers = {("GSFont", "kerning"): Writer.writeKerning}
+
+# Keys whose values `Writer.writeValue` writes in a special way.
+_SPECIAL_KEYS = frozenset(("color", "unicode"))
+
+
+def _sorted_items(dictValue):
+    """Return the items of a dictionary in the order `Writer.writeDict`
+    writes them, skipping None values."""
+    if isinstance(dictValue, OrderedDict):
+        items = dictValue.items()
+    else:
+        items = sorted(dictValue.items(), key=operator.itemgetter(0))
+    return [(key, value) for key, value in items if value is not None]
+
+
+# Serializers by GSBase subclass, see `_serializer`.
+_serializers = {}
+
+
+def _serializer(cls):
+    """Return a function that writes objects of class 'cls' (a subclass of
+    GSBase) like the generic `Writer.writeDict`, with the keys, their
+    escaping, the attributes to get and the checks done by
+    `GSBase.shouldWriteValueForKey` all worked out once.
+    """
+    try:
+        return _serializers[cls]
+    except KeyError:
+        pass
+    if hasattr(cls, "_keyOrder"):
+        keys = cls._keyOrder
+    else:
+        keys = sorted(cls._classesForName.keys())
+    # Only the generic implementation is done inline, overrides are called.
+    custom_check = (
+        cls.shouldWriteValueForKey
+        is not glyphsLib.classes.GSBase.shouldWriteValueForKey
+    )
+    fields = []
+    for key in keys:
+        klass = cls._classesForName[key]
+        attribute = cls._wrapperKeysTranslate.get(key, key)
+        getter = _attribute_getters.get((cls.__name__, key))
+        if getter is None:
+            getter = operator.attrgetter(attribute)
+        fields.append(
+            (
+                key,
+                getter,
+                _key_prefix(key),
+                cls._defaultsForName.get(key, None),
+                klass in (int, float, bool),
+                key if key in _SPECIAL_KEYS else None,
+                _attribute_writers.get((cls.__name__, key)),
+            )
+        )
+    Proxy = glyphsLib.classes.Proxy
+    ValueType = glyphsLib.types.ValueType
+
+    def serialize(writer, obj):
+        write = writer.file.write
+        writeValue = writer.writeValue
+        write("{\n")
+        for key, getter, prefix, default, is_number, forKey, writeAs in fields:
+            try:
+                value = getter(obj)
+            except AttributeError:
+                continue
+            if value is None:
+                continue
+            if custom_check:
+                if not obj.shouldWriteValueForKey(key):
+                    continue
+            elif isinstance(value, (list, Proxy, str)) and len(value) == 0:
+                continue
+            elif default is not None:
+                if default == value:
+                    continue
+            elif is_number and value == 0:
+                continue
+            elif isinstance(value, ValueType) and value.value is None:
+                continue
+            write(prefix)
+            if writeAs is None:
+                writeValue(value, forKey)
+            else:
+                writeAs(writer, value)
+            write(";\n")
+        write("}")
+
+    _serializers[cls] = serialize
+    return serialize
+
+
+def content_hash(obj):
+    """Return a digest of an object (e.g. a glyph or a layer) as written in a
+    .glyphs file, as a string of 32 hexadecimal digits.
+
+    It only depends on the written form, so it is the same for the same
+    content in any version of glyphsLib that writes it the same way.
+    """
+    fp = StringIO()
+    Writer(fp).writeValue(obj)
+    return _content_digest(fp.getvalue().encode("utf-8"))
+
+
+def _content_digest(data):
+    """Return the digest of `content_hash` for UTF-8 encoded text."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def dump(obj, fp, incremental=False, workers=None):
     """Write a GSFont object to a .glyphs file.
     'fp' should be a (writable) file object.
+
+    See `Writer` for `incremental` and `workers`.
     """
-    writer = Writer(fp)
+    writer = Writer(fp, incremental=incremental, workers=workers)
     logger.info("Writing .glyphs file")
     writer.write(obj)
 
 
-def dumps(obj):
+def dumps(obj, incremental=False, workers=None):
     """Serialize a GSFont object to a .glyphs file format.
     Return a (unicode) str object.
     """
-    fp = StringIO()
-    dump(obj, fp)
+    fp = _StringPieces()
+    dump(obj, fp, incremental=incremental, workers=workers)
     return fp.getvalue()
 
 
@@ -310,17 +749,22 @@ NSPropertyListNameSet = (
 )
 
 
-def _needs_quotes(string):
-    if len(string) == 0:
-        return True
+# Strings that only have characters of NSPropertyListNameSet
+_name_re = re.compile(r"[$.0-9A-Z_a-z]+")
+_digit_re = re.compile(r"[0-9]")
+
 
+def _needs_quotes(string):
     # Does it need quotes because of special characters?
-    for c in string:
-        d = ord(c)
-        if d >= 128 or not NSPropertyListNameSet[d]:
-            return True
+    if not _name_re.fullmatch(string):
+        return True
 
     # Does it need quotes because it could be confused with a number?
+    # `int` and `float` only accept strings of these characters if they have
+    # a digit, or are spellings of infinity and NaN.
+    if not _digit_re.search(string):
+        return string.lower() in ("inf", "infinity", "nan")
+
     try:
         int(string)
     except ValueError:
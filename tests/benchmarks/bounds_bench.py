@@ -0,0 +1,99 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cost of measuring the bounds of the layers of a large font.
+
+Usage:
+    python -m tests.benchmarks.bounds_bench [--glyphs N] [FILE.glyphs]
+
+The bounds of the layer of every glyph for each master of the font (by default
+a synthetic one with N glyphs) are measured on a freshly loaded font, with
+`GSLayer.bounds` and with `GSFont.compute_bounds`. They are then measured again
+once they are known, and after moving a node of every glyph that components
+show, which renews the bounds of the glyphs that use it.
+"""
+
+import argparse
+import gc
+import time
+
+import glyphsLib
+
+from .synthetic import synthetic_font_text
+
+
+def layer_bounds(font):
+    for master in font.masters:
+        for glyph in font.glyphs:
+            layer = glyph.layers[master.id]
+            if layer is not None:
+                layer.bounds
+
+
+def move_component_glyphs(font):
+    names = {
+        component.name
+        for glyph in font.glyphs
+        for layer in glyph.layers
+        for component in layer.components
+    }
+    for name in names:
+        glyph = font.glyphs[name]
+        if glyph is None:
+            continue
+        for layer in glyph.layers:
+            for path in layer.paths:
+                path.nodes[0].position.x += 1
+                break
+
+
+def timed(function):
+    gc.collect()
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", metavar="FILE.glyphs")
+    parser.add_argument("--glyphs", type=int, default=2000)
+    args = parser.parse_args(args)
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as fp:
+            text = fp.read()
+    else:
+        text = synthetic_font_text(args.glyphs)
+
+    font = glyphsLib.loads(text)
+    print(
+        "{} ({} glyphs, {} masters)".format(
+            args.file or "synthetic", len(font.glyphs), len(font.masters)
+        )
+    )
+    elapsed = timed(lambda: layer_bounds(font))
+    print("  {:<22} {:8.3f} s".format("GSLayer.bounds", elapsed))
+    font = glyphsLib.loads(text)
+    elapsed = timed(lambda: [font.compute_bounds(master.id) for master in font.masters])
+    print("  {:<22} {:8.3f} s".format("compute_bounds", elapsed))
+    elapsed = timed(lambda: layer_bounds(font))
+    print("  {:<22} {:8.3f} s".format("known bounds", elapsed))
+    move_component_glyphs(font)
+    elapsed = timed(lambda: layer_bounds(font))
+    print("  {:<22} {:8.3f} s".format("after changes", elapsed))
+
+
+if __name__ == "__main__":
+    main()
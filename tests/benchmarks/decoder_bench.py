@@ -0,0 +1,92 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cost of parsing each kind of object.
+
+Usage:
+    python -m tests.benchmarks.decoder_bench [--repeat N] [FILE.glyphs]
+
+Every object of the classes below found in the file (by default
+tests/data/GlyphsUnitTestSans.glyphs) is written out, and its source parsed
+again with the parser engines; the time per object includes the objects it
+contains.
+"""
+
+import argparse
+from io import StringIO
+
+from glyphsLib import classes
+from glyphsLib.parser import Parser
+from glyphsLib.writer import Writer
+
+from .parser_bench import best_time
+from .synthetic import TEMPLATE
+
+
+def _sources(font):
+    """Return the source text of the objects of the font, by class."""
+    objects = {
+        classes.GSFontMaster: list(font.masters),
+        classes.GSInstance: list(font.instances),
+        classes.GSGlyph: list(font.glyphs),
+        classes.GSLayer: [],
+        classes.GSPath: [],
+        classes.GSComponent: [],
+        classes.GSAnchor: [],
+    }
+    for glyph in font.glyphs:
+        for layer in glyph.layers:
+            objects[classes.GSLayer].append(layer)
+            objects[classes.GSPath].extend(layer.paths)
+            objects[classes.GSComponent].extend(layer.components)
+            objects[classes.GSAnchor].extend(layer.anchors)
+    sources = {}
+    for cls, instances in objects.items():
+        texts = []
+        for obj in instances:
+            fp = StringIO()
+            Writer(fp).writeDict(obj)
+            texts.append(fp.getvalue())
+        sources[cls] = texts
+    return sources
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", default=TEMPLATE, metavar="FILE.glyphs")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(args)
+
+    sources = _sources(classes.GSFont(args.file))
+    print("{:<14}{:>8}".format("class", "count"), end="")
+    for engine in Parser.ENGINES:
+        print("{:>14}".format(engine), end="")
+    print()
+    for cls, texts in sources.items():
+        if not texts:
+            continue
+        print("{:<14}{:>8}".format(cls.__name__, len(texts)), end="")
+        for engine in Parser.ENGINES:
+
+            def parse():
+                for text in texts:
+                    Parser(cls, engine=engine).parse(text)
+
+            elapsed = best_time(parse, args.repeat)
+            print("{:>11.1f} us".format(elapsed / len(texts) * 1e6), end="")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cost of looking glyphs up by name and unicode in large fonts.
+
+Usage:
+    python -m tests.benchmarks.glyph_lookup_bench [--glyphs N] [--masters N]
+
+UFO masters with N glyphs each are converted with `glyphsLib.to_glyphs`, which
+looks every glyph up in the font it builds, once per master. The same lookups
+are also timed alone, the way `to_glyphs_glyph` does them: adding the glyphs
+of the first master, and finding them again for the others. Both are timed
+with the indexes of `GSFont`, and with the linear search that was used before.
+"""
+
+import argparse
+import contextlib
+from unittest import mock
+
+import defcon
+
+import glyphsLib
+from glyphsLib import classes
+
+from .parser_bench import best_time
+
+
+def linear_lookup(self, key):
+    """The former `FontGlyphsProxy._get_glyph_by_string`."""
+    if isinstance(key, str):
+        for glyph in self._owner._glyphs:
+            if glyph.name == key:
+                return glyph
+        if len(key) == 1:
+            for glyph in self._owner._glyphs:
+                if glyph.unicode == "%04X" % (ord(key)):
+                    return glyph
+        else:
+            for glyph in self._owner._glyphs:
+                if glyph.unicode == key.upper():
+                    return glyph
+    return None
+
+
+def masters(glyph_count, master_count):
+    ufos = []
+    for master in range(master_count):
+        ufo = defcon.Font()
+        ufo.info.familyName = "Lookup"
+        ufo.info.styleName = "Master %d" % master
+        for i in range(glyph_count):
+            glyph = ufo.newGlyph("glyph%05d" % i)
+            glyph.unicodes = [0xE000 + i]
+            glyph.width = 500 + master
+        ufos.append(ufo)
+    return ufos
+
+
+def add_glyphs(ufos):
+    font = classes.GSFont()
+    for ufo in ufos:
+        for ufo_glyph in ufo:
+            if ufo_glyph.name in font.glyphs:
+                glyph = font.glyphs[ufo_glyph.name]
+            else:
+                glyph = classes.GSGlyph(name=ufo_glyph.name)
+                font.glyphs.append(glyph)
+            glyph.unicodes = ["%04X" % c for c in ufo_glyph.unicodes]
+    return font
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--glyphs", type=int, default=20000)
+    parser.add_argument("--masters", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(args)
+
+    ufos = masters(args.glyphs, args.masters)
+    print("{} glyphs in {} masters".format(args.glyphs, args.masters))
+    for label, function in (
+        ("lookups", lambda: add_glyphs(ufos)),
+        ("to_glyphs", lambda: glyphsLib.to_glyphs(ufos)),
+    ):
+        for linear in (True, False):
+            lookup = contextlib.nullcontext()
+            if linear:
+                lookup = mock.patch.object(
+                    classes.FontGlyphsProxy, "_get_glyph_by_string", linear_lookup
+                )
+            with lookup:
+                elapsed = best_time(function, args.repeat)
+            print(
+                "  {:<22} {:8.3f} s".format(
+                    label + (", linear search" if linear else ""), elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
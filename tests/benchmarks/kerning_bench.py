@@ -0,0 +1,102 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput of reading and writing the kerning of a font.
+
+Usage:
+    python -m tests.benchmarks.kerning_bench [--pairs N] [--masters N]
+
+Random kerning between glyphs and kerning groups is read and written with the
+dedicated code for kerning, and with the generic code for dictionaries that
+was used before, followed by the `GSFont.kerning` setter when reading.
+"""
+
+import argparse
+import random
+from collections import OrderedDict
+from io import StringIO
+
+from glyphsLib import classes
+from glyphsLib.parser import Parser
+from glyphsLib.writer import Writer
+
+from .parser_bench import best_time
+
+
+def random_kerning(pairs, masters, seed=0):
+    rng = random.Random(seed)
+    names = ["glyph%04d" % i for i in range(2000)]
+    names += ["@MMK_L_group%03d" % i for i in range(200)]
+    names += ["@MMK_R_group%03d" % i for i in range(200)]
+    kerning = OrderedDict()
+    for master in range(masters):
+        master_map = kerning["MASTER-%d" % master] = OrderedDict()
+        for _ in range(pairs):
+            left, right = rng.sample(names, 2)
+            master_map.setdefault(left, OrderedDict())[right] = rng.randint(-150, 50)
+    return kerning
+
+
+def write_generic(kerning):
+    fp = StringIO()
+    Writer(fp).writeDict(kerning)
+    return fp.getvalue()
+
+
+def write_kerning(kerning):
+    fp = StringIO()
+    Writer(fp).writeKerning(kerning)
+    return fp.getvalue()
+
+
+def read_generic(text):
+    font = classes.GSFont()
+    font.kerning = Parser(current_type=OrderedDict).parse(text)
+    return font
+
+
+def read_kerning(text):
+    return Parser(current_type=classes.GSFont).parse("{\nkerning = %s;\n}" % text)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=200000)
+    parser.add_argument("--masters", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(args)
+
+    kerning = random_kerning(args.pairs, args.masters)
+    text = write_kerning(kerning)
+    assert write_generic(kerning) == text
+    assert read_kerning(text).kerning == read_generic(text).kerning
+    count = sum(len(p) for m in kerning.values() for p in m.values())
+    size = len(text.encode("utf-8")) / 1e6
+    print("{} pairs in {} masters ({:.1f} MB)".format(count, args.masters, size))
+    for label, function, argument in (
+        ("read, generic", read_generic, text),
+        ("read", read_kerning, text),
+        ("write, generic", write_generic, kerning),
+        ("write", write_kerning, kerning),
+    ):
+        elapsed = best_time(lambda: function(argument), args.repeat)
+        print(
+            "  {:<16} {:8.3f} s {:8.2f} MB/s {:8.0f} k pairs/s".format(
+                label, elapsed, size / elapsed, count / elapsed / 1e3
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
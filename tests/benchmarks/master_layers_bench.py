@@ -0,0 +1,130 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cost of finding the master layers of the glyphs of a font with many masters.
+
+Usage:
+    python -m tests.benchmarks.master_layers_bench [--masters M] [--glyphs N]
+
+The layers of every glyph of a font made in memory, with M masters and a
+few intermediate layers per glyph, are iterated over and looked up by master
+id, with the masters indexed by id, and with the former linear searches, which
+checked the master layers of the glyph again on each access.
+"""
+
+import argparse
+import contextlib
+from unittest import mock
+
+from glyphsLib import classes
+from glyphsLib.classes import GSFont, GSFontMaster, GSGlyph, GSLayer
+
+from .parser_bench import best_time
+
+
+def former_master_for_id(self, key):
+    for master in self._masters:
+        if master.id == key:
+            return master
+    return None
+
+
+def former_ensure_master_layers(self):
+    if not self._owner.parent:
+        return
+    for master in self._owner.parent.masters:
+        if self._owner.parent.masters[master.id] is None:
+            newLayer = GSLayer()
+            newLayer.associatedMasterId = master.id
+            newLayer.layerId = master.id
+            self._owner._setupLayer(newLayer, master.id)
+            self.__setitem__(master.id, newLayer)
+
+
+def former_ordered_layers(self):
+    layers = self._layers
+    glyphLayerIds = [
+        layer.associatedMasterId
+        for layer in layers.values()
+        if layer.associatedMasterId == layer.layerId
+    ]
+    masterIds = [m.id for m in self.parent.masters]
+    intersectedLayerIds = set(glyphLayerIds) & set(masterIds)
+    orderedLayers = [
+        layers[m.id] for m in self.parent.masters if m.id in intersectedLayerIds
+    ]
+    orderedLayers += [
+        layers[layer.layerId]
+        for layer in layers.values()
+        if layer.layerId not in intersectedLayerIds
+    ]
+    return orderedLayers
+
+
+def former_lookups():
+    stack = contextlib.ExitStack()
+    for cls, name, function in (
+        (GSFont, "masterForId", former_master_for_id),
+        (classes.GlyphLayerProxy, "_ensureMasterLayers", former_ensure_master_layers),
+        (GSGlyph, "_orderedLayers", former_ordered_layers),
+    ):
+        stack.enter_context(mock.patch.object(cls, name, function))
+    return stack
+
+
+def make_font(masters, glyphs):
+    font = GSFont()
+    for _ in range(masters):
+        font.masters.append(GSFontMaster())
+    for index in range(glyphs):
+        glyph = GSGlyph("glyph%d" % index)
+        font.glyphs.append(glyph)
+        for master in font.masters:
+            layer = GSLayer()
+            layer.layerId = layer.associatedMasterId = master.id
+            glyph.layers.append(layer)
+        for master in font.masters[: masters // 2]:
+            layer = GSLayer()
+            layer.associatedMasterId = master.id
+            glyph.layers.append(layer)
+    return font
+
+
+def master_layers(font):
+    for glyph in font.glyphs:
+        for layer in glyph.layers:
+            layer.layerId
+        for master in font.masters:
+            glyph.layers[master.id]
+            font.masterForId(master.id)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--masters", type=int, default=12)
+    parser.add_argument("--glyphs", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(args)
+
+    font = make_font(args.masters, args.glyphs)
+    print("{} masters, {} glyphs".format(args.masters, args.glyphs))
+    elapsed = best_time(lambda: master_layers(font), args.repeat)
+    print("  {:<22} {:8.3f} s".format("indexed masters", elapsed))
+    with former_lookups():
+        elapsed = best_time(lambda: master_layers(font), args.repeat)
+    print("  {:<22} {:8.3f} s".format("linear searches", elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Peak memory of loading a large .glyphs file.
+
+Usage:
+    python -m tests.benchmarks.memory_bench [--glyphs N] [FILE.glyphs]
+
+Without a file, a synthetic source with N glyphs (about 100 MB by default) is
+generated. Each way of loading runs in a fresh interpreter, which reports its
+peak resident set size, the peak of its anonymous (not file-backed) part, and
+how much memory is still used by the loaded font.
+
+Pages of a memory-mapped file count towards the resident set size while they
+are mapped, but they are backed by the page cache and can be dropped at any
+time, unlike a copy of the text read into a Python str.
+"""
+
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import glyphsLib
+
+from .synthetic import synthetic_font_file
+
+MODES = {
+    # What `glyphsLib.load` did before files were memory-mapped.
+    "read": lambda fp, lazy: glyphsLib.loads(fp.read(), lazy=lazy),
+    "mmap": lambda fp, lazy: glyphsLib.load(fp, lazy=lazy),
+}
+
+
+def current_rss():
+    """Return the resident set size of this process in bytes, or None."""
+    try:
+        with open("/proc/self/statm") as fp:
+            return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+def anonymous_rss():
+    """Return the anonymous part of the resident set size in bytes, or None."""
+    try:
+        with open("/proc/self/status") as fp:
+            for line in fp:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class AnonymousPeak(threading.Thread):
+    """Sample `anonymous_rss` until stopped, keeping the highest value."""
+
+    def __init__(self, interval=0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = anonymous_rss()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, anonymous_rss())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return self.peak
+
+
+def peak_rss():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run(mode, lazy, path):
+    gc.collect()
+    before = current_rss()
+    sampler = AnonymousPeak()
+    if sampler.peak is not None:
+        sampler.start()
+    start = time.perf_counter()
+    with open(path, "r", encoding="utf-8") as fp:
+        font = MODES[mode](fp, lazy)
+    elapsed = time.perf_counter() - start
+    anonymous_peak = sampler.stop() if sampler.peak is not None else None
+    gc.collect()
+    after = current_rss()
+    print(
+        json.dumps(
+            {
+                "time": elapsed,
+                "peak": peak_rss(),
+                "anonymous_peak": anonymous_peak,
+                "retained": None if before is None else after - before,
+                "glyphs": len(font.glyphs),
+            }
+        )
+    )
+
+
+def megabytes(size):
+    return "n/a" if size is None else "%.1f" % (size / 1e6)
+
+
+def measure(mode, lazy, path):
+    args = [sys.executable, "-m", __spec__.name, "--run", mode, path]
+    if lazy:
+        args.append("--lazy")
+    return json.loads(subprocess.check_output(args))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", metavar="FILE.glyphs")
+    parser.add_argument("--glyphs", type=int, default=40000)
+    parser.add_argument("--run", choices=sorted(MODES), help=argparse.SUPPRESS)
+    parser.add_argument("--lazy", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(args)
+
+    if args.run:
+        return run(args.run, args.lazy, args.file)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.file
+        if path is None:
+            path = os.path.join(tmp, "synthetic.glyphs")
+            synthetic_font_file(path, glyph_count=args.glyphs)
+        size = os.path.getsize(path)
+        print("{} ({:.1f} MB)".format(path if args.file else "synthetic", size / 1e6))
+        for lazy in (False, True):
+            for mode in MODES:
+                result = measure(mode, lazy, path)
+                print(
+                    "  {:<10} {:7.2f} s  peak {:7.1f} MB  anonymous {:>7} MB"
+                    "  font {:>7} MB".format(
+                        mode + (" lazy" if lazy else ""),
+                        result["time"],
+                        result["peak"] / 1e6,
+                        megabytes(result["anonymous_peak"]),
+                        megabytes(result["retained"]),
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
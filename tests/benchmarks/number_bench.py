@@ -0,0 +1,89 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cost of formatting numbers for the writer.
+
+Usage:
+    python -m tests.benchmarks.number_bench [--count N] [--repeat N]
+
+Each kind of value below is formatted with `floatToString` as it was before
+its integer fast path (`actualPrecition` for every value), with the current
+`floatToString` one value at a time, and with `floatsToStrings` for the whole
+array at once, which also caches the strings.
+"""
+
+import argparse
+import math
+import random
+from array import array
+
+from glyphsLib.types import actualPrecition, floatToString, floatsToStrings
+
+from .parser_bench import best_time
+
+
+def old_float_to_string(Float, precision=3):
+    ActualPrecition = actualPrecition(Float)
+    precision = min(precision, ActualPrecition)
+    fractional = math.modf(math.fabs(Float))[0]
+    if precision >= 5 and 0.000005 <= fractional <= 0.999995:
+        return "%.5f" % Float
+    elif precision >= 4 and 0.00005 <= fractional <= 0.99995:
+        return "%.4f" % Float
+    elif precision >= 3 and 0.0005 <= fractional <= 0.9995:
+        return "%.3f" % Float
+    elif precision >= 2 and 0.005 <= fractional <= 0.995:
+        return "%.2f" % Float
+    elif precision >= 1 and 0.05 <= fractional <= 0.95:
+        return "%.1f" % Float
+    else:
+        return "%.0f" % Float
+
+
+def values(count):
+    rng = random.Random(0)
+    return {
+        # Node coordinates as parsed into packed paths.
+        "coordinates": array("d", (rng.randint(-200, 1200) for _ in range(count))),
+        "kerning": [rng.randint(-150, 50) for _ in range(count)],
+        "1 decimal": [rng.randint(-2000, 2000) / 10 for _ in range(count)],
+        "random": [rng.uniform(-2000, 2000) for _ in range(count)],
+    }
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(args)
+
+    print(
+        "{:<12}{:>17}{:>17}{:>17}".format(
+            "values", "old", "floatToString", "floatsToStrings"
+        )
+    )
+    for name, numbers in values(args.count).items():
+        times = [
+            best_time(lambda: [old_float_to_string(v) for v in numbers], args.repeat),
+            best_time(lambda: [floatToString(v) for v in numbers], args.repeat),
+            best_time(lambda: floatsToStrings(numbers), args.repeat),
+        ]
+        print(
+            "{:<12}".format(name)
+            + "".join("{:>14.0f} ns".format(t / len(numbers) * 1e9) for t in times)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Throughput of making new objects of each GSBase class.
+
+Usage:
+    python -m tests.benchmarks.object_creation_bench [--count N] [FILE.glyphs]
+
+N objects of each class are made with their default values, with the initial
+values that each class works out once, and with the former `GSBase.__init__`,
+which worked them out again for each object. The font (by default a synthetic
+one) is then parsed both ways.
+"""
+
+import argparse
+import inspect
+from unittest import mock
+
+import glyphsLib
+from glyphsLib import classes
+from glyphsLib.classes import GSBase
+
+from .parser_bench import best_time
+from .synthetic import synthetic_font_text
+
+CLASSES = [
+    classes.GSFont,
+    classes.GSFontMaster,
+    classes.GSAlignmentZone,
+    classes.GSGlyph,
+    classes.GSLayer,
+    classes.GSBackgroundLayer,
+    classes.GSPath,
+    classes.GSNode,
+    classes.GSComponent,
+    classes.GSAnchor,
+    classes.GSGuideLine,
+    classes.GSHint,
+    classes.GSAnnotation,
+    classes.GSFeature,
+    classes.GSClass,
+    classes.GSInstance,
+    classes.GSCustomParameter,
+]
+
+
+def former_init(self):
+    """The former `GSBase.__init__`."""
+    for key in self._classesForName.keys():
+        if not hasattr(self, key):
+            klass = self._classesForName[key]
+            if inspect.isclass(klass) and issubclass(klass, GSBase):
+                value = []
+            elif key in self._defaultsForName:
+                value = self._defaultsForName.get(key)
+            else:
+                value = klass()
+            key = self._wrapperKeysTranslate.get(key, key)
+            setattr(self, key, value)
+
+
+def make(cls, count):
+    for _ in range(count):
+        cls()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", metavar="FILE.glyphs")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--glyphs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(args)
+
+    print("{} objects per class, objects per second".format(args.count))
+    print("  {:<20} {:>12} {:>12}".format("", "initial", "former"))
+    for cls in CLASSES:
+        cls()
+        elapsed = best_time(lambda: make(cls, args.count), args.repeat)
+        with mock.patch.object(GSBase, "__init__", former_init):
+            former = best_time(lambda: make(cls, args.count), args.repeat)
+        print(
+            "  {:<20} {:12.0f} {:12.0f}".format(
+                cls.__name__, args.count / elapsed, args.count / former
+            )
+        )
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as fp:
+            text = fp.read()
+    else:
+        text = synthetic_font_text(args.glyphs)
+    print(args.file or "synthetic ({} glyphs)".format(args.glyphs))
+    elapsed = best_time(lambda: glyphsLib.loads(text), args.repeat)
+    print("  {:<20} {:8.3f} s".format("parse", elapsed))
+    with mock.patch.object(GSBase, "__init__", former_init):
+        elapsed = best_time(lambda: glyphsLib.loads(text), args.repeat)
+    print("  {:<20} {:8.3f} s".format("former __init__", elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Memory used by the objects of a large font, as traced by tracemalloc.
+
+Usage:
+    python -m tests.benchmarks.object_memory_bench [--glyphs N] [FILE.glyphs]
+
+First, the memory taken by one object of each of the classes that fonts have
+many objects of is measured, by creating many of them. Then the font (by
+default a synthetic one with N glyphs) is loaded, and the memory it takes is
+measured, once loaded, and once GSNode objects, which the paths make when
+first needed, have been made for the nodes of all its paths.
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+import glyphsLib
+from glyphsLib import classes
+from glyphsLib.types import Point, Rect, Transform
+
+from .synthetic import synthetic_font_text
+
+OBJECTS = {
+    "GSNode": lambda: classes.GSNode((100, 200), classes.GSNode.CURVE, True),
+    "GSAnchor": lambda: classes.GSAnchor("top", Point(100, 200)),
+    "GSComponent": lambda: classes.GSComponent("a", offset=(100, 200)),
+    "GSHint": classes.GSHint,
+    "GSGuideLine": classes.GSGuideLine,
+    "Point": lambda: Point(100, 200),
+    "Rect": lambda: Rect(Point(0, 0), Point(100, 200)),
+    "Transform": lambda: Transform(1, 0, 0, 1, 100, 200),
+}
+
+
+def traced(function):
+    """Return the result of 'function', and the memory it still takes once
+    it has returned, in bytes."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def unpack_nodes(font):
+    count = 0
+    for glyph in font.glyphs:
+        for layer in glyph.layers:
+            for path in layer.paths:
+                count += len(path.nodes[:])
+    return count
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", metavar="FILE.glyphs")
+    parser.add_argument("--glyphs", type=int, default=5000)
+    parser.add_argument("--objects", type=int, default=100000)
+    args = parser.parse_args(args)
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as fp:
+            text = fp.read()
+    else:
+        text = synthetic_font_text(args.glyphs)
+
+    tracemalloc.start()
+    print("bytes per object")
+    for name, new in OBJECTS.items():
+        objects, size = traced(lambda: [new() for _ in range(args.objects)])
+        print("  {:<14} {:8.1f}".format(name, size / args.objects))
+        del objects
+
+    print(
+        "{} ({:.1f} MB)".format(
+            args.file or "synthetic", len(text.encode("utf-8")) / 1e6
+        )
+    )
+    font, size = traced(lambda: glyphsLib.loads(text))
+    print("  {:<14} {:8.1f} MB".format("loaded", size / 1e6))
+    nodes, unpacked = traced(lambda: unpack_nodes(font))
+    print(
+        "  {:<14} {:8.1f} MB ({} nodes, {:.1f} bytes per node)".format(
+            "nodes", (size + unpacked) / 1e6, nodes, unpacked / max(nodes, 1)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
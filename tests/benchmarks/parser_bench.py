@@ -0,0 +1,103 @@
+#
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parser throughput benchmarks.
+
+Usage:
+    python -m tests.benchmarks.parser_bench [--glyphs N] [--workers N ...]
+        [FILE.glyphs ...]
+
+Without files, a synthetic source with N glyphs is generated.
+"""
+
+import argparse
+import tempfile
+import time
+
+import glyphsLib
+from glyphsLib import classes
+from glyphsLib.parser import Parser
+
+from .synthetic import synthetic_font_text
+
+
+def best_time(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def bench_engines(name, text, repeat, workers=()):
+    size = len(text.encode("utf-8")) / 1e6
+    print("{} ({:.1f} MB)".format(name, size))
+    for engine in Parser.ENGINES:
+
+        def parse():
+            Parser(classes.GSFont, engine=engine).parse(text)
+
+        elapsed = best_time(parse, repeat)
+        print("  {:<10} {:8.3f} s {:8.2f} MB/s".format(engine, elapsed, size / elapsed))
+
+    def parse_lazy():
+        Parser(classes.GSFont, lazy=True).parse(text)
+
+    elapsed = best_time(parse_lazy, repeat)
+    print("  {:<10} {:8.3f} s {:8.2f} MB/s".format("lazy", elapsed, size / elapsed))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+
+        def load_cached():
+            glyphsLib.loads(text, cache_dir=cache_dir)
+
+        load_cached()
+        elapsed = best_time(load_cached, repeat)
+        label = "cache hit"
+        print("  {:<10} {:8.3f} s {:8.2f} MB/s".format(label, elapsed, size / elapsed))
+
+    for count in workers:
+
+        def parse_parallel():
+            Parser(classes.GSFont, workers=count).parse(text)
+
+        elapsed = best_time(parse_parallel, repeat)
+        label = "%d workers" % count
+        print("  {:<10} {:8.3f} s {:8.2f} MB/s".format(label, elapsed, size / elapsed))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", metavar="FILE.glyphs")
+    parser.add_argument("--glyphs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="*", default=[])
+    args = parser.parse_args(args)
+
+    if args.files:
+        for path in args.files:
+            with open(path, encoding="utf-8") as fp:
+                bench_engines(path, fp.read(), args.repeat, args.workers)
+    else:
+        text = synthetic_font_text(glyph_count=args.glyphs)
+        name = "synthetic, %d glyphs" % args.glyphs
+        bench_engines(name, text, args.repeat, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cost of drawing the paths of a large font, and of the nodes of its paths.
+
+Usage:
+    python -m tests.benchmarks.path_nodes_bench [--glyphs N] [FILE.glyphs]
+
+The paths of every layer of the font (by default a synthetic one with N
+glyphs) are drawn onto UFO glyphs with `UFOBuilder.to_ufo_paths`, which reads
+the columns the nodes are stored in, and with the former implementation, which
+goes through a GSNode object per node. Going from every node to the next and
+previous ones, and finding the indices that hints refer to nodes by, is timed
+too, as well as the memory taken by the GSNode objects once all are made.
+"""
+
+import argparse
+import tracemalloc
+from unittest import mock
+
+import defcon
+
+import glyphsLib
+from glyphsLib.builder import paths
+from glyphsLib.builder.builders import UFOBuilder
+
+from .object_memory_bench import traced
+from .parser_bench import best_time
+from .synthetic import synthetic_font_text
+
+
+def object_paths(self, ufo_glyph, layer):
+    """The former `to_ufo_paths`, going through GSNode objects."""
+    pen = ufo_glyph.getPointPen()
+    for path in layer.paths:
+        nodes = list(path.nodes)
+        for node in nodes:
+            self.to_ufo_node_user_data(ufo_glyph, node)
+        pen.beginPath()
+        if not nodes:
+            pen.endPath()
+            continue
+        if not path.closed:
+            node = nodes.pop(0)
+            pen.addPoint(tuple(node.position), segmentType="move")
+        else:
+            nodes.insert(0, nodes.pop())
+        for node in nodes:
+            node_type = paths._to_ufo_node_type(node.type)
+            pen.addPoint(
+                tuple(node.position), segmentType=node_type, smooth=node.smooth
+            )
+        pen.endPath()
+
+
+def walk_nodes(layers):
+    for layer in layers:
+        for path in layer.paths:
+            for node in path.nodes:
+                node.nextNode, node.prevNode, node._indices()
+
+
+def draw_layers(builder, layers):
+    for layer in layers:
+        builder.to_ufo_paths(defcon.Glyph(), layer)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", metavar="FILE.glyphs")
+    parser.add_argument("--glyphs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(args)
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as fp:
+            text = fp.read()
+    else:
+        text = synthetic_font_text(args.glyphs)
+
+    font = glyphsLib.loads(text)
+    builder = UFOBuilder(font)
+    layers = [layer for glyph in font.glyphs for layer in glyph.layers]
+    print("{} ({} layers)".format(args.file or "synthetic", len(layers)))
+    elapsed = best_time(lambda: draw_layers(builder, layers), args.repeat)
+    print("  {:<22} {:8.3f} s".format("to_ufo_paths", elapsed))
+    with mock.patch.object(UFOBuilder, "to_ufo_paths", object_paths):
+        elapsed = best_time(lambda: draw_layers(builder, layers), args.repeat)
+    print("  {:<22} {:8.3f} s".format("with GSNode objects", elapsed))
+    elapsed = best_time(lambda: walk_nodes(layers), args.repeat)
+    print("  {:<22} {:8.3f} s".format("node topology", elapsed))
+
+    tracemalloc.start()
+    font = glyphsLib.loads(text)
+    nodes, size = traced(lambda: [node for node in iter_nodes(font)])
+    print(
+        "  {:<22} {:8.1f} MB ({:.1f} bytes per node)".format(
+            "GSNode objects", size / 1e6, size / max(len(nodes), 1)
+        )
+    )
+
+
+def iter_nodes(font):
+    for glyph in font.glyphs:
+        for layer in glyph.layers:
+            for path in layer.paths:
+                yield from path.nodes
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cost of getting the proxies of objects in the glyph loop of the builder.
+
+Usage:
+    python -m tests.benchmarks.proxy_bench [--glyphs N] [FILE.glyphs]
+
+The attributes that the builder reads for each glyph, layer, path and node of
+the font (by default a synthetic one with N glyphs) are read in the same
+order, with the proxies that objects keep, and with a new proxy made on each
+access, as before.
+"""
+
+import argparse
+import contextlib
+from unittest import mock
+
+import glyphsLib
+from glyphsLib import classes
+
+from .parser_bench import best_time
+from .synthetic import synthetic_font_text
+
+# Classes, attributes and proxy classes
+PROXIES = [
+    (classes.GSFont, "glyphs", classes.FontGlyphsProxy),
+    (classes.GSFont, "masters", classes.FontFontMasterProxy),
+    (classes.GSFont, "classes", classes.FontClassesProxy),
+    (classes.GSFont, "customParameters", classes.CustomParametersProxy),
+    (classes.GSFont, "userData", classes.UserDataProxy),
+    (classes.GSFontMaster, "customParameters", classes.CustomParametersProxy),
+    (classes.GSFontMaster, "userData", classes.UserDataProxy),
+    (classes.GSGlyph, "layers", classes.GlyphLayerProxy),
+    (classes.GSGlyph, "userData", classes.UserDataProxy),
+    (classes.GSLayer, "anchors", classes.LayerAnchorsProxy),
+    (classes.GSLayer, "hints", classes.LayerHintsProxy),
+    (classes.GSLayer, "paths", classes.LayerPathsProxy),
+    (classes.GSLayer, "components", classes.LayerComponentsProxy),
+    (classes.GSLayer, "guides", classes.LayerGuideLinesProxy),
+    (classes.GSLayer, "userData", classes.UserDataProxy),
+    (classes.GSPath, "nodes", classes.PathNodesProxy),
+]
+
+
+def former_node_name(self):
+    """The former `GSNode.name`."""
+    if "name" in self.userData:
+        return self.userData["name"]
+    return None
+
+
+def new_proxies():
+    """Make a new proxy on each access, as the properties did before."""
+    stack = contextlib.ExitStack()
+    for cls, name, proxy in PROXIES:
+        stack.enter_context(
+            mock.patch.object(
+                cls,
+                name,
+                property(
+                    lambda self, proxy=proxy: proxy(self),
+                    lambda self, value, proxy=proxy: proxy(self).setter(value),
+                ),
+            )
+        )
+    stack.enter_context(
+        mock.patch.object(classes.GSNode, "name", property(former_node_name))
+    )
+    return stack
+
+
+def glyph_loop(font):
+    for master in font.masters:
+        for glyph in font.glyphs:
+            font.customParameters["Disable Last Change"]
+            "GSCornerRadius" in font.userData
+            len(font.classes)
+            master.customParameters["Master Name"]
+            "GSCornerRadius" in master.userData
+            "GSCornerRadius" in glyph.userData
+            layer = glyph.layers[master.id]
+            if layer is None:
+                continue
+            "GSCornerRadius" in layer.userData
+            for anchor in layer.anchors:
+                anchor.name
+            for component in layer.components:
+                component.name
+            for hint in layer.hints:
+                hint.type
+            for guide in layer.guides:
+                guide.position
+            for path in layer.paths:
+                for node in path.nodes:
+                    node.name
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", metavar="FILE.glyphs")
+    parser.add_argument("--glyphs", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(args)
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as fp:
+            text = fp.read()
+    else:
+        text = synthetic_font_text(args.glyphs)
+
+    font = glyphsLib.loads(text)
+    glyph_loop(font)
+    print("{} ({} glyphs)".format(args.file or "synthetic", len(font.glyphs)))
+    elapsed = best_time(lambda: glyph_loop(font), args.repeat)
+    print("  {:<22} {:8.3f} s".format("kept proxies", elapsed))
+    with new_proxies():
+        elapsed = best_time(lambda: glyph_loop(font), args.repeat)
+    print("  {:<22} {:8.3f} s".format("new proxies", elapsed))
+
+
+if __name__ == "__main__":
+    main()
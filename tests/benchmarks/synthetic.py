@@ -0,0 +1,89 @@
+#
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Build large synthetic .glyphs sources for the benchmarks.
+
+The glyphs of tests/data/GlyphsUnitTestSans.glyphs are copied under new names
+until the requested number of glyphs is reached, and kerning pairs between
+those copies are added to every master.
+"""
+
+import os
+import random
+from collections import OrderedDict
+from io import StringIO
+
+import glyphsLib
+from glyphsLib.writer import Writer
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+TEMPLATE = os.path.join(DATA, "GlyphsUnitTestSans.glyphs")
+
+
+def _write(obj):
+    fp = StringIO()
+    Writer(fp).writeDict(obj)
+    return fp.getvalue()
+
+
+def synthetic_font_text(glyph_count=2000, kerning_pairs=1000, seed=0):
+    """Return the text of a .glyphs file with `glyph_count` glyphs and
+    `kerning_pairs` kerning pairs per master.
+    """
+    font = glyphsLib.GSFont(TEMPLATE)
+    rng = random.Random(seed)
+
+    glyph_texts = []
+    names = []
+    templates = list(font.glyphs)
+    for index in range(glyph_count):
+        template = templates[index % len(templates)]
+        if index < len(templates):
+            name = template.name
+        else:
+            name = "%s.copy%d" % (template.name, index)
+            original = (template.name, template.unicodes)
+            template.name, template.unicodes = name, None
+        glyph_texts.append(_write(template))
+        if index >= len(templates):
+            template.name, template.unicodes = original
+        names.append(name)
+
+    kerning = OrderedDict()
+    for master in font.masters:
+        master_kerning = kerning.setdefault(master.id, OrderedDict())
+        for _ in range(kerning_pairs):
+            left, right = rng.choice(names), rng.choice(names)
+            master_kerning.setdefault(left, OrderedDict())[right] = rng.randint(
+                -200, 200
+            )
+    font.kerning = kerning
+
+    original_section = "glyphs = (\n%s\n);\n" % ",\n".join(
+        _write(glyph) for glyph in font.glyphs
+    )
+    text = glyphsLib.dumps(font)
+    assert original_section in text
+    return text.replace(
+        original_section, "glyphs = (\n%s\n);\n" % ",\n".join(glyph_texts)
+    )
+
+
+def synthetic_font_file(path, glyph_count=2000, kerning_pairs=1000, seed=0):
+    """Write a synthetic .glyphs file to `path` and return its size in bytes."""
+    text = synthetic_font_text(glyph_count, kerning_pairs, seed)
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(text)
+    return os.path.getsize(path)
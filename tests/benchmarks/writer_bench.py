@@ -0,0 +1,117 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Writer throughput benchmarks.
+
+Usage:
+    python -m tests.benchmarks.writer_bench [--glyphs N] [--workers N]
+        [FILE.glyphs ...]
+
+Without files, a synthetic source with N glyphs is generated. Fonts are
+written as loaded, where the nodes of paths are still packed, and again once
+all their nodes are GSNode objects, as after editing them.
+
+With a number of workers, saves in that many processes are compared with
+saves in this one (the default is one per CPU). Incremental saves of fonts
+loaded with their source, where only some of the glyphs were changed, are
+compared with full saves, along with the cost of loading the source (which
+checks once which glyphs can be copied from it).
+"""
+
+import argparse
+import os
+import tempfile
+
+import glyphsLib
+
+from .parser_bench import best_time
+from .synthetic import synthetic_font_text
+
+
+def bench_writer(name, text, repeat, workers):
+    font = glyphsLib.loads(text)
+    size = len(glyphsLib.dumps(font).encode("utf-8")) / 1e6
+    print("{} ({:.1f} MB)".format(name, size))
+
+    def unpack_nodes():
+        for glyph in font.glyphs:
+            for layer in glyph.layers:
+                for path in layer.paths:
+                    len(path.nodes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "font.glyphs")
+        for label in ("dumps", "save", "dumps nodes", "save nodes"):
+            if label == "dumps nodes":
+                unpack_nodes()
+            if label.startswith("dumps"):
+                elapsed = best_time(lambda: glyphsLib.dumps(font), repeat)
+            else:
+                elapsed = best_time(lambda: font.save(path), repeat)
+            print(
+                "  {:<16} {:8.3f} s {:8.2f} MB/s".format(label, elapsed, size / elapsed)
+            )
+        if workers > 1:
+            elapsed = best_time(lambda: font.save(path, workers=workers), repeat)
+            label = "save, {} workers".format(workers)
+            print(
+                "  {:<16} {:8.3f} s {:8.2f} MB/s".format(label, elapsed, size / elapsed)
+            )
+
+
+def bench_incremental(text, repeat):
+    for label, keep_source in (("load", False), ("load, keep source", True)):
+        elapsed = best_time(lambda: glyphsLib.loads(text, keep_source=keep_source), 1)
+        print("  {:<28} {:8.3f} s".format(label, elapsed))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "font.glyphs")
+        for fraction in (0, 0.01, 0.1, 1):
+            font = glyphsLib.loads(text, keep_source=True)
+            glyphs = font.glyphs
+            for i in range(int(len(glyphs) * fraction)):
+                glyphs[i].layers[0].width += 1
+            # The first save is timed on its own, nothing is left to do later.
+            first = best_time(lambda: font.save(path, incremental=True), 1)
+            elapsed = best_time(lambda: font.save(path, incremental=True), repeat)
+            print(
+                "  {:<28} {:8.3f} s {:8.3f} s first".format(
+                    "incremental, {:g}% changed".format(fraction * 100), elapsed, first
+                )
+            )
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", metavar="FILE.glyphs")
+    parser.add_argument("--glyphs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(args)
+
+    if args.files:
+        for path in args.files:
+            with open(path, encoding="utf-8") as fp:
+                text = fp.read()
+            bench_writer(path, text, args.repeat, args.workers)
+            bench_incremental(text, args.repeat)
+    else:
+        text = synthetic_font_text(glyph_count=args.glyphs)
+        bench_writer(
+            "synthetic, %d glyphs" % args.glyphs, text, args.repeat, args.workers
+        )
+        bench_incremental(text, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
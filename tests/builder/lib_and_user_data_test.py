@@ -169,7 +169,7 @@ def test_ufo_data_into_font_master_user_data(tmpdir):
         "org.customTool/ufoData.bin": BinaryData(data)
     }
 
-    ufo, = to_ufos(font)
+    (ufo,) = to_ufos(font)
 
     assert ufo.data[filename] == data
 
@@ -191,7 +191,7 @@ def test_layer_lib_into_font_user_data():
         "layerLibKey2": "layerLibValue2"
     }
 
-    ufo, = to_ufos(font)
+    (ufo,) = to_ufos(font)
 
     assert ufo.layers["public.default"].lib["layerLibKey1"] == "layerLibValue1"
     assert "layerLibKey1" not in ufo.layers["sketches"].lib
@@ -209,7 +209,7 @@ def test_glyph_user_data_into_ufo_lib():
     layer.layerId = font.masters[0].id
     glyph.layers.append(layer)
 
-    ufo, = to_ufos(font)
+    (ufo,) = to_ufos(font)
 
     assert ufo.lib[GLYPHLIB_PREFIX + "glyphUserData.a"] == {
         "glyphUserDataKey": "glyphUserDataValue"
@@ -252,7 +252,7 @@ def test_glif_lib_equivalent_to_layer_user_data():
     assert "glifLibKeyB" not in default_layer.userData.keys()
     assert middleground.userData["glifLibKeyB"] == "glifLibValueB"
 
-    ufo, = to_ufos(font)
+    (ufo,) = to_ufos(font)
 
     assert ufo["a"].lib["glifLibKeyA"] == "glifLibValueA"
     assert "glifLibKeyA" not in ufo.layers["middleground"]["a"]
@@ -282,7 +282,7 @@ def test_node_user_data_into_glif_lib():
     path.nodes.append(classes.GSNode())
     path.nodes.append(node2)
 
-    ufo, = to_ufos(font, minimize_glyphs_diffs=True)
+    (ufo,) = to_ufos(font, minimize_glyphs_diffs=True)
 
     assert ufo["a"].lib[GLYPHLIB_PREFIX + "nodeUserData.0.1"] == {
         "nodeUserDataKey1": "nodeUserDataValue1"
@@ -298,6 +298,33 @@ def test_node_user_data_into_glif_lib():
     assert path.nodes[4].userData["nodeUserDataKey2"] == "nodeUserDataValue2"
 
 
+def test_node_names_and_user_data_roundtrip():
+    # Nodes loaded from a file, whose user data is kept in the columns of
+    # their path, and nodes of closed paths, which start elsewhere in UFOs.
+    path = os.path.join(
+        os.path.dirname(__file__), "..", "data", "GlyphsUnitTestSans.glyphs"
+    )
+    font = classes.GSFont(path)
+    layer = font.glyphs["a"].layers[0]
+    nodes = layer.paths[0].nodes
+    nodes[0].name = "first"
+    nodes[-1].name = "last"
+    nodes[-1].userData["key"] = "value"
+    nodes[2].userData["other"] = [1, 2]
+    expected = [
+        [(node.name, dict(node.userData)) for node in path.nodes]
+        for path in layer.paths
+    ]
+
+    font = to_glyphs(to_ufos(font))
+
+    layer = font.glyphs["a"].layers[0]
+    assert [
+        [(node.name, dict(node.userData)) for node in path.nodes]
+        for path in layer.paths
+    ] == expected
+
+
 def test_lib_data_types(tmpdir):
     # Test the roundtrip of a few basic types both at the top level and in a
     # nested object.
@@ -328,7 +355,7 @@ def test_lib_data_types(tmpdir):
     # font.save(filename)
     # font = classes.GSFont(filename)
 
-    ufo, = to_ufos(font)
+    (ufo,) = to_ufos(font)
 
     for index, (key, value) in enumerate(data.items()):
         assert value == ufo["a"].lib[key]
@@ -0,0 +1,141 @@
+# Copyright 2019 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import glyphsLib
+from glyphsLib.cache import FontCache
+
+FILENAME = os.path.join(os.path.dirname(__file__), "data/GlyphsUnitTestSans.glyphs")
+
+
+class FontCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(FILENAME, encoding="utf-8") as fp:
+            self.text = fp.read()
+        self.expected = glyphsLib.dumps(glyphsLib.loads(self.text))
+        self.parsed = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def parse(self):
+        self.parsed += 1
+        return glyphsLib.loads(self.text)
+
+    def entries(self):
+        return sorted(os.listdir(self.directory))
+
+    def test_load(self):
+        cache = FontCache(self.directory)
+        font = cache.load(self.text, self.parse)
+        self.assertEqual(self.parsed, 1)
+        self.assertEqual(len(self.entries()), 1)
+        cached = cache.load(self.text, self.parse)
+        self.assertEqual(self.parsed, 1)
+        self.assertIsNot(cached, font)
+        self.assertEqual(glyphsLib.dumps(cached), self.expected)
+        self.assertIs(cached.glyphs["A"].parent, cached)
+        self.assertIs(cached.masters[0].font, cached)
+
+    def test_key(self):
+        cache = FontCache(self.directory)
+        key = cache.key(self.text)
+        self.assertEqual(key, cache.key(self.text.encode("utf-8")))
+        self.assertNotEqual(key, cache.key(self.text + " "))
+        self.assertNotEqual(key, cache.key(self.text, option=True))
+        with mock.patch.object(glyphsLib, "__version__", "0.0.0+other"):
+            self.assertNotEqual(key, cache.key(self.text))
+
+    def test_corrupt_entries(self):
+        cache = FontCache(self.directory)
+        cache.load(self.text, self.parse)
+        (name,) = self.entries()
+        path = os.path.join(self.directory, name)
+        with open(path, "rb") as fp:
+            data = fp.read()
+        for corrupt in (data[: len(data) // 2], b"garbage", data[:-1] + b"\0"):
+            with open(path, "wb") as fp:
+                fp.write(corrupt)
+            with self.assertLogs("glyphsLib.cache", "WARNING"):
+                font = cache.load(self.text, self.parse)
+            self.assertEqual(glyphsLib.dumps(font), self.expected)
+            with open(path, "rb") as fp:
+                self.assertEqual(fp.read(), data)
+        self.assertEqual(self.parsed, 4)
+
+    def test_eviction(self):
+        cache = FontCache(self.directory)
+        texts = [self.text.replace("Glyphs Unit Test Sans", str(i)) for i in range(3)]
+        for i, text in enumerate(texts):
+            cache.put(cache.key(text), glyphsLib.loads(text))
+            path = cache.path(cache.key(text))
+            os.utime(path, (i, i))
+        size = os.path.getsize(path)
+        # Using an entry makes it the most recently used one.
+        self.assertIsNotNone(cache.get(cache.key(texts[0])))
+
+        cache.max_size = 2 * size
+        cache.evict()
+        self.assertIsNone(cache.get(cache.key(texts[1])))
+        self.assertIsNotNone(cache.get(cache.key(texts[0])))
+        self.assertIsNotNone(cache.get(cache.key(texts[2])))
+
+        cache.max_size = 0
+        cache.evict()
+        self.assertEqual(self.entries(), [])
+
+    def test_loads_with_cache_dir(self):
+        for _ in range(2):
+            font = glyphsLib.loads(self.text, cache_dir=self.directory)
+            self.assertEqual(glyphsLib.dumps(font), self.expected)
+        self.assertEqual(len(self.entries()), 1)
+        with self.assertRaises(ValueError):
+            glyphsLib.loads(self.text, lazy=True, cache_dir=self.directory)
+
+    def test_loads_filtered_with_cache_dir(self):
+        font = glyphsLib.loads(self.text, cache_dir=self.directory)
+        master_id = font.masters[0].id
+        for _ in range(2):
+            font = glyphsLib.loads(
+                self.text,
+                cache_dir=self.directory,
+                glyph_filter=["a", "n"],
+                master_ids=[master_id],
+            )
+            self.assertEqual([g.name for g in font.glyphs], ["a", "n"])
+            self.assertEqual([m.id for m in font.masters], [master_id])
+        self.assertEqual(len(self.entries()), 2)
+        with self.assertRaises(ValueError):
+            glyphsLib.loads(
+                self.text, cache_dir=self.directory, glyph_filter=lambda name: True
+            )
+
+    def test_load_with_cache_dir(self):
+        for _ in range(2):
+            with open(FILENAME, encoding="utf-8") as fp:
+                font = glyphsLib.load(fp, cache_dir=self.directory)
+                self.assertEqual(fp.read(), "")
+            self.assertEqual(glyphsLib.dumps(font), self.expected)
+        self.assertEqual(len(self.entries()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,9 +17,13 @@
 import os
 import datetime
 import copy
+import pickle
 import unittest
+from unittest import mock
 import pytest
 
+import glyphsLib
+
 from glyphsLib.classes import (
     GSFont,
     GSFontMaster,
@@ -37,8 +41,10 @@ from glyphsLib.classes import (
     GSGuideLine,
     GSHint,
     GSNode,
+    GSPath,
     GSSmartComponentAxis,
     GSBackgroundImage,
+    GSBackgroundLayer,
     LayerComponentsProxy,
     LayerGuideLinesProxy,
     STEM,
@@ -48,7 +54,9 @@ from glyphsLib.classes import (
     PLUS,
     MINUS,
 )
+from glyphsLib.parser import content_hashes
 from glyphsLib.types import Point, Transform, Rect
+from glyphsLib.writer import content_hash
 
 
 TESTFILE_PATH = os.path.join(
@@ -1422,6 +1430,37 @@ class GSComponentFromFileTest(GSObjectsTestCase):
         self.assertEqual(round(bounds.size.width * 10), round(317.9 * 10))
         self.assertEqual(round(bounds.size.height * 10), round(539 * 10))
 
+    def test_rotatedBounds(self):
+        # Rotated by 90 degrees
+        self.component.transform = Transform(0, 1, -1, 0, 0, 0)
+        bounds = self.component.bounds
+        self.assertEqual((bounds.origin.x, bounds.origin.y), (-480, 80))
+        self.assertEqual((bounds.size.width, bounds.size.height), (490, 289))
+        self.assertEqual(self.component.applyTransformation(100, 10), (-10, 100))
+
+    def test_boundsAfterChanges(self):
+        bounds = self.layer.bounds
+        self.assertIs(self.layer._boundsEntry(), self.layer._boundsEntry())
+        self.assertEqual(bounds.origin.x, 80)
+        # A node of the component glyph moved
+        path = self.font.glyphs["a"].layers[self.layer.layerId].paths[0]
+        for node in path.nodes:
+            node.position = Point(node.position.x - 10, node.position.y)
+        self.assertEqual(self.layer.bounds.origin.x, 70)
+        # A component moved
+        self.component.position = Point(-5, 0)
+        self.assertEqual(self.layer.bounds.origin.x, 65)
+        # A path removed
+        del self.font.glyphs["a"].layers[self.layer.layerId].paths[0]
+        self.assertEqual(self.layer.bounds, self.layer.components[1].bounds)
+
+    def test_compute_bounds(self):
+        for master in self.font.masters:
+            bounds = self.font.compute_bounds(master.id)
+            self.assertEqual(list(bounds), [glyph.name for glyph in self.font.glyphs])
+            for glyph in self.font.glyphs:
+                self.assertEqual(bounds[glyph.name], glyph.layers[master.id].bounds)
+
     # def test_automaticAlignment(self):
     #     self.assertBool(self.component.automaticAlignment)
 
@@ -1448,6 +1487,190 @@ class GSGuideLineTest(unittest.TestCase):
         self.assertEqual(repr(guide), "<GSGuideLine x=0.0 y=0.0 angle=0.0>")
 
 
+class CompactObjectsTest(unittest.TestCase):
+    def test_no_dict(self):
+        for obj in (
+            GSNode(),
+            GSAnchor(),
+            GSComponent("A"),
+            GSHint(),
+            GSGuideLine(),
+            Point(1, 2),
+            Rect(),
+            Transform(1, 0, 0, 1, 0, 0),
+        ):
+            self.assertFalse(hasattr(obj, "__dict__"), obj)
+
+    def test_defaults(self):
+        hint = GSHint()
+        self.assertEqual(hint.stem, -2)
+        self.assertEqual(hint.type, "")
+        self.assertIsNone(hint.origin)
+        self.assertIsNone(hint.parent)
+        self.assertEqual(GSComponent("A").alignment, 0)
+        self.assertEqual(GSGuideLine().angle, 0)
+        with self.assertRaises(AttributeError):
+            GSAnchor().foo = 1
+        with self.assertRaises(AttributeError):
+            GSAnchor().foo
+
+    def test_mutable_defaults_are_not_shared(self):
+        anchor = GSAnchor()
+        anchor.position.x = 10
+        self.assertEqual(anchor.position, Point(10, 0))
+        self.assertEqual(GSAnchor().position, Point(0, 0))
+        component = GSComponent("A")
+        component.position = (10, 20)
+        component.smartComponentValues["crotchDepth"] = -77
+        other = GSComponent("B")
+        self.assertEqual(other.transform, Transform(1, 0, 0, 1, 0, 0))
+        self.assertEqual(other.smartComponentValues, {})
+
+    def test_copy_and_pickle(self):
+        component = GSComponent("A", offset=(10, 20))
+        component.anchor = "top"
+        for other in (copy.deepcopy(component), pickle.loads(pickle.dumps(component))):
+            self.assertEqual(other.name, "A")
+            self.assertEqual(other.anchor, "top")
+            self.assertEqual(other.transform, component.transform)
+            self.assertEqual(other.alignment, 0)
+
+
+class InitialValuesTest(unittest.TestCase):
+    def test_initial_values(self):
+        glyph = GSGlyph()
+        self.assertIsNone(glyph.category)
+        self.assertIsNone(glyph.leftKerningGroup)
+        self.assertEqual(list(glyph.layers), [])
+        layer = GSLayer()
+        self.assertEqual(layer.width, 600)
+        self.assertEqual(layer.layerId, "")
+        self.assertEqual(layer.associatedMasterId, "")
+        self.assertEqual(GSFontMaster().xHeight, 500)
+        self.assertEqual(GSFont().upm, 1000)
+        self.assertEqual(GSBackgroundLayer().width, 600)
+
+    def test_mutable_values_are_not_shared(self):
+        annotation = GSAnnotation()
+        annotation.position.x = 10
+        self.assertEqual(GSAnnotation().position, Point(0, 0))
+        instance = GSInstance()
+        instance.instanceInterpolations["m01"] = 1
+        self.assertEqual(GSInstance().instanceInterpolations, {})
+        image = GSBackgroundImage()
+        self.assertIsNot(image.crop, GSBackgroundImage().crop)
+
+
+class CachedProxiesTest(GSObjectsTestCase):
+    def test_same_proxy(self):
+        glyph = self.font.glyphs["a"]
+        layer = glyph.layers[0]
+        path = layer.paths[0]
+        self.assertIs(self.font.glyphs, self.font.glyphs)
+        self.assertIs(glyph.layers, glyph.layers)
+        self.assertIs(layer.paths, layer.paths)
+        self.assertIs(path.nodes, path.nodes)
+        master = self.font.masters[0]
+        for obj, name in (
+            (self.font, "classes"),
+            (self.font, "customParameters"),
+            (self.font, "userData"),
+            (master, "customParameters"),
+            (master, "userData"),
+            (glyph, "userData"),
+            (layer, "userData"),
+        ):
+            self.assertIs(getattr(obj, name), getattr(obj, name))
+        paths = layer.paths
+        layer.paths = [path]
+        self.assertEqual(len(paths), 1)
+        self.assertIs(paths[0], path)
+
+    def test_copies(self):
+        layer = self.font.glyphs["a"].layers[0]
+        path = layer.paths[0]
+        path.nodes
+        for copied in (copy.copy(layer), copy.deepcopy(layer)):
+            self.assertIs(copied.paths._owner, copied)
+        master = self.font.masters[0]
+        master.customParameters
+        for copied in (copy.copy(master), copy.deepcopy(master)):
+            self.assertIs(copied.customParameters._owner, copied)
+        pathCopy = copy.deepcopy(path)
+        self.assertIs(pathCopy.nodes._owner, pathCopy)
+        self.assertEqual(len(pathCopy.nodes), len(path.nodes))
+        self.assertNotIn("_glyphsProxy", self.font.__getstate__())
+        font = pickle.loads(pickle.dumps(self.font))
+        self.assertIs(font.glyphs._owner, font)
+        self.assertEqual(
+            [g.name for g in font.glyphs], [g.name for g in self.font.glyphs]
+        )
+
+    def test_node_name(self):
+        node = GSNode()
+        self.assertIsNone(node.name)
+        node.name = "top"
+        self.assertEqual(node.userData["name"], "top")
+        node.name = None
+        self.assertIsNone(node.name)
+        self.assertEqual(dict(node._userData), {})
+
+
+class MasterIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.font = GSFont()
+        for _ in range(3):
+            self.font.masters.append(GSFontMaster())
+        self.glyph = GSGlyph("a")
+        self.font.glyphs.append(self.glyph)
+        for master in reversed(self.font.masters):
+            layer = GSLayer()
+            layer.layerId = layer.associatedMasterId = master.id
+            self.glyph.layers.append(layer)
+        self.brace = GSLayer()
+        self.brace.associatedMasterId = self.font.masters[0].id
+        self.glyph.layers.append(self.brace)
+
+    def test_master_for_id(self):
+        font = self.font
+        master = font.masters[1]
+        self.assertIs(font.masterForId(master.id), master)
+        self.assertIs(font.masters[master.id], master)
+        self.assertIsNone(font.masterForId("missing"))
+        oldId = master.id
+        master.id = "NEW"
+        self.assertIsNone(font.masterForId(oldId))
+        self.assertIs(font.masterForId("NEW"), master)
+        other = GSFontMaster()
+        font.masters.insert(0, other)
+        self.assertIs(font.masterForId(other.id), other)
+        font.masters.remove(other)
+        self.assertIsNone(font.masterForId(other.id))
+        self.assertNotIn("_masterIndex", font.__getstate__())
+
+    def test_ordered_layers(self):
+        glyph = self.glyph
+        masterLayers = [glyph.layers[m.id] for m in self.font.masters]
+        self.assertEqual(list(glyph.layers), masterLayers + [self.brace])
+        self.assertEqual(list(glyph.layers), masterLayers + [self.brace])
+        # The order follows the masters.
+        self.font.masters = list(reversed(self.font.masters))
+        self.assertEqual(
+            list(glyph.layers), list(reversed(masterLayers)) + [self.brace]
+        )
+        # A layer that stops being a master layer goes after them.
+        masterLayers[0].associatedMasterId = self.font.masters[0].id
+        self.assertEqual(
+            list(glyph.layers),
+            [masterLayers[2], masterLayers[1], masterLayers[0], self.brace],
+        )
+        del glyph.layers[self.brace.layerId]
+        self.assertEqual(len(list(glyph.layers)), 3)
+        state = glyph.__getstate__()
+        self.assertNotIn("_layerOrder", state)
+        self.assertNotIn("_verifiedMasters", state)
+
+
 class GSAnchorFromFileTest(GSObjectsTestCase):
     def setUp(self):
         super().setUp()
@@ -1547,6 +1770,154 @@ class GSPathFromFileTest(GSObjectsTestCase):
         self.assertEqual(bounds.size.height, 490)
 
 
+class PathNodesTest(unittest.TestCase):
+    def make_path(self, count=4):
+        path = GSPath()
+        path.nodes = [GSNode((i, -i)) for i in range(count)]
+        return path
+
+    def test_views(self):
+        path = self.make_path()
+        node = path.nodes[1]
+        self.assertIs(path.nodes[1], node)
+        self.assertIs(path.nodes[-3], node)
+        self.assertEqual(list(path.nodes)[1:3], path.nodes[1:3])
+        node.position.x = 10
+        node.position[1] = 20
+        node.type = GSNode.CURVE
+        node.smooth = True
+        node.name = "name"
+        self.assertEqual(path._nodes.coordinates(1), (10, 20))
+        self.assertEqual(path._nodes.type(1), GSNode.CURVE)
+        node.type = "unknown"
+        self.assertEqual(path.nodes[1].type, "unknown")
+        self.assertEqual(path.nodes[1].name, "name")
+        with self.assertRaises(IndexError):
+            path.nodes[4]
+
+    def test_insert_and_delete(self):
+        path = self.make_path()
+        nodes = list(path.nodes)
+        nodes[2].name = "third"
+        path.nodes.insert(1, GSNode((5, 5)))
+        self.assertEqual([n.index for n in nodes], [0, 2, 3, 4])
+        self.assertEqual(path.nodes[3].name, "third")
+        del path.nodes[0]
+        self.assertEqual([n.index for n in nodes[1:]], [1, 2, 3])
+        self.assertEqual(path.nodes[2].name, "third")
+
+        removed = nodes[0]
+        self.assertIsNone(removed.parent)
+        self.assertNotIn(removed, path.nodes)
+        self.assertEqual(removed.position, Point(0, 0))
+        with self.assertRaises(ValueError):
+            path.nodes.index(removed)
+        path.nodes.append(removed)
+        self.assertIs(path.nodes[-1], removed)
+        self.assertEqual(removed.index, 4)
+
+    def test_move_between_paths(self):
+        path = self.make_path()
+        other = self.make_path(1)
+        node = path.nodes[3]
+        node.name = "moved"
+        other.nodes.append(node)
+        # The node object itself is moved
+        self.assertIs(other.nodes[-1], node)
+        self.assertEqual(node.index, 1)
+        self.assertEqual(len(path.nodes), 4)
+        self.assertIsNot(path.nodes[3], node)
+        self.assertIs(node.parent, other)
+        # The path keeps a copy of the node
+        node.name = "changed"
+        self.assertEqual(path.nodes[3].name, "moved")
+        self.assertEqual(other.nodes[1].name, "changed")
+
+        first = path.nodes[0]
+        other.nodes.insert(0, first)
+        self.assertIs(other.nodes[0], first)
+        self.assertIs(other.nodes[2], node)
+        self.assertEqual([n.index for n in other.nodes], [0, 1, 2])
+
+    def test_copy(self):
+        path = self.make_path()
+        node = copy.copy(path.nodes[2])
+        self.assertIsNone(node.parent)
+        self.assertEqual(node.position, Point(2, -2))
+        pathCopy = copy.deepcopy(path)
+        pathCopy.nodes[2].position = Point(7, 7)
+        self.assertEqual(path.nodes[2].position, Point(2, -2))
+        self.assertIs(pathCopy.nodes[2].parent, pathCopy)
+        self.assertEqual(
+            [n.plistValue() for n in pickle.loads(pickle.dumps(path)).nodes],
+            [n.plistValue() for n in path.nodes],
+        )
+
+    def test_shallow_copy(self):
+        path = self.make_path()
+        path.nodes[1].name = "top"
+        nodes = list(path.nodes)
+        pathCopy = copy.copy(path)
+        self.assertEqual(
+            [n.plistValue() for n in pathCopy.nodes], [n.plistValue() for n in nodes]
+        )
+        self.assertIs(pathCopy.nodes[0].parent, pathCopy)
+        self.assertIs(pathCopy.nodes._owner, pathCopy)
+        pathCopy.nodes = [GSNode((9, 9))]
+        pathCopy.nodes[0].position = Point(8, 8)
+        self.assertEqual(path.nodes[:], nodes)
+        self.assertEqual(path.nodes[3].position, Point(3, -3))
+        self.assertEqual(path.nodes[1].name, "top")
+        self.assertIs(nodes[0].parent, path)
+        self.assertEqual(pathCopy.bounds, Rect(Point(8, 8), Point(0, 0)))
+
+    def test_topology(self):
+        path = self.make_path()
+        nodes = list(path.nodes)
+        self.assertIs(nodes[3].nextNode, nodes[0])
+        self.assertIs(nodes[0].prevNode, nodes[3])
+        nodes[2].makeNodeFirst()
+        self.assertEqual([n.index for n in nodes], [2, 3, 0, 1])
+        self.assertEqual(path.nodes[:], nodes[2:] + nodes[:2])
+        self.assertIs(nodes[1].nextNode, nodes[2])
+        self.assertEqual(path.nodes[0].position, Point(2, -2))
+        path.reverse()
+        self.assertEqual([path.nodes.index(n) for n in path.nodes], [0, 1, 2, 3])
+        self.assertEqual(path.nodes[:], [nodes[0], nodes[3], nodes[2], nodes[1]])
+
+    def test_hint_nodes(self):
+        layer = GSLayer()
+        layer.paths.append(self.make_path())
+        hint = GSHint()
+        layer.hints.append(hint)
+        hint.originNode = layer.paths[0].nodes[1]
+        self.assertEqual(hint.origin, Point(0, 1))
+        layer.paths.insert(0, self.make_path(2))
+        layer.paths[1].nodes.insert(0, GSNode())
+        self.assertEqual(hint.origin, Point(1, 2))
+        hint.origin = Point(1, 2)
+        self.assertIs(hint.originNode, layer.paths[1].nodes[2])
+        self.assertEqual(hint.originNode.position, Point(1, -1))
+
+    def test_bounds(self):
+        path = self.make_path()
+        self.assertEqual(path.bounds, Rect(Point(0, -3), Point(3, 3)))
+        self.assertIs(path._nodes.bounds(), path._nodes.bounds())
+        path.nodes[1].position.y = 5
+        self.assertEqual(path.bounds, Rect(Point(0, -3), Point(3, 8)))
+        path.nodes.insert(0, GSNode((-1, 0)))
+        self.assertEqual(path.bounds, Rect(Point(-1, -3), Point(4, 8)))
+        path.nodes = []
+        self.assertIsNone(path.bounds)
+
+    def test_direction(self):
+        path = self.make_path(0)
+        path.nodes = [GSNode((0, 0)), GSNode((0, 10)), GSNode((10, 10))]
+        self.assertEqual(path.direction, 1)
+        path.reverse()
+        self.assertEqual(path.direction, -1)
+
+
 class GSNodeFromFileTest(GSObjectsTestCase):
     def setUp(self):
         super().setUp()
@@ -1706,6 +2077,182 @@ class FontGlyphsProxyTest(unittest.TestCase):
         with pytest.raises(KeyError):
             del self.font.glyphs[self.font]
 
+    def test_lookup_after_changes(self):
+        font = GSFont()
+        glyphs = font.glyphs
+        a = GSGlyph("a")
+        a.unicode = "0061"
+        glyphs.append(a)
+        self.assertIs(glyphs["a"], a)
+        self.assertIs(glyphs["0061"], a)
+        self.assertIs(glyphs["A"], None)
+
+        b = GSGlyph("b")
+        glyphs.extend([b])
+        b.unicodes = ["0062", "00FE"]
+        self.assertIs(glyphs["b"], b)
+        self.assertIs(glyphs["B"], None)
+        self.assertIs(glyphs["0062"], b)
+        # Only the first unicode of a glyph is looked up.
+        self.assertIs(glyphs["þ"], None)
+
+        b.name = "bee"
+        self.assertIs(glyphs["bee"], b)
+        b.name = "b.alt"
+        self.assertIs(glyphs["b.alt"], b)
+        self.assertNotIn("bee", glyphs)
+        b.unicode = "0061"
+        # The first glyph with a unicode is found.
+        self.assertIs(glyphs["a"], a)
+        self.assertIs(glyphs["0061"], a)
+        self.assertNotIn("0062", glyphs)
+        a.unicode = None
+        self.assertIs(glyphs["0061"], b)
+
+        c = GSGlyph("c")
+        glyphs[0] = c
+        self.assertIs(glyphs["c"], c)
+        # No glyph is named "a" any more, but "a" is the character of b.
+        self.assertIs(glyphs["a"], b)
+        del glyphs["b.alt"]
+        self.assertNotIn("0061", glyphs)
+        font.glyphs = [a, GSGlyph("a")]
+        self.assertIs(font.glyphs["a"], a)
+        a.name = "A"
+        self.assertIsNot(font.glyphs["a"], a)
+        self.assertIs(font.glyphs["A"], a)
+
+    def test_unicodes_changed_in_place(self):
+        font = GSFont()
+        a, b = GSGlyph("a"), GSGlyph("b")
+        font.glyphs = [a, b]
+        a.unicodes = ["0061"]
+        b.unicodes = ["0062"]
+        glyphs = font.glyphs
+        self.assertIs(glyphs["0061"], a)
+        edits = [
+            ("append", lambda u: u.append("0063"), [], "0063"),
+            ("insert", lambda u: u.insert(0, "0063"), ["0062"], "0063"),
+            ("setitem", lambda u: u.__setitem__(0, "0063"), ["0062"], "0063"),
+            ("delitem", lambda u: u.__delitem__(0), ["0062", "0063"], "0063"),
+            ("remove", lambda u: u.remove("0062"), ["0062", "0063"], "0063"),
+            ("clear", lambda u: u.clear(), ["0063"], None),
+        ]
+        for name, edit, before, after in edits:
+            with self.subTest(name):
+                b.unicodes = before
+                self.assertIs(glyphs["0063"], b if before[:1] == ["0063"] else None)
+                edit(b.unicodes)
+                self.assertIs(glyphs["0063"], None if after is None else b)
+                self.assertIs(glyphs["0061"], a)
+                self.assertEqual(b.unicode, after)
+        # The first glyph with the unicode is found.
+        b.unicodes = ["0062"]
+        b.unicodes[0] = "0061"
+        self.assertIs(glyphs["0061"], a)
+        a.unicodes.clear()
+        self.assertIs(glyphs["0061"], b)
+
+    def test_unicodes_of_copies(self):
+        font = GSFont(TESTFILE_PATH)
+        glyph = font.glyphs["A"]
+        copied = copy.deepcopy(glyph)
+        copied.unicodes[0] = "0042"
+        self.assertIs(font.glyphs["0041"], glyph)
+        unicodes = pickle.loads(pickle.dumps(glyph.unicodes))
+        unicodes.append("0042")
+        self.assertEqual(glyph.unicodes, ["0041"])
+
+    def test_unicodes_of_lazy_glyphs_changed_in_place(self):
+        font = GSFont(TESTFILE_PATH, lazy=True)
+        glyph = font.glyphs["A"]
+        unicodes = glyph.unicodes
+        unicodes[0] = "0391"
+        self.assertIs(type(glyph), GSGlyph)
+        self.assertIs(font.glyphs["0391"], glyph)
+        self.assertIsNone(font.glyphs["0041"])
+        self.assertIs(glyph.unicodes, unicodes)
+        self.assertIn("unicode = 0391;", glyphsLib.dumps(font))
+
+    def test_lookup_does_not_parse_lazy_glyphs(self):
+        font = GSFont(TESTFILE_PATH, lazy=True)
+        glyph = font.glyphs["adieresis"]
+        self.assertIs(font.glyphs["ä"], glyph)
+        self.assertIs(font.glyphs["00E4"], glyph)
+        self.assertIsInstance(glyph, glyphsLib.classes.GSLazyGlyph)
+
+
+class ContentHashTest(unittest.TestCase):
+    def setUp(self):
+        with open(TESTFILE_PATH, encoding="utf-8") as fp:
+            self.text = fp.read()
+        self.font = glyphsLib.loads(self.text)
+        self.master_id = self.font.masters[0].id
+
+    def test_content_hash(self):
+        glyph = self.font.glyphs["A"]
+        digest = glyph.content_hash()
+        self.assertRegex(digest, "^[0-9a-f]{32}$")
+        self.assertEqual(digest, content_hash(glyph))
+        self.assertNotEqual(digest, self.font.glyphs["a"].content_hash())
+        layer = glyph.layers[self.master_id]
+        self.assertEqual(glyph.content_hash(self.master_id), layer.content_hash())
+        self.assertIsNone(glyph.content_hash("unknown"))
+
+    def test_same_content_same_hash(self):
+        other = glyphsLib.loads(self.text)
+        self.assertEqual(self.font.content_hashes(), other.content_hashes())
+        copied = copy.deepcopy(self.font.glyphs["A"])
+        self.assertEqual(copied.content_hash(), self.font.glyphs["A"].content_hash())
+
+    def test_memoized_until_changed(self):
+        # Only the glyphs of fonts loaded with their source are tracked.
+        font = glyphsLib.loads(self.text, keep_source=True)
+        hashes = font.content_hashes()
+        self.assertEqual(hashes, self.font.content_hashes())
+        glyph = font.glyphs["A"]
+        digest = glyph.content_hash()
+        layer_digest = glyph.content_hash(self.master_id)
+        with mock.patch("glyphsLib.classes.content_hash") as hasher:
+            self.assertEqual(glyph.content_hash(), digest)
+            self.assertEqual(glyph.content_hash(self.master_id), layer_digest)
+            self.assertEqual(font.content_hashes(), hashes)
+            hasher.assert_not_called()
+        glyph.layers[self.master_id].anchors[0].position = Point(1, 2)
+        self.assertNotEqual(glyph.content_hash(), digest)
+        self.assertNotEqual(glyph.content_hash(self.master_id), layer_digest)
+
+    def test_changes(self):
+        hashes = self.font.content_hashes()
+        master_hashes = self.font.content_hashes(self.master_id)
+        self.font.glyphs["a"].layers[self.master_id].paths[0].nodes[0].position = Point(
+            1, 2
+        )
+        self.font.glyphs["n"].layers[1].width = 1000
+        changed = self.font.content_hashes()
+        self.assertEqual([n for n in hashes if hashes[n] != changed[n]], ["a", "n"])
+        changed = self.font.content_hashes(self.master_id)
+        self.assertEqual([n for n in hashes if master_hashes[n] != changed[n]], ["a"])
+
+    def test_from_source(self):
+        for master_id in (None, self.master_id, "unknown"):
+            expected = self.font.content_hashes(master_id)
+            self.assertEqual(content_hashes(self.text, master_id), expected)
+            data = self.text.encode("utf-8")
+            self.assertEqual(content_hashes(data, master_id), expected)
+
+    def test_from_non_canonical_source(self):
+        # The glyphs are hashed as they would be written, not as they are.
+        path = os.path.join(os.path.dirname(__file__), "data", "IntegerFloat.glyphs")
+        with open(path, encoding="utf-8") as fp:
+            text = fp.read()
+        font = glyphsLib.loads(text)
+        self.assertNotEqual(glyphsLib.dumps(font), text)
+        for master_id in (None, font.masters[0].id):
+            expected = font.content_hashes(master_id)
+            self.assertEqual(content_hashes(text, master_id), expected)
+            self.assertEqual(content_hashes(glyphsLib.dumps(font), master_id), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -14,14 +14,30 @@
 # limitations under the License.
 
 
+import json
+import mmap
 import os
+import shutil
+import tempfile
 from collections import OrderedDict
+from io import BytesIO, StringIO
+from textwrap import dedent
 import unittest
+from unittest import mock
 import datetime
 
 import glyphsLib
-from glyphsLib.parser import Parser
-from glyphsLib.classes import GSGlyph
+from glyphsLib.parser import Parser, iterparse, main, map_file
+from glyphsLib.classes import (
+    GSCustomParameter,
+    GSFont,
+    GSGlyph,
+    GSLazyGlyph,
+    GSNode,
+    GSPath,
+)
+from glyphsLib.writer import dumps
+from glyphsLib.types import Point
 
 GLYPH_DATA = """\
 (
@@ -38,8 +54,10 @@ unicode = 0041;
 
 
 class ParserTest(unittest.TestCase):
+    engine = "tokenizer"
+
     def run_test(self, text, expected):
-        parser = Parser()
+        parser = Parser(engine=self.engine)
         self.assertEqual(parser.parse(text), OrderedDict(expected))
 
     def test_parse(self):
@@ -115,6 +133,559 @@ class ParserTest(unittest.TestCase):
     def test_parse_float_as_float(self):
         self.run_test(b"{noodleThickness = 106.1;}", [("noodleThickness", 106.1)])
 
+    def test_whitespace_around_delimiters(self):
+        self.run_test(
+            b'{ a = 1 ;\n"b"=( "x" ,y ,\n{c=2;} ) ; d=<00ff>;}',
+            [("a", 1), ("b", ["x", "y", OrderedDict([("c", 2)])]), ("d", b"\x00\xff")],
+        )
+
+    def test_escaped_quotes_in_string(self):
+        # A quote preceded by a backslash never ends a string, which the
+        # userData of GSNode relies on.
+        self.run_test(
+            b'{node = "1 2 LINE {a = \\\\"b\\\\";}"; c = (d);}',
+            [("node", '1 2 LINE {a = \\"b\\";}'), ("c", ["d"])],
+        )
+
+    def test_missing_delimiters(self):
+        with self.assertRaises(ValueError):
+            self.run_test("{a=1 b=2;}", [])
+        with self.assertRaises(ValueError):
+            self.run_test("{a=(1 2);}", [])
+        with self.assertRaises(ValueError):
+            self.run_test("{a=(1,);}", [])
+
+
+class RegexEngineParserTest(ParserTest):
+    engine = "regex"
+
+
+class BytesParserTest(ParserTest):
+    def run_test(self, text, expected):
+        if isinstance(text, str):
+            text = text.encode("utf-8")
+        super().run_test(text, expected)
+
+
+class ParserEngineTest(unittest.TestCase):
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            Parser(engine="turbo")
+
+    def test_engines_agree_on_test_files(self):
+        data = os.path.join(os.path.dirname(__file__), "data")
+        for filename in sorted(os.listdir(data)):
+            if not filename.endswith(".glyphs"):
+                continue
+            with open(os.path.join(data, filename), encoding="utf-8") as fp:
+                text = fp.read()
+            written = [
+                glyphsLib.dumps(Parser(GSFont, engine=engine).parse(text))
+                for engine in Parser.ENGINES
+            ]
+            self.assertEqual(written[0], written[1], filename)
+            from_bytes = Parser(GSFont).parse(text.encode("utf-8"))
+            self.assertEqual(glyphsLib.dumps(from_bytes), written[0], filename)
+
+    def test_engines_agree_on_fields(self):
+        glyph = (
+            '{glyphname = A; unicode = 0041; export = 0; lastChange = "2017-04-30 '
+            '13:57:04 +0000"; userData = {a = (1, "2", 3.5);}; unknown = "x";}'
+        )
+        parameter = "{name = foo; value = {a = 1; b = (x, 2);};}"
+        for engine in Parser.ENGINES:
+            parsed = Parser(GSGlyph, engine=engine).parse(glyph)
+            self.assertEqual(parsed.name, "A")
+            self.assertEqual(parsed.unicodes, ["0041"])
+            self.assertIs(parsed.export, False)
+            self.assertEqual(
+                parsed.lastChange, datetime.datetime(2017, 4, 30, 13, 57, 4)
+            )
+            self.assertEqual(dict(parsed.userData), {"a": [1, "2", 3.5]})
+            self.assertEqual(parsed.unknown, "x")
+            parsed = Parser(GSCustomParameter, engine=engine).parse(parameter)
+            self.assertEqual(parsed.value, {"a": 1, "b": ["x", 2]})
+
+
+class IterparseTest(unittest.TestCase):
+    DATA = '{a = 1; b = ("x", 2.5, <00ff>); c = {d = "\u00e9\u2019";};}'
+    EVENTS = [
+        ("start_dict", None),
+        ("key", "a"),
+        ("value", 1),
+        ("key", "b"),
+        ("start_list", None),
+        ("value", "x"),
+        ("value", 2.5),
+        ("value", b"\x00\xff"),
+        ("end_list", None),
+        ("key", "c"),
+        ("start_dict", None),
+        ("key", "d"),
+        ("value", "\u00e9\u2019"),
+        ("end_dict", None),
+        ("end_dict", None),
+    ]
+
+    def test_events(self):
+        self.assertEqual(list(iterparse(StringIO(self.DATA))), self.EVENTS)
+
+    def test_chunk_boundaries(self):
+        # Cut tokens and multi-byte UTF-8 sequences at every possible place
+        for chunk_size in (1, 2, 3, 5):
+            fp = BytesIO(self.DATA.encode("utf-8"))
+            self.assertEqual(list(iterparse(fp, chunk_size=chunk_size)), self.EVENTS)
+
+    def test_events_are_lazy(self):
+        events = iterparse(StringIO("{a = 1; b = @broken;}"))
+        self.assertEqual(next(events), ("start_dict", None))
+        self.assertEqual(next(events), ("key", "a"))
+        self.assertEqual(next(events), ("value", 1))
+        with self.assertRaises(ValueError):
+            list(events)
+
+    def test_errors(self):
+        for data in ("{a = 1}", "{a = (1 2);}", "{a = 1;} trailing", "{a = 1;"):
+            with self.assertRaises(ValueError):
+                list(iterparse(StringIO(data)))
+
+    def test_glyph_events(self):
+        filename = os.path.join(
+            os.path.dirname(__file__), "data/GlyphsUnitTestSans.glyphs"
+        )
+        font = glyphsLib.GSFont(filename)
+        with open(filename, "rb") as fp:
+            events = list(iterparse(fp, glyphs=True, chunk_size=1000))
+
+        glyphs = [value for event, value in events if event == "glyph"]
+        self.assertEqual(len(glyphs), len(font.glyphs))
+        for glyph, expected in zip(glyphs, font.glyphs):
+            self.assertIsInstance(glyph, GSGlyph)
+            self.assertEqual(glyph.name, expected.name)
+            self.assertEqual(glyph.unicode, expected.unicode)
+            self.assertEqual(list(glyph._layers), list(expected._layers))
+        # The glyphs replace the structural events of their entries
+        index = events.index(("key", "glyphs"))
+        self.assertEqual(events[index + 1], ("start_list", None))
+        self.assertEqual(events[index + len(glyphs) + 2], ("end_list", None))
+        self.assertIn(("key", "kerning"), events[index:])
+
+
+class LazyParserTest(unittest.TestCase):
+    def load(self, name, lazy):
+        filename = os.path.join(os.path.dirname(__file__), "data", name)
+        with open(filename, encoding="utf-8") as fp:
+            return glyphsLib.load(fp, lazy=lazy)
+
+    def test_lazy_requires_tokenizer(self):
+        with self.assertRaises(ValueError):
+            Parser(engine="regex", lazy=True)
+
+    def test_lookup_does_not_parse(self):
+        font = self.load("GlyphsUnitTestSans.glyphs", lazy=True)
+        self.assertTrue(all(isinstance(g, GSLazyGlyph) for g in font.glyphs))
+        self.assertEqual(font.glyphs["A"].name, "A")
+        self.assertEqual(font.glyphs["0041"].name, "A")
+        self.assertEqual(font.glyphs["Adieresis"].unicodes, ["00C4"])
+        self.assertIsInstance(font.glyphs["A"], GSLazyGlyph)
+        self.assertIs(font.glyphs["A"].parent, font)
+
+    def test_access_parses_glyph(self):
+        font = self.load("GlyphsUnitTestSans.glyphs", lazy=True)
+        reference = self.load("GlyphsUnitTestSans.glyphs", lazy=False)
+        glyph = font.glyphs["A"]
+        layer = glyph.layers[0]
+        self.assertIs(type(glyph), GSGlyph)
+        self.assertIs(layer.parent, glyph)
+        self.assertEqual(layer.associatedMasterId, font.masters[0].id)
+        self.assertIsInstance(font.glyphs["Adieresis"], GSLazyGlyph)
+        self.assertEqual(dumps(glyph), dumps(reference.glyphs["A"]))
+        self.assertEqual(dumps(font), dumps(reference))
+
+    def test_set_attribute_before_access(self):
+        font = self.load("GlyphsUnitTestSans.glyphs", lazy=True)
+        reference = self.load("GlyphsUnitTestSans.glyphs", lazy=False)
+        for f in (font, reference):
+            f.glyphs["A"].name = "Z"
+            f.glyphs["Adieresis"].color = 5
+        glyph = font.glyphs["Z"]
+        self.assertIs(type(glyph), GSGlyph)
+        self.assertIs(font.glyphs["A"], glyph)  # by its unicode
+        self.assertNotIn("A", [g.name for g in font.glyphs])
+        self.assertEqual(glyph.layers[0].width, 593)
+        self.assertEqual(font.glyphs["Adieresis"].color, 5)
+        self.assertEqual(dumps(font), dumps(reference))
+
+    def test_set_parent_does_not_parse(self):
+        font = self.load("GlyphsUnitTestSans.glyphs", lazy=True)
+        glyph = font.glyphs["A"]
+        del font.glyphs["A"]
+        font.glyphs.append(glyph)
+        self.assertIsInstance(glyph, GSLazyGlyph)
+        self.assertIs(glyph.parent, font)
+
+    def test_write_unparsed_glyphs_verbatim(self):
+        # Not in the canonical format, so a full round trip would change it
+        filename = os.path.join(os.path.dirname(__file__), "data/IntegerFloat.glyphs")
+        with open(filename, encoding="utf-8") as fp:
+            text = fp.read()
+        self.assertEqual(dumps(glyphsLib.loads(text, lazy=True)), text)
+        self.assertNotEqual(dumps(glyphsLib.loads(text)), text)
+
+    def test_font_from_path(self):
+        filename = os.path.join(
+            os.path.dirname(__file__), "data/GlyphsUnitTestSans.glyphs"
+        )
+        font = GSFont(filename, lazy=True)
+        self.assertIsInstance(font.glyphs["A"], GSLazyGlyph)
+        self.assertEqual(font.glyphs["A"].layers[0].width, 593)
+
+
+class MappedLoadTest(unittest.TestCase):
+    filename = os.path.join(os.path.dirname(__file__), "data/GlyphsUnitTestSans.glyphs")
+
+    def setUp(self):
+        with open(self.filename, encoding="utf-8") as fp:
+            self.expected = glyphsLib.dumps(glyphsLib.loads(fp.read()))
+
+    def test_map_file(self):
+        for mode in ("r", "rb"):
+            with open(self.filename, mode) as fp:
+                source = map_file(fp)
+                self.assertIsInstance(source, mmap.mmap)
+                source.close()
+                fp.read(1)
+                self.assertIsNone(map_file(fp))
+        with open(self.filename, encoding="latin-1") as fp:
+            self.assertIsNone(map_file(fp))
+        self.assertIsNone(map_file(StringIO("{}")))
+        self.assertIsNone(map_file(BytesIO(b"{}")))
+
+    def test_load(self):
+        for mode in ("r", "rb"):
+            with open(self.filename, mode) as fp:
+                font = glyphsLib.load(fp)
+                self.assertEqual(fp.read(), "" if mode == "r" else b"")
+            self.assertEqual(glyphsLib.dumps(font), self.expected)
+
+    def test_load_lazy(self):
+        with open(self.filename, "rb") as fp:
+            font = glyphsLib.load(fp, lazy=True)
+        self.assertIsInstance(font.glyphs["A"], GSLazyGlyph)
+        self.assertEqual(font.glyphs["A"].layers[0].width, 593)
+        self.assertEqual(glyphsLib.dumps(font), self.expected)
+
+    def test_font_from_path(self):
+        self.assertEqual(glyphsLib.dumps(GSFont(self.filename)), self.expected)
+
+    def test_save_lazy_font_in_place(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "font.glyphs")
+            shutil.copyfile(self.filename, path)
+            for mode in ("r", "rb"):
+                with open(path, mode) as fp:
+                    font = glyphsLib.load(fp, lazy=True)
+                with open(path, "w", encoding="utf-8") as fp:
+                    glyphsLib.dump(font, fp)
+                with open(path, encoding="utf-8") as fp:
+                    self.assertEqual(fp.read(), self.expected)
+            font = GSFont(path, lazy=True)
+            font.save(path)
+            with open(path, encoding="utf-8") as fp:
+                self.assertEqual(fp.read(), self.expected)
+
+
+class ParallelLoadTest(unittest.TestCase):
+    filename = os.path.join(os.path.dirname(__file__), "data/GlyphsUnitTestSans.glyphs")
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            Parser(engine="regex", workers=2)
+        with self.assertRaises(ValueError):
+            Parser(lazy=True, workers=2)
+        with self.assertRaises(ValueError):
+            Parser(workers=0)
+
+    def test_load(self):
+        expected = GSFont(self.filename)
+        with open(self.filename, encoding="utf-8") as fp:
+            font = glyphsLib.load(fp, workers=2)
+        self.assertEqual(
+            [g.name for g in font.glyphs], [g.name for g in expected.glyphs]
+        )
+        for glyph in font.glyphs:
+            self.assertIs(glyph.parent, font)
+            for layer in glyph.layers:
+                self.assertIs(layer.parent, glyph)
+        self.assertEqual(
+            font.glyphs["A"].layers[0].associatedMasterId, font.masters[0].id
+        )
+        self.assertEqual(glyphsLib.dumps(font), glyphsLib.dumps(expected))
+
+    def test_loads(self):
+        with open(self.filename, encoding="utf-8") as fp:
+            text = fp.read()
+        expected = glyphsLib.dumps(glyphsLib.loads(text))
+        for workers in (1, 3):
+            font = glyphsLib.loads(text, workers=workers)
+            self.assertEqual(glyphsLib.dumps(font), expected)
+        self.assertEqual(len(glyphsLib.loads("{glyphs = ();}", workers=2).glyphs), 0)
+
+    def test_font_from_path(self):
+        font = GSFont(self.filename, workers=2)
+        self.assertEqual(glyphsLib.dumps(font), glyphsLib.dumps(GSFont(self.filename)))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            glyphsLib.loads(
+                "{glyphs = ({glyphname = A;}, {glyphname = @;});}", workers=2
+            )
+
+
+class FilteredLoadTest(unittest.TestCase):
+    filename = os.path.join(os.path.dirname(__file__), "data/GlyphsUnitTestSans.glyphs")
+
+    def setUp(self):
+        self.font = GSFont(self.filename)
+        self.font.setKerningForPair(self.font.masters[1].id, "A", "a", -10)
+        self.font.setKerningForPair(self.font.masters[1].id, "a", "A", -15)
+        self.font.setKerningForPair(self.font.masters[1].id, "a", "h", -20)
+        self.text = dumps(self.font)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            Parser(engine="regex", glyph_filter=["A"])
+        with self.assertRaises(ValueError):
+            glyphsLib.loads(self.text, master_ids=["unknown"])
+
+    def test_glyph_filter(self):
+        for glyph_filter in (["a", "h", "n"], lambda name: name in "ahn"):
+            with self.assertLogs("glyphsLib.parser", "WARNING") as logs:
+                font = glyphsLib.loads(self.text, glyph_filter=glyph_filter)
+            self.assertEqual([g.name for g in font.glyphs], ["a", "h", "n"])
+            self.assertIs(font.glyphs["a"].parent, font)
+            self.assertEqual(len(font.glyphs["a"].layers), 4)
+            self.assertEqual(len(font.masters), 3)
+            self.assertEqual(
+                font.kerning[font.masters[1].id]["a"], OrderedDict([("h", -20)])
+            )
+            self.assertNotIn("A", font.kerning[font.masters[1].id])
+            self.assertEqual(
+                font.kerning[font.masters[0].id], self.font.kerning[font.masters[0].id]
+            )
+            # Each missing component is reported once per glyph
+            self.assertEqual(len(logs.output), 4)
+            self.assertIn("'h' has a component of '_part.stem'", logs.output[0])
+
+    def test_master_ids(self):
+        master_id = self.font.masters[1].id
+        font = glyphsLib.loads(self.text, master_ids=[master_id])
+        self.assertEqual([m.id for m in font.masters], [master_id])
+        self.assertEqual(list(font.kerning), [master_id])
+        self.assertEqual(len(font.glyphs), len(self.font.glyphs))
+        for glyph, expected in zip(font.glyphs, self.font.glyphs):
+            expected_layers = [
+                dumps(layer)
+                for layer in expected.layers
+                if (layer.associatedMasterId or layer.layerId) == master_id
+            ]
+            self.assertEqual([dumps(layer) for layer in glyph.layers], expected_layers)
+        self.assertEqual(len(font.glyphs["a"].layers), 2)
+
+    def test_lazy_and_parallel(self):
+        master_id = self.font.masters[0].id
+        options = dict(glyph_filter=["A", "Adieresis"], master_ids=[master_id])
+        with self.assertLogs("glyphsLib.parser", "WARNING"):
+            expected = dumps(glyphsLib.loads(self.text, **options))
+        font = glyphsLib.loads(self.text, lazy=True, **options)
+        self.assertEqual(dumps(font), expected)
+        with self.assertLogs("glyphsLib.parser", "WARNING"):
+            font = glyphsLib.loads(self.text, workers=2, **options)
+        self.assertEqual(dumps(font), expected)
+
+    def test_load(self):
+        with open(self.filename, encoding="utf-8") as fp:
+            font = glyphsLib.load(fp, glyph_filter="A")
+        self.assertEqual([g.name for g in font.glyphs], ["A"])
+
+
+class ParserStatsTest(unittest.TestCase):
+    filename = os.path.join(os.path.dirname(__file__), "data/GlyphsUnitTestSans.glyphs")
+
+    def setUp(self):
+        with open(self.filename, "rb") as fp:
+            self.data = fp.read()
+
+    def test_report(self):
+        expected = dumps(Parser(GSFont).parse(self.data))
+        for engine in Parser.ENGINES:
+            parser = Parser(GSFont, engine=engine, stats=True)
+            self.assertEqual(dumps(parser.parse(self.data)), expected)
+            report = parser.stats.report()
+            self.assertEqual(report["bytes"], len(self.data))
+            self.assertGreater(report["time"], 0)
+            classes = report["classes"]
+            self.assertEqual(classes["GSFont"]["objects"], 1)
+            self.assertEqual(classes["GSGlyph"]["objects"], 11)
+            self.assertEqual(classes["GSFontMaster"]["objects"], 3)
+            self.assertLessEqual(
+                sum(c["time"] for c in classes.values()), report["time"]
+            )
+            self.assertGreater(sum(report["matches"].values()), 0)
+            self.assertEqual(report["decoders"]["parse_datetime"], 11)
+            json.dumps(report)
+
+    def test_parse_into_object(self):
+        parser = Parser(GSFont, stats=True)
+        parser.parse_into_object(GSFont(), self.data.decode("utf-8"))
+        report = parser.stats.report()
+        self.assertEqual(report["bytes"], len(self.data))
+        self.assertEqual(report["classes"]["GSFont"]["objects"], 1)
+
+    def test_environment(self):
+        self.assertIsNone(Parser().stats)
+        with mock.patch.dict(os.environ, {"GLYPHSLIB_PARSER_STATS": "1"}):
+            parser = Parser(GSFont)
+            with self.assertLogs("glyphsLib.parser", "INFO") as logs:
+                parser.parse(self.data)
+            self.assertIn("Parser statistics", logs.output[0])
+            self.assertIsNone(Parser(stats=False).stats)
+        with mock.patch.dict(os.environ, {"GLYPHSLIB_PARSER_STATS": "0"}):
+            self.assertIsNone(Parser().stats)
+
+    def test_main(self):
+        stdout = StringIO()
+        with mock.patch("sys.stdout", stdout):
+            main(["--stats", self.filename])
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(report["file"], self.filename)
+        self.assertEqual(report["classes"]["GSGlyph"]["objects"], 11)
+
+
+class PackedNodesTest(unittest.TestCase):
+    def make_path(self):
+        path = GSPath()
+        path.nodes = [
+            GSNode((1, 2), GSNode.LINE),
+            GSNode((3.5, -4.25), GSNode.OFFCURVE),
+            GSNode((5, 6), GSNode.CURVE, smooth=True),
+            GSNode((7, 8), GSNode.QCURVE, name="top-left corner"),
+        ]
+        path.nodes[3].userData["data"] = {"key": '"value"\nwith; {escapes}'}
+        return path
+
+    def test_nodes(self):
+        text = glyphsLib.dumps(self.make_path())
+        for source in (text, text.encode("utf-8")):
+            path = Parser(GSPath).parse(source)
+            self.assertEqual(glyphsLib.dumps(path), text)
+            self.assertIsNone(path._nodes.views)
+            self.assertEqual(
+                [(n.position.x, n.position.y, n.type, n.smooth) for n in path.nodes],
+                [
+                    (1, 2, "line", False),
+                    (3.5, -4.25, "offcurve", False),
+                    (5, 6, "curve", True),
+                    (7, 8, "qcurve", False),
+                ],
+            )
+            self.assertIsInstance(path.nodes[0].position.x, int)
+            self.assertIsInstance(path.nodes[1].position.x, float)
+            self.assertTrue(all(node.parent is path for node in path.nodes))
+            self.assertEqual(path.nodes[3].name, "top-left corner")
+            self.assertEqual(
+                dict(path.nodes[3].userData["data"]),
+                {"key": '"value"\nwith; {escapes}'},
+            )
+            self.assertIsNone(path.nodes[0].name)
+
+    def test_same_as_item_by_item(self):
+        text = glyphsLib.dumps(self.make_path())
+        expected = Parser(GSPath, engine="regex").parse(text)
+        path = Parser(GSPath).parse(text)
+        self.assertEqual(len(path.nodes), len(expected.nodes))
+        for node, expected_node in zip(path.nodes, expected.nodes):
+            self.assertIs(node.parent, path)
+            for name in ("position", "type", "smooth", "_userData"):
+                self.assertEqual(getattr(node, name), getattr(expected_node, name))
+
+    def test_unusual_nodes(self):
+        # Not in the usual format, parsed item by item
+        path = Parser(GSPath).parse("{nodes = ();}")
+        self.assertEqual(len(path.nodes), 0)
+        with self.assertRaises(AttributeError):
+            Parser(GSPath).parse('{nodes = ("1 2 FOO");}')
+
+    def test_set_nodes(self):
+        path = Parser(GSPath).parse(glyphsLib.dumps(self.make_path()))
+        node = path.nodes[0]
+        path.nodes = [GSNode((0, 0))]
+        self.assertEqual(len(path.nodes), 1)
+        # Removed nodes keep their attributes
+        self.assertIsNone(node.parent)
+        self.assertEqual((node.position, node.type), (Point(1, 2), GSNode.LINE))
+
+
+class KerningTest(unittest.TestCase):
+    text = dedent(
+        """\
+        {
+        kerning = {
+        m01 = {
+        "@MMK_L_A" = {
+        "@MMK_R_V" = -50;
+        V = 10.5;
+        };
+        V = {
+        A = "-7";
+        "@MMK_R_A" = 1.0;
+        };
+        };
+        m02 = {
+        "@MMK_L_A" = {
+        V = -0;
+        };
+        };
+        };
+        }
+        """
+    )
+
+    def test_kerning(self):
+        for source in (self.text, self.text.encode("utf-8")):
+            font = Parser(GSFont).parse(source)
+            expected = Parser(GSFont, engine="regex").parse(self.text)
+            self.assertEqual(font.kerning, expected.kerning)
+            values = [
+                value
+                for master_map in font.kerning.values()
+                for pairs in master_map.values()
+                for value in pairs.values()
+            ]
+            self.assertEqual(values, [-50, 10.5, -7, 1, 0])
+            self.assertEqual([type(v) for v in values], [int, float, int, int, int])
+            self.assertIsInstance(font.kerning["m01"]["V"], OrderedDict)
+            self.assertEqual(glyphsLib.dumps(font), glyphsLib.dumps(expected))
+
+    def test_names_are_shared(self):
+        font = Parser(GSFont).parse(self.text.encode("utf-8"))
+        first, second = (list(m)[0] for m in font.kerning.values())
+        self.assertIs(first, second)
+
+    def test_empty(self):
+        font = Parser(GSFont).parse("{kerning = {};}")
+        self.assertEqual(font.kerning, {})
+
+    def test_invalid(self):
+        for kerning in (
+            "()",
+            "{m01 = 1;}",
+            "{m01 = {A = 1;};}",
+            "{m01 = {A = {V;};};}",
+        ):
+            with self.assertRaises(ValueError):
+                Parser(GSFont).parse("{kerning = %s;}" % kerning)
+
 
 class ParserGlyphTest(unittest.TestCase):
     def test_parse_empty_glyphs(self):
@@ -15,9 +15,20 @@
 
 
 import datetime
+import math
+import random
 import unittest
+from unittest import mock
 
-from glyphsLib.types import Transform, parse_datetime, parse_color
+import glyphsLib.types
+from glyphsLib.types import (
+    Transform,
+    actualPrecition,
+    floatToString,
+    floatsToStrings,
+    parse_datetime,
+    parse_color,
+)
 
 
 class GlyphsDateTimeTest(unittest.TestCase):
@@ -94,5 +105,63 @@ class ColorTest(unittest.TestCase):
             self.assertRaises(ValueError, parse_color, value)
 
 
+def reference_float_to_string(Float, precision=3):
+    """floatToString as it was before its fast path, for comparison."""
+    ActualPrecition = actualPrecition(Float)
+    precision = min(precision, ActualPrecition)
+    fractional = math.modf(math.fabs(Float))[0]
+    if precision >= 5 and 0.000005 <= fractional <= 0.999995:
+        return "%.5f" % Float
+    elif precision >= 4 and 0.00005 <= fractional <= 0.99995:
+        return "%.4f" % Float
+    elif precision >= 3 and 0.0005 <= fractional <= 0.9995:
+        return "%.3f" % Float
+    elif precision >= 2 and 0.005 <= fractional <= 0.995:
+        return "%.2f" % Float
+    elif precision >= 1 and 0.05 <= fractional <= 0.95:
+        return "%.1f" % Float
+    else:
+        return "%.0f" % Float
+
+
+class FloatToStringTest(unittest.TestCase):
+    def values(self):
+        values = [0, -0.0, 0.0, True, 10 ** 20 + 1, 1e20, -1e-7, 1e-7, 2.5e-6]
+        values.extend(range(-1000, 1001))
+        values.extend(float(i) for i in range(-1000, 1001))
+        values.extend(i / 1000 for i in range(-5000, 5001))
+        values.extend(i / 100000 for i in range(-2000, 2001))
+        values.extend(i / 100000 + 0.000005 for i in range(-2000, 2001))
+        rng = random.Random(1)
+        values.extend(rng.uniform(-2000, 2000) for _ in range(3000))
+        values.extend(round(rng.uniform(-2000, 2000), 2) for _ in range(3000))
+        return values
+
+    def test_same_as_reference(self):
+        values = self.values()
+        for precision in range(6):
+            expected = [reference_float_to_string(v, precision) for v in values]
+            self.assertEqual([floatToString(v, precision) for v in values], expected)
+            # Twice, to also get the cached strings.
+            for _ in range(2):
+                self.assertEqual(floatsToStrings(values, precision), expected)
+
+    def test_cache_size(self):
+        with mock.patch("glyphsLib.types._FLOAT_STRINGS_SIZE", 10), mock.patch(
+            "glyphsLib.types._float_strings", {}
+        ):
+            values = [i / 10 for i in range(100)]
+            self.assertEqual(
+                floatsToStrings(values, 5),
+                [reference_float_to_string(v, 5) for v in values],
+            )
+            self.assertLessEqual(len(glyphsLib.types._float_strings[5]), 10)
+
+    def test_not_finite(self):
+        for value in (math.inf, -math.inf, math.nan):
+            with self.assertRaises((OverflowError, ValueError)):
+                floatsToStrings([value])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -14,14 +14,20 @@
 # limitations under the License.
 
 import unittest
-from io import StringIO
+from io import BytesIO, StringIO
+from unittest import mock
 from textwrap import dedent
 from collections import OrderedDict
+import copy
 import os
+import pickle
+import tempfile
+
+import glyphsLib
 
 from glyphsLib import classes
 from glyphsLib.types import parse_datetime, Point, Rect
-from glyphsLib.writer import dump, dumps
+from glyphsLib.writer import Writer, content_hash, dump, dumps, escape_string
 from glyphsLib.parser import Parser
 
 from . import test_helpers
@@ -985,6 +991,33 @@ class WriterTest(unittest.TestCase, test_helpers.AssertLinesEqual):
             ),
         )
 
+    def test_write_packed_path(self):
+        text = dedent(
+            """\
+            {
+            closed = 1;
+            nodes = (
+            "0 0.5 LINE",
+            "100.25 -3 OFFCURVE",
+            "2 3 CURVE SMOOTH",
+            "1 2 QCURVE {name = top;}"
+            );
+            }
+        """
+        )
+        path = Parser(classes.GSPath).parse(text)
+        self.assertWrites(path, text)
+        # Written from the columns, without making GSNode objects
+        self.assertIsNone(path._nodes.views)
+        path.nodes[0].position.x = -1
+        path.nodes[2].type = classes.GSNode.LINE
+        self.assertWrites(
+            path,
+            text.replace('"0 0.5 LINE"', '"-1 0.5 LINE"').replace(
+                '"2 3 CURVE SMOOTH"', '"2 3 LINE SMOOTH"'
+            ),
+        )
+
     def test_write_node(self):
         node = classes.GSNode(Point(10, 30), classes.GSNode.CURVE)
         # http://docu.glyphsapp.com/#gsnode
@@ -1158,6 +1191,23 @@ rememberToDownloadARealRemindersApp = 1;}"',
         )
 
 
+class EscapeStringTest(unittest.TestCase):
+    def test_escape_string(self):
+        for string in ("", "a b", "a-b", "@MMK_L_A", "é", "\u0967", "a\nb"):
+            self.assertEqual(escape_string(string)[0], '"', string)
+        for string in ("A", "a.sc", "_part.stem", "$x", "uni00C4", "e", "1e", "1.2.3"):
+            self.assertEqual(escape_string(string), string)
+        self.assertEqual(escape_string('a"b\\c\n'), '"a\\"b\\\\c\\012"')
+
+    def test_numbers_are_quoted(self):
+        for string in ("1", "1_000", "1.5", ".5", "5.", "1e5", "1E5", "1_0.5"):
+            self.assertEqual(escape_string(string), '"%s"' % string)
+        for string in ("inf", "Infinity", "NAN", "nan"):
+            self.assertEqual(escape_string(string), '"%s"' % string)
+        for string in ("infinit", "nan1", "_1", "e5", "1._"):
+            self.assertEqual(escape_string(string), string)
+
+
 class WriterDumpInterfaceTest(unittest.TestCase):
     def test_dump(self):
         obj = classes.GSFont()
@@ -1175,6 +1225,327 @@ class WriterDumpInterfaceTest(unittest.TestCase):
         self.assertTrue(string)
 
 
+class WriterOutputTest(unittest.TestCase):
+    filename = os.path.join(os.path.dirname(__file__), "data/GlyphsUnitTestSans.glyphs")
+
+    def setUp(self):
+        self.font = classes.GSFont(self.filename)
+        self.expected = dumps(self.font)
+
+    def test_dump_bytes(self):
+        fp = BytesIO()
+        dump(self.font, fp)
+        self.assertEqual(fp.getvalue(), self.expected.encode("utf-8"))
+
+    def test_dump_bytes_in_chunks(self):
+        fp = mock.Mock(wraps=BytesIO())
+        with mock.patch("glyphsLib.writer._BUFFER_SIZE", 1000):
+            dump(self.font, fp)
+        writes = [call[0][0] for call in fp.write.call_args_list if call[0][0]]
+        self.assertGreater(len(writes), 1)
+        self.assertLess(len(writes), len(self.expected) / 1000)
+        # Bounded by the size of what is buffered, not by the number of glyphs.
+        self.assertLess(max(len(data) for data in writes), 2000)
+        self.assertEqual(b"".join(writes), self.expected.encode("utf-8"))
+
+    def test_dump_in_parallel(self):
+        self.assertEqual(dumps(self.font, workers=2), self.expected)
+        fp = BytesIO()
+        dump(self.font, fp, workers=3)
+        self.assertEqual(fp.getvalue(), self.expected.encode("utf-8"))
+        self.assertEqual(dumps(classes.GSFont(), workers=2), dumps(classes.GSFont()))
+        with self.assertRaises(ValueError):
+            dumps(self.font, workers=0)
+
+    def test_write_kerning(self):
+        kerning = OrderedDict()
+        kerning["m02"] = {"b": {"z": 1.25, "a": -3, "c": True, "d": None}}
+        kerning["m01"] = OrderedDict(
+            [("V", OrderedDict([("A", -0.0), ("@MMK_R_A", "1")])), ("A", {})]
+        )
+        kerning["m03"] = {"color": {"a": 1}}
+        expected = StringIO()
+        Writer(expected).writeDict(kerning)
+        fp = StringIO()
+        Writer(fp).writeKerning(kerning)
+        self.assertEqual(fp.getvalue(), expected.getvalue())
+
+    def test_write_bytes_directly(self):
+        # Without buffering, nothing needs to be flushed.
+        fp = BytesIO()
+        writer = Writer(fp)
+        writer.writeDict(self.font.glyphs["A"])
+        expected = dumps(self.font.glyphs["A"]).rstrip("\n")
+        self.assertEqual(fp.getvalue(), expected.encode("utf-8"))
+        writer.writeKey("a")
+        writer.writeValue(1)
+        self.assertEqual(fp.getvalue(), (expected + "a = 1").encode("utf-8"))
+        writer.flush()
+        self.assertEqual(fp.getvalue(), (expected + "a = 1").encode("utf-8"))
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "font.glyphs")
+            with open(path, "w") as fp:
+                fp.write("old")
+            os.chmod(path, 0o640)
+            self.font.save(path)
+            with open(path, encoding="utf-8") as fp:
+                self.assertEqual(fp.read(), self.expected)
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+            self.assertEqual(os.listdir(tmp), ["font.glyphs"])
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "needs symbolic links")
+    def test_save_to_symlink(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.mkdir(os.path.join(tmp, "fonts"))
+            path = os.path.join(tmp, "fonts", "font.glyphs")
+            with open(path, "w") as fp:
+                fp.write("old")
+            os.chmod(path, 0o640)
+            link = os.path.join(tmp, "link.glyphs")
+            os.symlink(path, link)
+            self.font.save(link)
+            self.assertTrue(os.path.islink(link))
+            with open(path, encoding="utf-8") as fp:
+                self.assertEqual(fp.read(), self.expected)
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+            self.assertEqual(sorted(os.listdir(tmp)), ["fonts", "link.glyphs"])
+            self.assertEqual(os.listdir(os.path.join(tmp, "fonts")), ["font.glyphs"])
+
+    @unittest.skipUnless(
+        hasattr(os, "geteuid") and os.geteuid() == 0, "needs to give files away"
+    )
+    def test_save_keeps_owner(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "font.glyphs")
+            with open(path, "w") as fp:
+                fp.write("old")
+            os.chown(path, 1234, 5678)
+            self.font.save(path)
+            stat = os.stat(path)
+            self.assertEqual((stat.st_uid, stat.st_gid), (1234, 5678))
+
+    def test_save_interrupted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "font.glyphs")
+            self.font.save(path)
+            self.font.familyName = "Other"
+            with mock.patch(
+                "glyphsLib.writer.escape_string", side_effect=KeyboardInterrupt
+            ), self.assertRaises(KeyboardInterrupt):
+                self.font.save(path)
+            with open(path, encoding="utf-8") as fp:
+                self.assertEqual(fp.read(), self.expected)
+            self.assertEqual(os.listdir(tmp), ["font.glyphs"])
+
+
+class IncrementalWriteTest(unittest.TestCase):
+    filename = os.path.join(os.path.dirname(__file__), "data/GlyphsUnitTestSans.glyphs")
+
+    def setUp(self):
+        with open(self.filename, encoding="utf-8") as fp:
+            self.text = fp.read()
+
+    def assertSameAsFullWrite(self, edit=None, source=None):
+        """Check that writing a font loaded with its source, incrementally
+        after 'edit', gives the same result as a full write."""
+        source = self.text if source is None else source
+        font = glyphsLib.loads(source, keep_source=True)
+        expected = glyphsLib.loads(source)
+        if edit is not None:
+            edit(font)
+            edit(expected)
+        self.assertEqual(dumps(font, incremental=True), dumps(expected))
+        return font
+
+    def test_unchanged(self):
+        font = self.assertSameAsFullWrite()
+        self.assertTrue(all(g._sourceRange is not None for g in font.glyphs))
+        font = self.assertSameAsFullWrite(source=self.text.encode("utf-8"))
+        self.assertTrue(all(g._sourceRange is not None for g in font.glyphs))
+
+    def test_non_canonical_source(self):
+        filename = os.path.join(os.path.dirname(__file__), "data/IntegerFloat.glyphs")
+        with open(filename, encoding="utf-8") as fp:
+            source = fp.read()
+        self.assertNotEqual(dumps(glyphsLib.loads(source)), source)
+        font = self.assertSameAsFullWrite(source=source)
+        expected = dumps(font, incremental=True)
+        self.assertEqual(dumps(font, incremental=True, workers=2), expected)
+
+    def test_changed_glyphs(self):
+        def edit(font):
+            font.glyphs["A"].layers[0].width = 1000
+            font.glyphs["a"].layers[1].paths[0].nodes[0].position = Point(1, 2)
+            font.glyphs["n"].name = "m"
+            font.glyphs["h"].unicode = "0048"
+            del font.glyphs["a.sc"]
+            font.glyphs.append(classes.GSGlyph("space"))
+
+        font = self.assertSameAsFullWrite(edit)
+        changed = [g.name for g in font.glyphs if g._sourceRange is None]
+        self.assertEqual(changed, ["A", "a", "h", "m", "space"])
+
+    def test_changed_font(self):
+        def edit(font):
+            font.familyName = "Other"
+            font.setKerningForPair(font.masters[0].id, "A", "V", -50)
+
+        font = self.assertSameAsFullWrite(edit)
+        self.assertTrue(all(g._sourceRange is not None for g in font.glyphs))
+
+    def test_reading_keeps_glyphs_unchanged(self):
+        font = glyphsLib.loads(self.text, keep_source=True)
+        glyph = font.glyphs["A"]
+        self.assertEqual((glyph.name, glyph.unicode), ("A", "0041"))
+        self.assertIs(font.glyphs["A"].parent, font)
+        for layer in glyph.layers:
+            self.assertIsNotNone(layer.bounds)
+            for path in layer.paths:
+                self.assertEqual(path.nodes[0].name, path.nodes[0].name)
+                self.assertIsNotNone(path.bounds)
+            self.assertEqual(dict(layer.userData), dict(layer.userData))
+        self.assertEqual(glyph.content_hash(), content_hash(glyph))
+        self.assertIsNotNone(glyph._sourceRange)
+        # Tracked glyphs are written like the others.
+        self.assertIsInstance(glyph, classes.GSGlyph)
+        self.assertEqual(type(glyph).__name__, "GSGlyph")
+        glyph.layers[0].width = 1000
+        self.assertIsNone(glyph._sourceRange)
+        self.assertIs(type(glyph), classes.GSGlyph)
+        self.assertIs(type(glyph.layers[0]), classes.GSLayer)
+
+    def test_nested_changes(self):
+        def anchor(font):
+            font.glyphs["A"].layers[0].anchors[0].position = Point(1, 2)
+
+        def anchor_x(font):
+            font.glyphs["A"].layers[0].anchors[0].position.x = 3
+
+        def user_data(font):
+            font.glyphs["A"].layers[0].userData["key"] = "value"
+
+        def node_name(font):
+            font.glyphs["A"].layers[0].paths[0].nodes[0].name = "name"
+
+        def node_moved(font):
+            font.glyphs["A"].layers[0].paths[0].nodes[0].position.x += 1
+
+        def path_appended(font):
+            layer = font.glyphs["A"].layers[0]
+            layer.paths.append(copy.copy(layer.paths[0]))
+
+        def node_appended(font):
+            path = font.glyphs["A"].layers[0].paths[0]
+            path.nodes.append(classes.GSNode(Point(1, 2)))
+
+        def background(font):
+            font.glyphs["A"].layers[0].background.width = 10
+
+        def smart_component(font):
+            layer = font.glyphs["A"].layers[0]
+            component = classes.GSComponent("_part.stem")
+            layer.components.append(component)
+
+        def smart_component_values(font):
+            component = font.glyphs["Adieresis"].layers[0].components[0]
+            component.smartComponentValues["width"] = 10
+
+        for edit in (
+            anchor,
+            anchor_x,
+            user_data,
+            node_name,
+            node_moved,
+            path_appended,
+            node_appended,
+            background,
+            smart_component,
+            smart_component_values,
+        ):
+            with self.subTest(edit=edit.__name__):
+                font = self.assertSameAsFullWrite(edit)
+                changed = [g.name for g in font.glyphs if g._sourceRange is None]
+                self.assertEqual(len(changed), 1)
+
+    def test_changed_kerning(self):
+        def edit(font):
+            font.kerning[font.masters[0].id]["@MMK_L_A"]["@MMK_R_J"] = -50
+
+        self.assertSameAsFullWrite(edit)
+
+    def test_reordered_masters(self):
+        def edit(font):
+            font.masters.append(font.masters.pop(0))
+
+        # Layers are written in the order of the masters.
+        font = self.assertSameAsFullWrite(edit)
+        unchanged = [classes._unchangedSource(g) for g in font.glyphs]
+        self.assertEqual(unchanged, [None] * len(font.glyphs))
+
+    def test_copies_unchanged_glyphs(self):
+        font = glyphsLib.loads(self.text, keep_source=True)
+        font.glyphs["A"].layers[0].width = 1000
+        with mock.patch.object(
+            Writer, "writeDict", autospec=True, side_effect=Writer.writeDict
+        ) as writeDict:
+            dumps(font, incremental=True)
+        written = [
+            call.args[1].name
+            for call in writeDict.call_args_list
+            if isinstance(call.args[1], classes.GSGlyph)
+        ]
+        self.assertEqual(written, ["A"])
+
+    def test_without_source(self):
+        font = glyphsLib.loads(self.text)
+        self.assertIsNone(font._source)
+        font.glyphs["A"].layers[0].width = 1000
+        self.assertEqual(dumps(font, incremental=True), dumps(font))
+
+    def test_glyph_moved_to_other_font(self):
+        font = glyphsLib.loads(self.text, keep_source=True)
+        other = classes.GSFont()
+        other.glyphs.append(font.glyphs["A"])
+        self.assertIsNone(other.glyphs["A"]._sourceRange)
+
+    def test_pickle(self):
+        font = glyphsLib.loads(self.text, keep_source=True)
+        copy = pickle.loads(pickle.dumps(font))
+        self.assertIsNone(copy._source)
+        self.assertEqual(dumps(copy, incremental=True), dumps(font))
+
+    def test_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            font = classes.GSFont(self.filename, keep_source=True)
+            font.glyphs["A"].layers[0].width = 1000
+            path = os.path.join(tmp, "font.glyphs")
+            font.save(path, incremental=True)
+            with open(path, encoding="utf-8") as fp:
+                self.assertEqual(fp.read(), dumps(font))
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            glyphsLib.loads(self.text, cache_dir=tmp)
+            for source in (self.text, self.text.encode("utf-8")):
+                font = glyphsLib.loads(source, cache_dir=tmp, keep_source=True)
+                self.assertEqual(dumps(font, incremental=True), dumps(font))
+
+    def test_parallel(self):
+        font = glyphsLib.loads(self.text, keep_source=True, workers=2)
+        self.assertTrue(all(g._sourceRange is not None for g in font.glyphs))
+        font.glyphs["A"].layers[0].width = 1000
+        expected = dumps(font, incremental=True)
+        self.assertEqual(expected, dumps(font))
+        self.assertEqual(dumps(font, incremental=True, workers=2), expected)
+
+    def test_filtered(self):
+        font = glyphsLib.loads(self.text, keep_source=True, glyph_filter=["A", "V"])
+        self.assertTrue(all(g._sourceRange is not None for g in font.glyphs))
+        self.assertEqual(dumps(font, incremental=True), dumps(font))
+
+
 class WriterRoundtripTest(unittest.TestCase, test_helpers.AssertParseWriteRoundtrip):
     def test_roundtrip_on_file(self):
         filename = os.path.join(